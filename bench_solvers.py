@@ -0,0 +1,113 @@
+# -*- coding: utf-8 -*-
+"""
+Solver Benchmark - explicit vs Verlet vs implicit ElasticChain physics
+
+Runs headless (no window) and prints two tables:
+
+1. STABILITY LIMIT: for each solver and spring stiffness, the largest fixed
+   time step that survives SIM_SECONDS of following a moving anchor without
+   blowing up (NaN/inf or runaway speed).
+2. SPEED: milliseconds per physics step for each solver at several
+   NUM_NODES values.
+
+Run it with:  python bench_solvers.py
+"""
+
+import math
+import time
+
+import numpy as np
+
+from snakeforrealthistime import ElasticChain
+
+# =========================
+# CONFIG
+# =========================
+SOLVERS = ["euler", "verlet", "implicit"]
+
+# Stability sweep
+STABILITY_NODES = 30
+STIFFNESSES = [14.0, 140.0, 1400.0, 14000.0]   # 14 = rigid state's base_stiffness
+STEP_RATES = [2000, 1000, 480, 240, 120, 60, 30, 15]  # Tried from small dt to large
+SIM_SECONDS = 5.0
+MAX_SPEED = 1e5  # Anything faster than this (pixels/second) counts as exploded
+
+# Speed sweep
+SPEED_NODES = [10, 100, 1000, 10000]
+SPEED_STEPS = 200
+SPEED_DT = 1.0 / 240
+
+
+# =========================
+# HELPERS
+# =========================
+def anchor_at(t):
+    """Fixed anchor path: a slow figure-eight around the middle of the screen."""
+    return (600 + 300 * math.sin(t * 1.3), 600 + 200 * math.sin(t * 2.6))
+
+
+def make_rigid_chain(num_nodes, solver, stiffness):
+    chain = ElasticChain(anchor_at(0.0), num_nodes=num_nodes, solver=solver)
+    chain._enter_rigid()
+    chain.base_stiffness = stiffness
+    chain.refresh_coefficients()
+    chain.state_time = -math.inf  # Stay in this state for the whole run
+    return chain
+
+
+def survives(solver, stiffness, dt):
+    chain = make_rigid_chain(STABILITY_NODES, solver, stiffness)
+    steps = int(SIM_SECONDS / dt)
+    with np.errstate(all="ignore"):
+        for step in range(steps):
+            chain.update(anchor_at(step * dt), dt)
+            if not np.isfinite(chain.nodes).all():
+                return False
+            if np.abs(chain.velocities).max() > MAX_SPEED:
+                return False
+    return True
+
+
+def stability_limit(solver, stiffness):
+    """Largest dt (smallest step rate) that stays stable, or None."""
+    best = None
+    for hz in STEP_RATES:
+        if not survives(solver, stiffness, 1.0 / hz):
+            break
+        best = hz
+    return best
+
+
+def ms_per_step(solver, num_nodes):
+    chain = make_rigid_chain(num_nodes, solver, 14.0)
+    chain.update(anchor_at(0.0), SPEED_DT)  # Warm-up
+    start = time.perf_counter()
+    for step in range(SPEED_STEPS):
+        chain.update(anchor_at(step * SPEED_DT), SPEED_DT)
+    return (time.perf_counter() - start) / SPEED_STEPS * 1000.0
+
+
+# =========================
+# MAIN
+# =========================
+def main():
+    print(f"=== Stability limit ({STABILITY_NODES} nodes, rigid state, {SIM_SECONDS:.0f}s) ===")
+    print("Largest stable dt shown as 1/Hz; '-' = unstable even at 1/%d" % STEP_RATES[0])
+    print(f"{'stiffness':>10} " + " ".join(f"{s:>10}" for s in SOLVERS))
+    for stiffness in STIFFNESSES:
+        cells = []
+        for solver in SOLVERS:
+            hz = stability_limit(solver, stiffness)
+            cells.append(f"{'1/' + str(hz) if hz else '-':>10}")
+        print(f"{stiffness:>10.0f} " + " ".join(cells))
+
+    print()
+    print(f"=== ms per step (dt = 1/{round(1 / SPEED_DT)}) ===")
+    print(f"{'nodes':>10} " + " ".join(f"{s:>10}" for s in SOLVERS))
+    for num_nodes in SPEED_NODES:
+        cells = [f"{ms_per_step(solver, num_nodes):>10.3f}" for solver in SOLVERS]
+        print(f"{num_nodes:>10} " + " ".join(cells))
+
+
+if __name__ == "__main__":
+    main()
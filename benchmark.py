@@ -0,0 +1,427 @@
+# -*- coding: utf-8 -*-
+"""
+Headless Benchmark Harness
+Times every hot path in the boss scripts without opening a window.
+
+Runs under SDL's "dummy" video/audio drivers with fixed random seeds, sweeps
+parameters like NUM_NODES and projectile count, and writes the results to a
+JSON file. Pass --baseline to compare against a stored run.
+
+One run is noisy (another process, the CPU clocking down, ...), so --runs
+repeats the whole sweep and keeps, per case, the median of the runs' medians
+and how far apart the runs were ("spread": the upper quartile of the runs'
+medians over the lower one, so one odd run doesn't count). A case only counts
+as slower than the baseline when it's beyond REGRESSION_RATIO on top of that
+spread.
+
+USAGE:
+    python benchmark.py                                         # run everything
+    python benchmark.py --filter ElasticChain                   # only matching cases
+    python benchmark.py --quick                                 # smaller sweeps
+    python benchmark.py --baseline bench_baseline.json          # compare (3 runs)
+    python benchmark.py --runs 5 --output bench_baseline.json   # refresh the baseline
+"""
+
+import os
+
+# Must be set BEFORE pygame is imported anywhere
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import argparse
+import importlib.util
+import json
+import math
+import platform
+import random
+import sys
+import time
+
+import numpy as np
+import pygame
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+# =========================
+# CONFIG
+# =========================
+SEED = 1234
+MIN_CALLS = 5          # Every case is called at least this many times...
+TIME_BUDGET = 0.5      # ...and keeps going until this many seconds have passed
+MAX_CALLS = 2000
+WARMUP_TIME = 0.1      # Seconds of untimed calls before measuring
+REGRESSION_RATIO = 1.15  # Slower than baseline by more than this (times the run-to-run spread) = regression
+COMPARE_RUNS = 3         # Default --runs when comparing, so one odd run can't fail the check
+
+NODE_COUNTS = [10, 100, 1000, 10000]
+PROJECTILE_COUNTS = [100, 1000, 10000, 20000]
+PATH_SAMPLES = [50, 500, 5000]
+
+QUICK_NODE_COUNTS = [10, 100]
+QUICK_PROJECTILE_COUNTS = [100]
+QUICK_PATH_SAMPLES = [50]
+
+SCREEN_SIZE = (1200, 1200)
+DT = 1.0 / 60
+
+
+# =========================
+# LOADING THE SCRIPTS
+# =========================
+def load_script(filename, name):
+    """Import a script by file name (works for names like boss-pattern-3.py)."""
+    spec = importlib.util.spec_from_file_location(name, os.path.join(HERE, filename))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def seed_everything():
+    random.seed(SEED)
+    np.random.seed(SEED)
+
+
+# =========================
+# CASES
+# =========================
+# Each case is a setup function: it takes the sweep parameter and returns a
+# zero-argument function that does ONE call of the thing being timed.
+
+def case_generate_sine_edge(mods, screen, samples):
+    snake = mods["snake"]
+    return lambda: snake.generate_sine_edge((100, 500), (700, 100), samples=samples,
+                                            amplitude=10, cycles=6)
+
+
+def case_generate_sine_edge_uncached(mods, screen, samples):
+    # The math itself, skipping the LRU cache generate_sine_edge sits behind
+    compute = mods["snake"]._sine_edge_cached.__wrapped__
+    return lambda: compute((100.0, 500.0), (700.0, 100.0), samples, 10.0, 6.0)
+
+
+def case_generate_sine_loop(mods, screen, samples):
+    snake = mods["snake"]
+    waypoints = [(100, 500), (700, 100), (1000, 800), (400, 900)]
+    compute = snake._sine_loop_cached.__wrapped__
+    key = tuple(tuple(map(float, p)) for p in waypoints)
+    return lambda: compute(key, samples, 10.0, 6.0, True)
+
+
+def case_curve_follower_update(mods, screen, samples):
+    snake = mods["snake"]
+    points = snake.generate_sine_edge((100, 500), (700, 100), samples=samples,
+                                      amplitude=10, cycles=6)
+    follower = snake.CurveFollower(points, speed=400)
+
+    def run():
+        nonlocal follower
+        follower.update(DT)
+        if follower.index >= len(follower.points) - 1:
+            follower = snake.CurveFollower(points, speed=400)
+    return run
+
+
+def case_path_follower_update(mods, screen, samples):
+    snake, paths = mods["snake"], mods["paths"]
+    waypoints = [(100, 500), (700, 100), (1000, 800), (400, 900)]
+    segments = [snake.generate_sine_edge(waypoints[i], waypoints[(i + 1) % len(waypoints)],
+                                         samples=samples, amplitude=10, cycles=6)
+                for i in range(len(waypoints))]
+    follower = paths.PathFollower(paths.ArcLengthPath.from_segments(segments, closed=True),
+                                  speed=400)
+    return lambda: follower.update(DT)
+
+
+def case_spline_positions(mods, screen, count):
+    # Anchor position + heading for `count` snakes sharing one track
+    splines = mods["splines"]
+    track = splines.SplinePath.catmull_rom([(100, 500), (700, 100), (1000, 800), (400, 900)],
+                                           closed=True)
+    distances = np.random.uniform(0, track.length, count)
+
+    def run():
+        distances[:] += 400 * DT
+        track.positions(distances)
+        track.headings(distances)
+    return run
+
+
+def _moving_chain(snake, num_nodes):
+    chain = snake.ElasticChain((600, 600), num_nodes=num_nodes)
+    frame = 0
+
+    def step():
+        nonlocal frame
+        frame += 1
+        t = frame * DT
+        chain.update((600 + 300 * math.sin(t * 1.3), 600 + 200 * math.sin(t * 2.6)), DT)
+    return chain, step
+
+
+def case_chain_update(mods, screen, num_nodes):
+    chain, step = _moving_chain(mods["snake"], num_nodes)
+    return step
+
+
+def case_chain_draw(mods, screen, num_nodes):
+    chain, step = _moving_chain(mods["snake"], num_nodes)
+    for _ in range(120):  # Let it stretch out first
+        step()
+    return lambda: chain.draw(screen)
+
+
+def case_chain_hits(mods, screen, count):
+    # Rebuild the hit grid for a 1000-node snake, then sweep `count` shots
+    chain, step = _moving_chain(mods["snake"], 1000)
+    for _ in range(120):
+        step()
+    start = np.random.uniform(0, SCREEN_SIZE[0], (count, 2))
+    end = start + np.random.normal(0, 600 * DT, (count, 2))
+
+    def run():
+        chain.refresh_hit_grid().query_segments(start, end, radius=5)
+    return run
+
+
+def _spawn_projectiles(bp3, count):
+    # Spread them over the screen and over their lifetime, like mid-fight
+    pool = bp3.ProjectilePool(max(count, bp3.PROJECTILE_CAPACITY))
+    positions = [(random.randint(20, bp3.WIDTH - 20), random.uniform(-20, bp3.HEIGHT))
+                 for _ in range(count)]
+    ages = np.array([random.uniform(0, bp3.PROJECTILE_LIFETIME * 0.99) for _ in range(count)])
+    pool.age[pool.spawn_many(positions)] = ages
+    return pool, positions, ages
+
+
+def case_projectile_update(mods, screen, count):
+    bp3 = mods["bp3"]
+    pool, positions, ages = _spawn_projectiles(bp3, count)
+
+    def run():
+        pool.update(DT)
+        # Keep the population steady: respawn anything that expired
+        missing = count - len(pool)
+        if missing:
+            pool.age[pool.spawn_many(positions[:missing])] = ages[:missing]
+    return run
+
+
+def case_projectile_draw(mods, screen, count):
+    bp3 = mods["bp3"]
+    pool, _, _ = _spawn_projectiles(bp3, count)
+    pool.update(0.0)  # Compute alpha
+    return lambda: pool.draw(screen)
+
+
+def case_projectile_player_hits(mods, screen, count):
+    bp3 = mods["bp3"]
+    pool, _, _ = _spawn_projectiles(bp3, count)
+    pool.update(DT)  # So every projectile has a path to sweep
+    player = (bp3.WIDTH / 2, bp3.HEIGHT - 80)
+    before = (player[0] - bp3.PLAYER_SPEED * DT, player[1])
+    return lambda: pool.circle_hits(player, bp3.PLAYER_RADIUS, before)
+
+
+def case_sword_sweep(mods, screen, count):
+    # One frame of a swing (60 FPS) against every projectile, as a parry would
+    bp3 = mods["bp3"]
+    pool, _, _ = _spawn_projectiles(bp3, count)
+    player = (bp3.WIDTH / 2, bp3.HEIGHT - 80)
+    step = bp3.SWORD_ARC_DEG * DT / bp3.SWORD_TIME
+    arc = bp3.SweptArc(player, bp3.SWORD_RANGE, (0, -1), -step / 2, step / 2)
+    return lambda: arc.hits_boxes(pool.pos[pool.live()], bp3.PROJECTILE_SIZE / 2)
+
+
+def case_compute_custom_nodes(mods, screen, _):
+    giant = mods["giant"]
+    player = pygame.Vector2(400, 500)
+    return lambda: giant.compute_custom_nodes(player)
+
+
+def case_update_boss_graph(mods, screen, _):
+    giant = mods["giant"]
+    state = dict(giant.state)
+    state["player_pos"] = pygame.Vector2(giant.state["player_pos"])
+    return lambda: giant.update_boss_graph(state, DT)
+
+
+def case_draw_sine_edge(mods, screen, _):
+    sincurve = mods["sincurve"]
+    boss = sincurve.initialize_boss([500, 300])
+    boss["shock"]["active"] = True
+    frame = 0
+
+    def run():
+        nonlocal frame
+        frame += 1
+        sincurve.draw_sine_edge(screen, boss, frame * DT)
+    return run
+
+
+def build_cases(quick):
+    nodes = QUICK_NODE_COUNTS if quick else NODE_COUNTS
+    projectiles = QUICK_PROJECTILE_COUNTS if quick else PROJECTILE_COUNTS
+    samples = QUICK_PATH_SAMPLES if quick else PATH_SAMPLES
+    return [
+        # (name, parameter name, parameter values, setup function)
+        ("generate_sine_edge", "samples", samples, case_generate_sine_edge),
+        ("generate_sine_edge.uncached", "samples", samples, case_generate_sine_edge_uncached),
+        ("generate_sine_loop.uncached", "samples", samples, case_generate_sine_loop),
+        ("CurveFollower.update", "samples", samples, case_curve_follower_update),
+        ("PathFollower.update", "samples", samples, case_path_follower_update),
+        ("SplinePath.positions", "snakes", nodes, case_spline_positions),
+        ("ElasticChain.update", "nodes", nodes, case_chain_update),
+        ("ElasticChain.draw", "nodes", nodes, case_chain_draw),
+        ("ElasticChain.hits[nodes=1000]", "projectiles", projectiles, case_chain_hits),
+        ("Projectile.update", "projectiles", projectiles, case_projectile_update),
+        ("Projectile.draw", "projectiles", projectiles, case_projectile_draw),
+        ("Projectile.circle_hits", "projectiles", projectiles, case_projectile_player_hits),
+        ("SweptArc.hits_boxes", "projectiles", projectiles, case_sword_sweep),
+        ("compute_custom_nodes", None, [None], case_compute_custom_nodes),
+        ("update_boss_graph", None, [None], case_update_boss_graph),
+        ("draw_sine_edge", None, [None], case_draw_sine_edge),
+    ]
+
+
+# =========================
+# TIMING
+# =========================
+def time_call(fn):
+    """Call fn repeatedly and return per-call stats in milliseconds."""
+    # Warm-up: first-call caches, lazy imports, CPU clocking up, ...
+    start = time.perf_counter()
+    fn()
+    while time.perf_counter() - start < WARMUP_TIME:
+        fn()
+
+    samples = []
+    start = time.perf_counter()
+    while len(samples) < MAX_CALLS and (len(samples) < MIN_CALLS
+                                        or time.perf_counter() - start < TIME_BUDGET):
+        t0 = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - t0) * 1000.0)
+    samples = np.array(samples)
+    return {
+        "calls": int(len(samples)),
+        "median_ms": float(np.median(samples)),
+        "mean_ms": float(samples.mean()),
+        "min_ms": float(samples.min()),
+        "p95_ms": float(np.percentile(samples, 95)),
+    }
+
+
+def combine_runs(runs):
+    """Merge the stats of one case from several runs."""
+    medians = np.array([run["median_ms"] for run in runs])
+    lower, upper = np.percentile(medians, [25, 75])
+    return {
+        "calls": sum(run["calls"] for run in runs),
+        "median_ms": float(np.median(medians)),
+        "mean_ms": float(np.median([run["mean_ms"] for run in runs])),
+        "min_ms": min(run["min_ms"] for run in runs),
+        "p95_ms": float(np.median([run["p95_ms"] for run in runs])),
+        "runs": len(runs),
+        "spread": float(upper / lower) if lower > 0 else 1.0,
+    }
+
+
+def run_all(quick, name_filter, runs=1):
+    pygame.init()
+    screen = pygame.display.set_mode(SCREEN_SIZE)
+
+    mods = {
+        "snake": load_script("snakeforrealthistime.py", "snakeforrealthistime"),
+        "paths": load_script("paths.py", "paths"),
+        "splines": load_script("splines.py", "splines"),
+        "bp3": load_script("boss-pattern-3.py", "boss_pattern_3"),
+        "giant": load_script("bossgiant.py", "bossgiant"),
+        "sincurve": load_script("bosspoissonsincurve.py", "bosspoissonsincurve"),
+    }
+
+    # Whole sweeps are repeated (not each case back to back), so a slow
+    # patch of time spreads over many cases instead of ruining one
+    timings = {}
+    for run in range(runs):
+        if runs > 1:
+            print(f"--- run {run + 1}/{runs} ---")
+        for name, param, values, setup in build_cases(quick):
+            for value in values:
+                key = name if param is None else f"{name}[{param}={value}]"
+                if name_filter and name_filter not in key:
+                    continue
+                seed_everything()
+                stats = time_call(setup(mods, screen, value))
+                timings.setdefault(key, []).append(stats)
+                print(f"{key:<45} {stats['median_ms']:>10.4f} ms  (p95 {stats['p95_ms']:.4f}, {stats['calls']} calls)")
+
+    pygame.quit()
+    return {key: combine_runs(stats) for key, stats in timings.items()}
+
+
+# =========================
+# BASELINE COMPARISON
+# =========================
+def compare(results, baseline):
+    """Print a comparison table; return the keys that regressed."""
+    regressions = []
+    print()
+    print(f"{'case':<45} {'baseline':>10} {'now':>10} {'ratio':>7} {'allowed':>8}")
+    for key, stats in results.items():
+        old = baseline.get(key)
+        if old is None:
+            print(f"{key:<45} {'-':>10} {stats['median_ms']:>10.4f} {'new':>7}")
+            continue
+        ratio = stats["median_ms"] / old["median_ms"] if old["median_ms"] > 0 else math.inf
+        # Runs that already disagree with each other by 20% can't show a 15% slowdown
+        allowed = REGRESSION_RATIO * max(old.get("spread", 1.0), stats.get("spread", 1.0))
+        flag = ""
+        if ratio > allowed:
+            flag = "  <-- SLOWER"
+            regressions.append(key)
+        print(f"{key:<45} {old['median_ms']:>10.4f} {stats['median_ms']:>10.4f} {ratio:>7.2f} {allowed:>8.2f}{flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless benchmarks for the boss scripts")
+    parser.add_argument("--output", default="bench_results.json", help="Where to write results (JSON)")
+    parser.add_argument("--baseline", help="Stored results to compare against")
+    parser.add_argument("--filter", default="", help="Only run cases whose name contains this")
+    parser.add_argument("--quick", action="store_true", help="Run smaller parameter sweeps")
+    parser.add_argument("--runs", type=int, default=None,
+                        help=f"Repeat the sweep this many times (default 1, or {COMPARE_RUNS} with --baseline; use 5+ for a baseline)")
+    args = parser.parse_args()
+    if args.runs is None:
+        args.runs = COMPARE_RUNS if args.baseline else 1
+
+    results = run_all(args.quick, args.filter, max(args.runs, 1))
+
+    report = {
+        "meta": {
+            "seed": SEED,
+            "quick": args.quick,
+            "runs": max(args.runs, 1),
+            "python": platform.python_version(),
+            "pygame": pygame.version.ver,
+            "numpy": np.__version__,
+            "machine": platform.machine(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "results": results,
+    }
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nWrote {args.output}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)["results"]
+        regressions = compare(results, baseline)
+        if regressions:
+            print(f"\n{len(regressions)} case(s) slower than allowed ({REGRESSION_RATIO:.2f}x baseline, times the spread)")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
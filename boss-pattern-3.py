@@ -3,6 +3,13 @@ import math
 import random
 import sys
 
+import numpy as np
+
+import text_cache
+from profiler import FrameProfiler
+from replay import ReplaySession
+from swept_arc import SweptArc
+
 # =====================================================
 # CONFIG (SAFE FOR NOVICES TO EDIT)
 # =====================================================
@@ -40,6 +47,8 @@ PROJECTILE_SIZE = 10
 PROJECTILE_INTERVAL = 0.12
 PROJECTILE_LIFETIME = 2.5
 PROJECTILE_FADE_TIME = 0.4
+PROJECTILE_CAPACITY = 32768  # Most projectiles alive at once (extra spawns are dropped)
+PROJECTILE_ALPHA_STEPS = 32  # Fade-out sprites baked at startup (more = smoother fade)
 
 # ---------------- PATTERN TIMING ----------------
 PATTERN_TIME = 4.0
@@ -51,19 +60,15 @@ CIRCLE_CENTER = pygame.Vector2(WIDTH // 2, HEIGHT // 2)
 CIRCLE_RADIUS = 170
 CIRCLE_ANG_SPEED = 2.6
 
-# =====================================================
-# INIT
-# =====================================================
-pygame.init()
-pygame.mixer.init()
-
-screen = pygame.display.set_mode((WIDTH, HEIGHT))
-pygame.display.set_caption("Boss Pattern Demo (Combat Restored)")
-clock = pygame.time.Clock()
-attack_sounds = [
-    pygame.mixer.Sound("attack1.wav"),
-    pygame.mixer.Sound("attack2.wav")
-]
+# ---------------- PROFILING ----------------
+PROFILE = False                       # Time every frame from the start (F3 also turns it on)
+PROFILE_CSV = "profile_pattern3.csv"  # Per-frame timings written on exit
+
+# ---------------- RECORD / REPLAY ----------------
+# python boss-pattern-3.py --record fight.rpl
+# python boss-pattern-3.py --replay fight.rpl --checksums out.txt
+TRACKED_KEYS = (pygame.K_w, pygame.K_a, pygame.K_s, pygame.K_d, pygame.K_SPACE)
+
 # =====================================================
 # HELPERS
 # =====================================================
@@ -86,37 +91,199 @@ def circle_rect_collision(circle_pos, radius, rect):
     return dx * dx + dy * dy <= radius * radius
 
 # =====================================================
-# PROJECTILE
+# PROJECTILES
 # =====================================================
-class Projectile:
-    def __init__(self, x, y):
-        self.pos = pygame.Vector2(x, y)
-        self.vel = pygame.Vector2(0, PROJECTILE_SPEED)
-        self.age = 0.0
-        self.alpha = 255
-        self.rect = pygame.Rect(0, 0, PROJECTILE_SIZE, PROJECTILE_SIZE)
-        self.rect.center = self.pos
+class ProjectilePool:
+    """
+    Every projectile's position, velocity, age and alpha in fixed-size arrays.
+
+    Slot i holds one projectile. Free slots wait on a stack (the free list):
+    spawning pops a slot, expiring pushes it back, so nothing is allocated
+    while the game runs. update() moves, fades and culls every projectile at
+    once, looking only at slots below `high` (one past the highest slot in use).
+
+    update() also keeps where each projectile was before it moved (`prev`),
+    so circle_hits() can test the whole path of the frame, not just where
+    the projectile ended up.
+
+    draw() never builds a surface either: the fade is baked once into
+    PROJECTILE_ALPHA_STEPS sprites and every projectile is one entry in a
+    single Surface.blits() call.
+    """
+
+    def __init__(self, capacity=PROJECTILE_CAPACITY):
+        self.capacity = capacity
+        self.pos = np.zeros((capacity, 2))
+        self.prev = np.zeros((capacity, 2))  # Position before the last update()
+        self.vel = np.zeros((capacity, 2))
+        self.age = np.zeros(capacity)
+        self.alpha = np.zeros(capacity, dtype=np.int32)
+        self.active = np.zeros(capacity, dtype=bool)
+        self.high = 0
+
+        # Free slots, lowest on top (the end), so the used slots stay packed
+        self._free = np.arange(capacity - 1, -1, -1)
+        self._free_count = capacity
+
+        # Scratch space for update()
+        self._step = np.zeros((capacity, 2))
+        self._fade = np.zeros(capacity)
+        self._dead = np.zeros(capacity, dtype=bool)
+        self._sprites = None  # See build_sprites()
+
+    def __len__(self):
+        return self.capacity - self._free_count
+
+    def spawn(self, x, y, vx=0.0, vy=PROJECTILE_SPEED):
+        """Add one projectile. Returns its slot, or None if the pool is full."""
+        if self._free_count == 0:
+            return None
+        self._free_count -= 1
+        i = int(self._free[self._free_count])
+        self.pos[i] = self.prev[i] = x, y
+        self.vel[i] = vx, vy
+        self.age[i] = 0.0
+        self.alpha[i] = 255
+        self.active[i] = True
+        self.high = max(self.high, i + 1)
+        return i
+
+    def spawn_many(self, positions, velocities=(0.0, PROJECTILE_SPEED)):
+        """Add a whole (n, 2) array of projectiles. Returns their slots."""
+        positions = np.asarray(positions, dtype=float).reshape(-1, 2)
+        n = min(len(positions), self._free_count)
+        self._free_count -= n
+        slots = self._free[self._free_count:self._free_count + n][::-1].copy()
+        self.pos[slots] = self.prev[slots] = positions[:n]
+        self.vel[slots] = np.broadcast_to(velocities, positions.shape)[:n]
+        self.age[slots] = 0.0
+        self.alpha[slots] = 255
+        self.active[slots] = True
+        if n:
+            self.high = max(self.high, int(slots.max()) + 1)
+        return slots
+
+    def release(self, slots):
+        """Remove the projectiles in these slots (e.g. ones that hit something)."""
+        # A slot listed twice (one shot hitting two things) must only go back once
+        slots = np.unique(np.asarray(slots, dtype=int))
+        slots = slots[self.active[slots]]
+        self.active[slots] = False
+        self._free[self._free_count:self._free_count + len(slots)] = slots[::-1]
+        self._free_count += len(slots)
+
+        # Shrink the window if the top slots emptied
+        if self.high and not self.active[self.high - 1]:
+            used = np.flatnonzero(self.active[:self.high])
+            self.high = int(used[-1]) + 1 if len(used) else 0
+
+    def clear(self):
+        self.active[:] = False
+        self._free = np.arange(self.capacity - 1, -1, -1)
+        self._free_count = self.capacity
+        self.high = 0
+
+    def live(self):
+        """Slots of every projectile in play."""
+        return np.flatnonzero(self.active[:self.high])
 
     def update(self, dt):
-        self.age += dt
-        self.pos += self.vel * dt
-        self.rect.center = self.pos
+        h = self.high
+        if h == 0:
+            return
+        age = self.age[:h]
+        age += dt
+        step = np.multiply(self.vel[:h], dt, out=self._step[:h])
+        self.prev[:h] = self.pos[:h]
+        self.pos[:h] += step
+
+        # Full alpha until the last PROJECTILE_FADE_TIME seconds, then down to 0
+        fade = np.subtract(PROJECTILE_LIFETIME, age, out=self._fade[:h])
+        fade *= 255 / PROJECTILE_FADE_TIME
+        np.clip(fade, 0, 255, out=fade)
+        self.alpha[:h] = fade
+
+        dead = np.greater_equal(age, PROJECTILE_LIFETIME, out=self._dead[:h])
+        dead &= self.active[:h]
+        if dead.any():
+            self.release(np.flatnonzero(dead))
+
+    def circle_hits(self, center, radius, prev_center=None):
+        """
+        Slots of the projectiles whose square touched a circle this frame.
+
+        Both move in a straight line over the frame: the squares from prev to
+        pos, the circle from prev_center to center. Anything that touched at
+        any moment counts, so fast shots (or long frames) can't skip over it.
+        """
+        h = self.high
+        center = np.asarray(center, dtype=float)
+        prev_center = center if prev_center is None else np.asarray(prev_center, dtype=float)
+
+        # Seen from the circle, it stands still at (0, 0) and each square
+        # slides from a to b. Rough cut first: the slide's bounding box,
+        # grown by the square and the circle, has to cover (0, 0). Rows
+        # first, over everything; columns only for the few rows that pass
+        half = PROJECTILE_SIZE / 2
+        reach = half + radius
+        a = self.prev[:h, 1] - prev_center[1]
+        b = self.pos[:h, 1] - center[1]
+        slots = np.flatnonzero((np.minimum(a, b) <= reach) & (np.maximum(a, b) >= -reach)
+                               & self.active[:h])
+        a = self.prev[slots, 0] - prev_center[0]
+        b = self.pos[slots, 0] - center[0]
+        slots = slots[(np.minimum(a, b) <= reach) & (np.maximum(a, b) >= -reach)]
+        if len(slots) == 0:
+            return slots
+        a = self.prev[slots] - prev_center
+        b = self.pos[slots] - center
+        d = b - a
+
+        # The square at center p touches the circle when the point p comes
+        # within radius of the square at (0, 0) (same distance, flipped). So
+        # this is "segment a-b vs square": either it crosses the square...
+        with np.errstate(divide="ignore", invalid="ignore"):
+            t1 = (-half - a) / d
+            t2 = (half - a) / d
+        enter = np.minimum(t1, t2).max(axis=1)
+        leave = np.maximum(t1, t2).min(axis=1)
+        hit = (enter <= leave) & (leave >= 0) & (enter <= 1)
+
+        # ...or the closest pair is an end of the segment and the square, or
+        # a corner of the square and the segment
+        r2 = radius * radius
+        for p in (a, b):
+            q = np.maximum(np.abs(p) - half, 0.0)
+            hit |= np.einsum("ij,ij->i", q, q) <= r2
+        length_sq = np.einsum("ij,ij->i", d, d)
+        length_sq[length_sq == 0] = 1.0
+        for corner in ((-half, -half), (half, -half), (-half, half), (half, half)):
+            t = np.clip(np.einsum("ij,ij->i", corner - a, d) / length_sq, 0.0, 1.0)
+            gap = a + d * t[:, None] - corner
+            hit |= np.einsum("ij,ij->i", gap, gap) <= r2
+        return slots[hit]
+
+    def build_sprites(self):
+        """Bake the fade ramp (call after pygame.display.set_mode)."""
+        self._sprites = []
+        for step in range(PROJECTILE_ALPHA_STEPS):
+            alpha = round(255 * step / (PROJECTILE_ALPHA_STEPS - 1))
+            s = pygame.Surface((PROJECTILE_SIZE, PROJECTILE_SIZE), pygame.SRCALPHA)
+            s.fill((*PROJECTILE_COLOR, alpha))
+            self._sprites.append(s.convert_alpha())
 
-        time_left = PROJECTILE_LIFETIME - self.age
-        if time_left <= PROJECTILE_FADE_TIME:
-            self.alpha = int(255 * max(time_left / PROJECTILE_FADE_TIME, 0))
-        else:
-            self.alpha = 255
+    def draw(self, surf):
+        if self._sprites is None:
+            self.build_sprites()
+        live = self.live()
 
-    def alive(self):
-        return self.age < PROJECTILE_LIFETIME
+        # alpha 0-255 -> nearest baked step; step 0 is invisible, so skip it
+        steps = (self.alpha[live] * (PROJECTILE_ALPHA_STEPS - 1) + 127) // 255
+        shown = steps > 0
+        corners = self.pos[live[shown]].astype(int) - PROJECTILE_SIZE // 2
 
-    def draw(self, surf):
-        if self.alpha <= 0:
-            return
-        s = pygame.Surface((PROJECTILE_SIZE, PROJECTILE_SIZE), pygame.SRCALPHA)
-        pygame.draw.rect(s, (*PROJECTILE_COLOR, self.alpha), s.get_rect())
-        surf.blit(s, self.rect)
+        sprites = map(self._sprites.__getitem__, steps[shown].tolist())
+        surf.blits(zip(sprites, corners.tolist()), doreturn=False)
 
 # =====================================================
 # STATE
@@ -132,6 +299,7 @@ state = {
     # Sword
     "sword_timer": 0.0,
     "sword_active": False,
+    "sword_progress": 0.0,         # How far through the swing the blade was last frame
     "afterimages": [],
     "space_was_down": False,       # <-- NEW: prevents hold-to-repeat
     "sword_hit_this_swing": False, # <-- NEW: prevents multi-hit per swing
@@ -170,7 +338,7 @@ UI_TEXT_COLOR = (240, 240, 240)
 UI_SUBTEXT_COLOR = (200, 200, 200)
 
 
-projectiles = []
+projectiles = ProjectilePool()
 
 # Game end state
 game_over = False
@@ -205,6 +373,14 @@ def damage_boss(from_pos):
         knock = pygame.Vector2(0, 1)
     state["player_vel"] = knock.normalize() * KNOCKBACK_FORCE
 
+def state_values():
+    """The numbers a replay checksums to spot two runs drifting apart."""
+    return (
+        state["player_pos"], state["player_vel"], state["player_hp"],
+        state["boss_pos"], state["boss_hp"], state["pattern_index"],
+        projectiles.pos[projectiles.live()],
+    )
+
 # =====================================================
 # PATTERN CONTROL
 # =====================================================
@@ -225,7 +401,7 @@ def pattern_projectile_rain(dt):
     data["spawn"] += dt
     while data["spawn"] >= PROJECTILE_INTERVAL:
         data["spawn"] -= PROJECTILE_INTERVAL
-        projectiles.append(Projectile(random.randint(20, WIDTH - 20), -20))
+        projectiles.spawn(random.randint(20, WIDTH - 20), -20)
 
 def pattern_direct_charge(dt):
     data = state["pattern_data"]
@@ -285,248 +461,302 @@ PATTERNS = [
 # =====================================================
 # MAIN LOOP
 # =====================================================
-running = True
-while running:
-    dt = clock.tick(FPS) / 1000.0
-
-    for e in pygame.event.get():
-        if e.type == pygame.QUIT:
-            running = False
-
-    keys = pygame.key.get_pressed()
-
-    # -------------------------------------------------
-    # If game over, stop updating gameplay (but keep drawing)
-    # -------------------------------------------------
-    if not game_over:
-
-        # ---------------- PLAYER MOVEMENT ----------------
-        if not state["sword_active"]:  # <-- movement lock during attack
-            move = pygame.Vector2(
-                keys[pygame.K_d] - keys[pygame.K_a],
-                keys[pygame.K_s] - keys[pygame.K_w],
+def main(argv=None):
+    global game_over, game_result
+
+    # ---------------- INIT ----------------
+    # Live play, --record or --replay (also seeds random)
+    session = ReplaySession.from_args(argv, "pattern3", TRACKED_KEYS, FPS)
+
+    pygame.init()
+    pygame.mixer.init()
+
+    screen = pygame.display.set_mode((WIDTH, HEIGHT))
+    pygame.display.set_caption("Boss Pattern Demo (Combat Restored)")
+    projectiles.build_sprites()
+
+    # Fonts load once; the HP numbers come from a pre-rendered digit strip
+    ui_font = text_cache.get_font(None, 24)
+    hp_digits = text_cache.GlyphAtlas(ui_font, UI_TEXT_COLOR)
+    clock = pygame.time.Clock()
+    attack_sounds = [
+        pygame.mixer.Sound("attack1.wav"),
+        pygame.mixer.Sound("attack2.wav")
+    ]
+
+    # Replays are benchmark runs, so they always record timings
+    profiler = FrameProfiler(enabled=PROFILE or session.replaying, csv_path=PROFILE_CSV)
+
+    running = True
+    while running:
+        dt = session.tick(clock)
+        profiler.begin_frame()
+
+        for e in pygame.event.get():
+            if e.type == pygame.QUIT:
+                running = False
+            profiler.handle_event(e)
+        profiler.lap("events")
+
+        controls = session.poll()
+        if controls is None:  # Replay finished
+            break
+        keys = controls.keys
+
+        # -------------------------------------------------
+        # If game over, stop updating gameplay (but keep drawing)
+        # -------------------------------------------------
+        if not game_over:
+
+            # ---------------- PLAYER MOVEMENT ----------------
+            player_start = state["player_pos"].copy()  # For the swept projectile test
+            if not state["sword_active"]:  # <-- movement lock during attack
+                move = pygame.Vector2(
+                    keys[pygame.K_d] - keys[pygame.K_a],
+                    keys[pygame.K_s] - keys[pygame.K_w],
+                )
+
+                if move.length():
+                    state["facing"] = move.normalize()
+                    state["player_pos"] += state["facing"] * PLAYER_SPEED * dt
+
+
+            state["player_pos"] += state["player_vel"] * dt
+            state["player_vel"] *= 0.85
+
+            state["player_pos"].x = clamp(state["player_pos"].x, PLAYER_RADIUS, WIDTH - PLAYER_RADIUS)
+            state["player_pos"].y = clamp(state["player_pos"].y, PLAYER_RADIUS, HEIGHT - PLAYER_RADIUS)
+
+            if state["invuln"] > 0:
+                state["invuln"] -= dt
+
+            # ---------------- SWORD (PRESS ONCE, NO HOLD-TO-REPEAT, UNINTERRUPTIBLE) ----------------
+            space_down = keys[pygame.K_SPACE]
+            space_pressed_this_frame = space_down and (not state["space_was_down"])
+
+            # Only start a new swing if:
+            # 1) Space was PRESSED this frame (not held)
+            # 2) Sword is NOT already swinging
+            if space_pressed_this_frame and (not state["sword_active"]):
+                state["sword_active"] = True
+                state["sword_timer"] = SWORD_TIME
+                state["sword_hit_this_swing"] = False
+                state["sword_progress"] = 0.0
+                # Play random swing sound
+                random.choice(attack_sounds).play()
+
+            # Update sword swing if active (cannot be interrupted)
+            sword_sweep = None
+            if state["sword_active"]:
+                state["sword_timer"] -= dt
+                progress = 1 - (state["sword_timer"] / SWORD_TIME)
+
+                # Part of the swing the blade covered this frame (the last
+                # frame finishes the arc, so no part of it is ever skipped)
+                sword_sweep = (state["sword_progress"], min(progress, 1.0))
+                state["sword_progress"] = progress
+
+                state["afterimages"].append({
+                    "progress": progress,
+                    "time": SWORD_AFTERIMAGE_TIME
+                })
+
+                if state["sword_timer"] <= 0:
+                    state["sword_active"] = False
+
+            # Afterimage decay
+            for a in state["afterimages"]:
+                a["time"] -= dt
+            state["afterimages"] = [a for a in state["afterimages"] if a["time"] > 0]
+
+            # Update space tracking LAST (so "pressed" is computed correctly)
+            state["space_was_down"] = space_down
+
+            # ---------------- BOSS FSM ----------------
+            if state["boss_state"] == "pause":
+                state["pause_timer"] += dt
+                state["boss_pos"] = TOP_MIDDLE.copy()
+                if state["pause_timer"] >= BETWEEN_PATTERN_PAUSE:
+                    state["boss_state"] = "telegraph"
+                    state["telegraph_timer"] = 0.0
+
+            elif state["boss_state"] == "telegraph":
+                state["telegraph_timer"] += dt
+                if state["telegraph_timer"] >= TELEGRAPH_TIME:
+                    state["boss_state"] = "attack"
+                    state["pattern_timer"] = 0.0
+                    state["pattern_data"] = {}
+
+            elif state["boss_state"] == "attack":
+                state["pattern_timer"] += dt
+                PATTERNS[state["pattern_index"]](dt)
+                if state["pattern_timer"] >= PATTERN_TIME:
+                    start_return()
+
+            elif state["boss_state"] == "return":
+                state["boss_pos"] = move_towards(
+                    state["boss_pos"], TOP_MIDDLE, BOSS_MOVE_SPEED, dt
+                )
+                if state["boss_pos"] == TOP_MIDDLE:
+                    state["boss_state"] = "pause"
+                    state["pause_timer"] = 0.0
+                    state["pattern_index"] = (state["pattern_index"] + 1) % len(PATTERNS)
+
+            profiler.lap("update")
+
+            # ---------------- PROJECTILES ----------------
+            projectiles.update(dt)
+            profiler.lap("projectiles.update")
+
+            # ---------------- COLLISIONS ----------------
+            boss_rect = pygame.Rect(
+                state["boss_pos"].x - BOSS_SIZE // 2,
+                state["boss_pos"].y - BOSS_SIZE // 2,
+                BOSS_SIZE,
+                BOSS_SIZE
             )
 
-            if move.length():
-                state["facing"] = move.normalize()
-                state["player_pos"] += state["facing"] * PLAYER_SPEED * dt
+            # Player touching boss
+            if circle_rect_collision(state["player_pos"], PLAYER_RADIUS, boss_rect):
+                damage_player(state["boss_pos"])
 
+            # Player hit by projectile (anywhere along this frame's movement)
+            for i in projectiles.circle_hits(state["player_pos"], PLAYER_RADIUS, player_start):
+                damage_player(pygame.Vector2(*projectiles.pos[i]))
 
-        state["player_pos"] += state["player_vel"] * dt
-        state["player_vel"] *= 0.85
+            # Sword → Boss (only one hit per swing), tested against the whole
+            # slice the blade swept this frame, so a low frame rate can't skip it
+            if sword_sweep and (not state["sword_hit_this_swing"]):
+                start, end = (-SWORD_ARC_DEG / 2 + p * SWORD_ARC_DEG for p in sword_sweep)
+                arc = SweptArc(state["player_pos"], SWORD_RANGE, state["facing"], start, end)
 
-        state["player_pos"].x = clamp(state["player_pos"].x, PLAYER_RADIUS, WIDTH - PLAYER_RADIUS)
-        state["player_pos"].y = clamp(state["player_pos"].y, PLAYER_RADIUS, HEIGHT - PLAYER_RADIUS)
+                if arc.hits_rect(boss_rect):
+                    damage_boss(state["boss_pos"])
+                    state["sword_hit_this_swing"] = True
+            profiler.lap("collisions")
 
-        if state["invuln"] > 0:
-            state["invuln"] -= dt
+            # ---------------- BOSS DAMAGE FLASH UPDATE ----------------
+            if state["boss_flashes_left"] > 0:
+                state["boss_flash_timer"] += dt
+                if state["boss_flash_timer"] >= state["boss_flash_interval"]:
+                    state["boss_flash_timer"] = 0.0
 
-        # ---------------- SWORD (PRESS ONCE, NO HOLD-TO-REPEAT, UNINTERRUPTIBLE) ----------------
-        space_down = keys[pygame.K_SPACE]
-        space_pressed_this_frame = space_down and (not state["space_was_down"])
+                    # Toggle flash on/off
+                    state["boss_flash_on"] = not state["boss_flash_on"]
 
-        # Only start a new swing if:
-        # 1) Space was PRESSED this frame (not held)
-        # 2) Sword is NOT already swinging
-        if space_pressed_this_frame and (not state["sword_active"]):
-            state["sword_active"] = True
-            state["sword_timer"] = SWORD_TIME
-            state["sword_hit_this_swing"] = False
-            # Play random swing sound
-            random.choice(attack_sounds).play()
+                    # Count a flash when we finish a red "on" cycle
+                    if state["boss_flash_on"] is False:
+                        state["boss_flashes_left"] -= 1
 
-        # Update sword swing if active (cannot be interrupted)
-        if state["sword_active"]:
-            state["sword_timer"] -= dt
-            progress = 1 - (state["sword_timer"] / SWORD_TIME)
+            # ---------------- WIN / LOSE CHECKS ----------------
+            if state["boss_hp"] <= 0:
+                game_over = True
+                game_result = "WIN"
 
-            state["afterimages"].append({
-                "progress": progress,
-                "time": SWORD_AFTERIMAGE_TIME
-            })
+            if state["player_hp"] <= 0:
+                game_over = True
+                game_result = "LOSE"
 
-            if state["sword_timer"] <= 0:
-                state["sword_active"] = False
+        session.end_frame(state_values)
 
-        # Afterimage decay
-        for a in state["afterimages"]:
-            a["time"] -= dt
-        state["afterimages"] = [a for a in state["afterimages"] if a["time"] > 0]
-
-        # Update space tracking LAST (so "pressed" is computed correctly)
-        state["space_was_down"] = space_down
-
-        # ---------------- BOSS FSM ----------------
-        if state["boss_state"] == "pause":
-            state["pause_timer"] += dt
-            state["boss_pos"] = TOP_MIDDLE.copy()
-            if state["pause_timer"] >= BETWEEN_PATTERN_PAUSE:
-                state["boss_state"] = "telegraph"
-                state["telegraph_timer"] = 0.0
-
-        elif state["boss_state"] == "telegraph":
-            state["telegraph_timer"] += dt
-            if state["telegraph_timer"] >= TELEGRAPH_TIME:
-                state["boss_state"] = "attack"
-                state["pattern_timer"] = 0.0
-                state["pattern_data"] = {}
-
-        elif state["boss_state"] == "attack":
-            state["pattern_timer"] += dt
-            PATTERNS[state["pattern_index"]](dt)
-            if state["pattern_timer"] >= PATTERN_TIME:
-                start_return()
+        # =================================================
+        # DRAW (always runs)
+        # =================================================
+        screen.fill(BG_COLOR)
 
-        elif state["boss_state"] == "return":
-            state["boss_pos"] = move_towards(
-                state["boss_pos"], TOP_MIDDLE, BOSS_MOVE_SPEED, dt
-            )
-            if state["boss_pos"] == TOP_MIDDLE:
-                state["boss_state"] = "pause"
-                state["pause_timer"] = 0.0
-                state["pattern_index"] = (state["pattern_index"] + 1) % len(PATTERNS)
-
-        # ---------------- PROJECTILES ----------------
-        for p in projectiles:
-            p.update(dt)
-        projectiles = [p for p in projectiles if p.alive()]
-
-        # ---------------- COLLISIONS ----------------
-        boss_rect = pygame.Rect(
+        boss_rect_draw = pygame.Rect(
             state["boss_pos"].x - BOSS_SIZE // 2,
             state["boss_pos"].y - BOSS_SIZE // 2,
             BOSS_SIZE,
             BOSS_SIZE
         )
 
-        # Player touching boss
-        if circle_rect_collision(state["player_pos"], PLAYER_RADIUS, boss_rect):
-            damage_player(state["boss_pos"])
-
-        # Player hit by projectile
-        for p in projectiles:
-            if p.rect.collidepoint(state["player_pos"]):
-                damage_player(p.pos)
-
-        # Sword → Boss (only one hit per swing)
-        if state["sword_active"] and (not state["sword_hit_this_swing"]):
-            progress = 1 - (state["sword_timer"] / SWORD_TIME)
-            angle = -SWORD_ARC_DEG / 2 + progress * SWORD_ARC_DEG
-            d = state["facing"].rotate(angle)
-            tip = state["player_pos"] + d * SWORD_RANGE
-
-            if boss_rect.collidepoint(tip):
-                damage_boss(state["boss_pos"])
-                state["sword_hit_this_swing"] = True
-
-        # ---------------- BOSS DAMAGE FLASH UPDATE ----------------
-        if state["boss_flashes_left"] > 0:
-            state["boss_flash_timer"] += dt
-            if state["boss_flash_timer"] >= state["boss_flash_interval"]:
-                state["boss_flash_timer"] = 0.0
-
-                # Toggle flash on/off
-                state["boss_flash_on"] = not state["boss_flash_on"]
-
-                # Count a flash when we finish a red "on" cycle
-                if state["boss_flash_on"] is False:
-                    state["boss_flashes_left"] -= 1
-
-        # ---------------- WIN / LOSE CHECKS ----------------
-        if state["boss_hp"] <= 0:
-            game_over = True
-            game_result = "WIN"
-
-        if state["player_hp"] <= 0:
-            game_over = True
-            game_result = "LOSE"
-
-    # =================================================
-    # DRAW (always runs)
-    # =================================================
-    screen.fill(BG_COLOR)
-
-    boss_rect_draw = pygame.Rect(
-        state["boss_pos"].x - BOSS_SIZE // 2,
-        state["boss_pos"].y - BOSS_SIZE // 2,
-        BOSS_SIZE,
-        BOSS_SIZE
-    )
-
-    # Boss color (telegraph + damage flash)
-    boss_color = BOSS_BASE_COLOR
-
-
-    # Telegraph overrides base boss color (yellow / light blue)
-    if state["boss_state"] == "telegraph":
-        if int(state["telegraph_timer"] / BLINK_RATE) % 2 == 0:
-            boss_color = (
-                BOSS_TELEGRAPH_BLUE
-                if state["pattern_index"] == 0
-                else BOSS_TELEGRAPH_YELLOW
-            )
-
-    # Damage flash: blink red 3 times
-    if state["boss_flashes_left"] > 0 and state["boss_flash_on"]:
-        boss_color = (255, 40, 40)
-
-
-    pygame.draw.rect(screen, boss_color, boss_rect_draw)
-
-    # Sword afterimages
-    for a in state["afterimages"]:
-        t = a["time"] / SWORD_AFTERIMAGE_TIME
-        ang = -SWORD_ARC_DEG / 2 + a["progress"] * SWORD_ARC_DEG
-        d = state["facing"].rotate(ang)
-        pygame.draw.line(
-            screen,
-            (255, 255, 255, int(160 * t)),
-            state["player_pos"],
-            state["player_pos"] + d * SWORD_RANGE,
-            3
-        )
-
-    # Active sword
-    if state["sword_active"]:
-        progress = 1 - (state["sword_timer"] / SWORD_TIME)
-        ang = -SWORD_ARC_DEG / 2 + progress * SWORD_ARC_DEG
-        d = state["facing"].rotate(ang)
-        pygame.draw.line(
-            screen,
-            (255, 255, 255),
-            state["player_pos"],
-            state["player_pos"] + d * SWORD_RANGE,
-            5
-        )
+        # Boss color (telegraph + damage flash)
+        boss_color = BOSS_BASE_COLOR
 
-    # Player (invuln flash)
-    if state["invuln"] <= 0 or int(state["invuln"] * 10) % 2 == 0:
-        pygame.draw.circle(screen, PLAYER_COLOR, state["player_pos"], PLAYER_RADIUS)
 
+        # Telegraph overrides base boss color (yellow / light blue)
+        if state["boss_state"] == "telegraph":
+            if int(state["telegraph_timer"] / BLINK_RATE) % 2 == 0:
+                boss_color = (
+                    BOSS_TELEGRAPH_BLUE
+                    if state["pattern_index"] == 0
+                    else BOSS_TELEGRAPH_YELLOW
+                )
 
-    # Projectiles
-    for p in projectiles:
-        p.draw(screen)
+        # Damage flash: blink red 3 times
+        if state["boss_flashes_left"] > 0 and state["boss_flash_on"]:
+            boss_color = (255, 40, 40)
 
-    # UI
-    font = pygame.font.SysFont(None, 24)
-    screen.blit(font.render(f"Player HP: {state['player_hp']}", True, UI_TEXT_COLOR), (10, 10))
-    screen.blit(font.render(f"Boss HP: {state['boss_hp']}", True, UI_TEXT_COLOR), (10, 32))
 
-    # Game Over Text
-    if game_over:
-        big = pygame.font.SysFont(None, 72)
-        msg = "YOU WIN!" if game_result == "WIN" else "YOU LOSE!"
-        text = big.render(msg, True, (240, 240, 240))
-        rect = text.get_rect(center=(WIDTH // 2, HEIGHT // 2))
-        screen.blit(text, rect)
+        pygame.draw.rect(screen, boss_color, boss_rect_draw)
 
-        small = pygame.font.SysFont(None, 28)
-        sub = small.render("Close the window to exit.", True, (200, 200, 200))
-        sub_rect = sub.get_rect(center=(WIDTH // 2, HEIGHT // 2 + 55))
-        screen.blit(sub, sub_rect)
+        # Sword afterimages
+        for a in state["afterimages"]:
+            t = a["time"] / SWORD_AFTERIMAGE_TIME
+            ang = -SWORD_ARC_DEG / 2 + a["progress"] * SWORD_ARC_DEG
+            d = state["facing"].rotate(ang)
+            pygame.draw.line(
+                screen,
+                (255, 255, 255, int(160 * t)),
+                state["player_pos"],
+                state["player_pos"] + d * SWORD_RANGE,
+                3
+            )
 
-    pygame.display.flip()
+        # Active sword
+        if state["sword_active"]:
+            progress = 1 - (state["sword_timer"] / SWORD_TIME)
+            ang = -SWORD_ARC_DEG / 2 + progress * SWORD_ARC_DEG
+            d = state["facing"].rotate(ang)
+            pygame.draw.line(
+                screen,
+                (255, 255, 255),
+                state["player_pos"],
+                state["player_pos"] + d * SWORD_RANGE,
+                5
+            )
 
-pygame.quit()
-sys.exit()
+        # Player (invuln flash)
+        if state["invuln"] <= 0 or int(state["invuln"] * 10) % 2 == 0:
+            pygame.draw.circle(screen, PLAYER_COLOR, state["player_pos"], PLAYER_RADIUS)
+        profiler.lap("draw")
+
+
+        # Projectiles
+        projectiles.draw(screen)
+        profiler.lap("projectiles.draw")
+
+        # UI
+        for label, value, y in (("Player HP: ", state["player_hp"], 10), ("Boss HP: ", state["boss_hp"], 32)):
+            text = text_cache.render(label, ui_font, UI_TEXT_COLOR)
+            screen.blit(text, (10, y))
+            hp_digits.draw(screen, str(value), (10 + text.get_width(), y))
+
+        # Game Over Text
+        if game_over:
+            big = text_cache.get_font(None, 72)
+            msg = "YOU WIN!" if game_result == "WIN" else "YOU LOSE!"
+            text = text_cache.render(msg, big, (240, 240, 240))
+            rect = text.get_rect(center=(WIDTH // 2, HEIGHT // 2))
+            screen.blit(text, rect)
+
+            small = text_cache.get_font(None, 28)
+            sub = text_cache.render("Close the window to exit.", small, (200, 200, 200))
+            sub_rect = sub.get_rect(center=(WIDTH // 2, HEIGHT // 2 + 55))
+            screen.blit(sub, sub_rect)
+        profiler.lap("ui")
+
+        profiler.draw(screen)
+        pygame.display.flip()
+        profiler.lap("flip")
+        profiler.end_frame()
+
+    profiler.close()
+    session.close()
+    pygame.quit()
+    sys.exit()
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
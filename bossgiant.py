@@ -9,6 +9,11 @@ import math
 import sys
 import random
 
+import text_cache
+from profiler import FrameProfiler
+from replay import ReplaySession
+from static_layer import StaticLayer
+
 # ==================================================
 # CONFIG
 # ==================================================
@@ -43,26 +48,19 @@ BOSS_FLASHES = 3
 PLAYER_KNOCKBACK_SPEED = 420
 PLAYER_KNOCKBACK_TIME = 0.18
 
-# ==================================================
-# INIT
-# ==================================================
-pygame.init()
-font = pygame.font.SysFont("arial", 24, bold=True)
-big_font = pygame.font.SysFont("arial", 32, bold=True)
-pygame.mixer.init()
-screen = pygame.display.set_mode((WIDTH, HEIGHT))
-pygame.display.set_caption("Graph Theory Boss Fight")
-clock = pygame.time.Clock()
-
-# Load stomp sounds
+BACKGROUND = (20, 22, 28)
+
+# Profiling (F3 shows the timing overlay)
+PROFILE = False                     # Time every frame from the start
+PROFILE_CSV = "profile_giant.csv"   # Per-frame timings written on exit
+
+# Record / replay:
+#   python bossgiant.py --record fight.rpl
+#   python bossgiant.py --replay fight.rpl --checksums out.txt
+TRACKED_KEYS = (pygame.K_w, pygame.K_a, pygame.K_s, pygame.K_d)
+
+# Stomp sounds (loaded in main())
 quake_sounds = []
-for i in range(1, 4):
-    try:
-        s = pygame.mixer.Sound(f"quake{i}.wav")
-        s.set_volume(0.8)
-        quake_sounds.append(s)
-    except:
-        pass
 
 # ==================================================
 # CUSTOM NODE LAYOUT
@@ -100,6 +98,24 @@ def compute_custom_nodes(player_pos):
 def nearest_node(pos, nodes):
     return min(nodes.keys(), key=lambda n: (nodes[n]-pos).length_squared())
 
+def draw_graph(surface, offset=(0,0), player_part=False):
+    """Draw either the player's node (4) and its edges, or the rest of the graph."""
+    ends = {4}  # Nodes drawn again on top of the player's edges
+    for a,b in custom_edges:
+        if (4 in (a,b)) == player_part:
+            pygame.draw.line(surface,(80,80,80),custom_nodes[a]+offset,custom_nodes[b]+offset,2)
+            ends.update((a,b))
+
+    for n,pos in custom_nodes.items():
+        if (n in ends if player_part else n!=4):
+            color = (100,200,255) if n==4 else (200,200,200)
+            pygame.draw.circle(surface,color,pos+offset,10)
+
+def paint_graph(surface):
+    """Static part of the arena: the graph away from the player, unless it's following them."""
+    if not graph_following:
+        draw_graph(surface)
+
 # ==================================================
 # COLLISION
 # ==================================================
@@ -149,6 +165,9 @@ def reset_room(state):
 # ==================================================
 initial_player_pos = pygame.Vector2(WIDTH//2, HEIGHT-100)
 custom_nodes, custom_edges, custom_neighbors = compute_custom_nodes(initial_player_pos)
+graph_built_at = pygame.Vector2(initial_player_pos)  # Player position the graph was built for
+graph_version = 0         # Bumped on every rebuild; the background layer's key
+graph_following = False   # Graph is tracking the player, so it's drawn live, not in the layer
 
 state = {
     "player_pos": custom_nodes[4],
@@ -174,6 +193,12 @@ state = {
     "taunt_timer": 0.0
 }
 
+def state_values():
+    """The numbers a replay checksums to spot two runs drifting apart."""
+    return (state["player_pos"], state["boss_world"], state["boss_life"],
+            state["boss_node"], state["shake_timer"],
+            [b.pos for b in state["bullets"]])
+
 # ==================================================
 # BOSS AI
 # ==================================================
@@ -229,144 +254,198 @@ def update_boss_graph(state, dt):
 # ==================================================
 # MAIN LOOP
 # ==================================================
-running = True
-while running:
-    dt = clock.tick(FPS)/1000.0
-
-    # Recompute dynamic nodes so node 4 = player
-    if state["boss_wait_timer"] > 0:
-        custom_nodes, custom_edges, custom_neighbors = compute_custom_nodes(state["player_pos"])
-
-    if state["taunt_timer"] > 0:
-        state["taunt_timer"] -= dt
-
-    for event in pygame.event.get():
-        if event.type == pygame.QUIT:
-            running = False
-
-    keys = pygame.key.get_pressed()
-
-    # ---------------- PLAYER MOVEMENT ----------------
-    if state["player_knockback_timer"] > 0:
-        state["player_knockback_timer"] -= dt
-        state["player_pos"] += state["player_knockback_vel"]*dt
-        state["player_knockback_vel"] *= 0.85
-    elif state["player_pause_timer"] > 0:
-        state["player_pause_timer"] -= dt
-    else:
-        move = pygame.Vector2(keys[pygame.K_d]-keys[pygame.K_a],
-                              keys[pygame.K_s]-keys[pygame.K_w])
-        if move.length_squared() > 0:
-            move = move.normalize()
-            state["player_pos"] += move*PLAYER_SPEED*dt
-
-    # Clamp to screen
-    state["player_pos"].x = max(PLAYER_RADIUS, min(WIDTH-PLAYER_RADIUS, state["player_pos"].x))
-    state["player_pos"].y = max(PLAYER_RADIUS, min(HEIGHT-PLAYER_RADIUS, state["player_pos"].y))
-
-    # ---------------- SHOOTING ----------------
-    state["fire_timer"] -= dt
-    mouse_pressed = pygame.mouse.get_pressed()
-    if mouse_pressed[0] and state["fire_timer"] <= 0 and state["shake_timer"] <= 0:
-        mouse_pos = pygame.Vector2(pygame.mouse.get_pos())
-        dir_vec = mouse_pos - state["player_pos"]
-        if dir_vec.length_squared() > 0:
-            vel = dir_vec.normalize()*BULLET_SPEED
-            state["bullets"].append(Bullet(state["player_pos"], vel))
-            state["fire_timer"] = FIRE_COOLDOWN
-
-    # ---------------- BULLETS ----------------
-    for b in state["bullets"][:]:
-        b.update(dt)
-        if b.pos.x<0 or b.pos.x>WIDTH or b.pos.y<0 or b.pos.y>HEIGHT:
-            state["bullets"].remove(b)
-
-    # ---------------- BOSS ----------------
-    update_boss_graph(state, dt)
-    boss_rect = pygame.Rect(state["boss_world"].x-BOSS_SIZE//2,
-                            state["boss_world"].y-BOSS_SIZE//2,
-                            BOSS_SIZE, BOSS_SIZE)
-
-    # Boss hit
-    for b in state["bullets"][:]:
-        if boss_rect.collidepoint(b.pos.x, b.pos.y):
-            state["bullets"].remove(b)
-            state["boss_life"] -= 1
-            if state["boss_life"] <= BOSS_MAX_LIFE*0.25 and not state["taunt_shown"]:
-                state["taunt_shown"] = True
-                state["taunt_timer"] = 4.0
-            state["boss_hit_timer"] = BOSS_HIT_SLOW_TIME
-            state["boss_speed_multiplier"] = BOSS_HIT_SPEED_MULT
-            state["boss_flash_count"] = BOSS_FLASHES*2
-            state["boss_flash_timer"] = BOSS_FLASH_INTERVAL
-            if state["boss_life"] <= 0:
-                reset_room(state)
-
-    if state["boss_hit_timer"] > 0:
-        state["boss_hit_timer"] -= dt
-        if state["boss_hit_timer"] <= 0:
-            state["boss_speed_multiplier"] = 1.0
-
-    if state["boss_flash_count"] > 0:
-        state["boss_flash_timer"] -= dt
-        if state["boss_flash_timer"] <= 0:
-            state["boss_flash_timer"] = BOSS_FLASH_INTERVAL
-            state["boss_flash_count"] -= 1
-
-    # Player collision
-    if circle_rect_collision(state["player_pos"].x, state["player_pos"].y, PLAYER_RADIUS,
-                             boss_rect.x, boss_rect.y, boss_rect.width, boss_rect.height):
-        direction = state["player_pos"] - state["boss_world"]
-        if direction.length_squared() > 0:
-            state["player_knockback_vel"] = direction.normalize()*PLAYER_KNOCKBACK_SPEED
-            state["player_knockback_timer"] = PLAYER_KNOCKBACK_TIME
-
-    # Camera shake
-    camera_offset = pygame.Vector2(0,0)
-    if state["shake_timer"] > 0:
-        state["shake_timer"] -= dt
-        intensity = (state["shake_timer"]/SHAKE_DURATION)*SHAKE_STRENGTH
-        camera_offset.x = random.uniform(-intensity,intensity)
-        camera_offset.y = random.uniform(-intensity,intensity)
-
-    # ---------------- DRAW ----------------
-    screen.fill((20,22,28))
-
-    # Draw edges
-    for a,b in custom_edges:
-        pygame.draw.line(screen,(80,80,80),custom_nodes[a]+camera_offset,custom_nodes[b]+camera_offset,2)
-
-    # Draw nodes
-    for n,pos in custom_nodes.items():
-        color = (100,200,255) if n==4 else (200,200,200)
-        pygame.draw.circle(screen,color,pos+camera_offset,10)
-
-    # Draw player
-    pygame.draw.circle(screen,(90,200,255),state["player_pos"]+camera_offset,PLAYER_RADIUS)
-
-    # Draw boss
-    boss_color = (255,255,120) if state["boss_flash_count"]%2==1 else (220,80,80)
-    pygame.draw.rect(screen,boss_color,boss_rect.move(camera_offset.x,camera_offset.y))
-
-    # Draw bullets
-    for b in state["bullets"]:
-        pygame.draw.circle(screen,(255,240,120),b.pos+camera_offset,BULLET_RADIUS)
-
-    # Taunt
-    if state["taunt_timer"] > 0:
-        text1 = big_font.render("I used to be the captain of the basketball team.", True, (255,240,200))
-        text2 = big_font.render("I will trash you, smalls.", True, (255,180,180))
-        box_w = max(text1.get_width(), text2.get_width())+40
-        box_h = text1.get_height()+text2.get_height()+30
-        box_x = WIDTH//2 - box_w//2
-        box_y = 40
-        pygame.draw.rect(screen,(0,0,0),(box_x,box_y,box_w,box_h))
-        pygame.draw.rect(screen,(200,60,60),(box_x,box_y,box_w,box_h),2)
-        screen.blit(text1,(WIDTH//2 - text1.get_width()//2, box_y+8))
-        screen.blit(text2,(WIDTH//2 - text2.get_width()//2, box_y+8+text1.get_height()))
-
-    pygame.display.flip()
-
-pygame.quit()
-sys.exit()
-
+def main(argv=None):
+    global custom_nodes, custom_edges, custom_neighbors
+    global graph_built_at, graph_version, graph_following
+
+    # ------------------ INIT ------------------
+    # Live play, --record or --replay (also seeds random)
+    session = ReplaySession.from_args(argv, "giant", TRACKED_KEYS, FPS)
+
+    pygame.init()
+    big_font = text_cache.get_font("arial", 32, bold=True)
+    pygame.mixer.init()
+    screen = pygame.display.set_mode((WIDTH, HEIGHT))
+    pygame.display.set_caption("Graph Theory Boss Fight")
+    clock = pygame.time.Clock()
+
+    # Backdrop + graph, only redrawn when the graph moves
+    background = StaticLayer((WIDTH, HEIGHT), BACKGROUND, paint_graph)
+
+    # Load stomp sounds
+    for i in range(1, 4):
+        try:
+            s = pygame.mixer.Sound(f"quake{i}.wav")
+            s.set_volume(0.8)
+            quake_sounds.append(s)
+        except:
+            pass
+
+    # Replays are benchmark runs, so they always record timings
+    profiler = FrameProfiler(enabled=PROFILE or session.replaying, csv_path=PROFILE_CSV)
+
+    running = True
+    while running:
+        dt = session.tick(clock)
+        profiler.begin_frame()
+
+        # Recompute dynamic nodes so node 4 = player (only if the player moved)
+        if state["boss_wait_timer"] > 0:
+            if state["player_pos"] != graph_built_at:
+                custom_nodes, custom_edges, custom_neighbors = compute_custom_nodes(state["player_pos"])
+                graph_built_at = pygame.Vector2(state["player_pos"])
+                graph_version += 1
+                graph_following = True
+        elif graph_following:
+            graph_following = False  # Settled: the layer picks up the new graph once
+        profiler.lap("graph")
+
+        if state["taunt_timer"] > 0:
+            state["taunt_timer"] -= dt
+
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                running = False
+            profiler.handle_event(event)
+        profiler.lap("events")
+
+        controls = session.poll()
+        if controls is None:  # Replay finished
+            break
+        keys = controls.keys
+
+        # ---------------- PLAYER MOVEMENT ----------------
+        if state["player_knockback_timer"] > 0:
+            state["player_knockback_timer"] -= dt
+            state["player_pos"] += state["player_knockback_vel"]*dt
+            state["player_knockback_vel"] *= 0.85
+        elif state["player_pause_timer"] > 0:
+            state["player_pause_timer"] -= dt
+        else:
+            move = pygame.Vector2(keys[pygame.K_d]-keys[pygame.K_a],
+                                  keys[pygame.K_s]-keys[pygame.K_w])
+            if move.length_squared() > 0:
+                move = move.normalize()
+                state["player_pos"] += move*PLAYER_SPEED*dt
+
+        # Clamp to screen
+        state["player_pos"].x = max(PLAYER_RADIUS, min(WIDTH-PLAYER_RADIUS, state["player_pos"].x))
+        state["player_pos"].y = max(PLAYER_RADIUS, min(HEIGHT-PLAYER_RADIUS, state["player_pos"].y))
+
+        # ---------------- SHOOTING ----------------
+        state["fire_timer"] -= dt
+        mouse_pressed = controls.mouse_buttons
+        if mouse_pressed[0] and state["fire_timer"] <= 0 and state["shake_timer"] <= 0:
+            mouse_pos = pygame.Vector2(controls.mouse_pos)
+            dir_vec = mouse_pos - state["player_pos"]
+            if dir_vec.length_squared() > 0:
+                vel = dir_vec.normalize()*BULLET_SPEED
+                state["bullets"].append(Bullet(state["player_pos"], vel))
+                state["fire_timer"] = FIRE_COOLDOWN
+        profiler.lap("player")
+
+        # ---------------- BULLETS ----------------
+        for b in state["bullets"][:]:
+            b.update(dt)
+            if b.pos.x<0 or b.pos.x>WIDTH or b.pos.y<0 or b.pos.y>HEIGHT:
+                state["bullets"].remove(b)
+        profiler.lap("bullets")
+
+        # ---------------- BOSS ----------------
+        update_boss_graph(state, dt)
+        boss_rect = pygame.Rect(state["boss_world"].x-BOSS_SIZE//2,
+                                state["boss_world"].y-BOSS_SIZE//2,
+                                BOSS_SIZE, BOSS_SIZE)
+
+        # Boss hit
+        for b in state["bullets"][:]:
+            if boss_rect.collidepoint(b.pos.x, b.pos.y):
+                state["bullets"].remove(b)
+                state["boss_life"] -= 1
+                if state["boss_life"] <= BOSS_MAX_LIFE*0.25 and not state["taunt_shown"]:
+                    state["taunt_shown"] = True
+                    state["taunt_timer"] = 4.0
+                state["boss_hit_timer"] = BOSS_HIT_SLOW_TIME
+                state["boss_speed_multiplier"] = BOSS_HIT_SPEED_MULT
+                state["boss_flash_count"] = BOSS_FLASHES*2
+                state["boss_flash_timer"] = BOSS_FLASH_INTERVAL
+                if state["boss_life"] <= 0:
+                    reset_room(state)
+
+        if state["boss_hit_timer"] > 0:
+            state["boss_hit_timer"] -= dt
+            if state["boss_hit_timer"] <= 0:
+                state["boss_speed_multiplier"] = 1.0
+
+        if state["boss_flash_count"] > 0:
+            state["boss_flash_timer"] -= dt
+            if state["boss_flash_timer"] <= 0:
+                state["boss_flash_timer"] = BOSS_FLASH_INTERVAL
+                state["boss_flash_count"] -= 1
+
+        # Player collision
+        if circle_rect_collision(state["player_pos"].x, state["player_pos"].y, PLAYER_RADIUS,
+                                 boss_rect.x, boss_rect.y, boss_rect.width, boss_rect.height):
+            direction = state["player_pos"] - state["boss_world"]
+            if direction.length_squared() > 0:
+                state["player_knockback_vel"] = direction.normalize()*PLAYER_KNOCKBACK_SPEED
+                state["player_knockback_timer"] = PLAYER_KNOCKBACK_TIME
+
+        # Camera shake
+        camera_offset = pygame.Vector2(0,0)
+        if state["shake_timer"] > 0:
+            state["shake_timer"] -= dt
+            intensity = (state["shake_timer"]/SHAKE_DURATION)*SHAKE_STRENGTH
+            camera_offset.x = random.uniform(-intensity,intensity)
+            camera_offset.y = random.uniform(-intensity,intensity)
+        profiler.lap("boss")
+        session.end_frame(state_values)
+
+        # ---------------- DRAW ----------------
+        # Backdrop and the settled graph come from the layer; whatever moves
+        # with the player is drawn straight onto the screen
+        background.draw(screen, camera_offset, key=None if graph_following else graph_version)
+        layer_offset = (int(camera_offset.x), int(camera_offset.y))  # Whole pixels, like the layer
+        if graph_following:
+            draw_graph(screen, layer_offset)
+        draw_graph(screen, layer_offset, player_part=True)
+        profiler.lap("background")
+
+        # Draw player
+        pygame.draw.circle(screen,(90,200,255),state["player_pos"]+camera_offset,PLAYER_RADIUS)
+
+        # Draw boss
+        boss_color = (255,255,120) if state["boss_flash_count"]%2==1 else (220,80,80)
+        pygame.draw.rect(screen,boss_color,boss_rect.move(camera_offset.x,camera_offset.y))
+
+        # Draw bullets
+        for b in state["bullets"]:
+            pygame.draw.circle(screen,(255,240,120),b.pos+camera_offset,BULLET_RADIUS)
+
+        # Taunt
+        if state["taunt_timer"] > 0:
+            text1 = text_cache.render("I used to be the captain of the basketball team.", big_font, (255,240,200))
+            text2 = text_cache.render("I will trash you, smalls.", big_font, (255,180,180))
+            box_w = max(text1.get_width(), text2.get_width())+40
+            box_h = text1.get_height()+text2.get_height()+30
+            box_x = WIDTH//2 - box_w//2
+            box_y = 40
+            pygame.draw.rect(screen,(0,0,0),(box_x,box_y,box_w,box_h))
+            pygame.draw.rect(screen,(200,60,60),(box_x,box_y,box_w,box_h),2)
+            screen.blit(text1,(WIDTH//2 - text1.get_width()//2, box_y+8))
+            screen.blit(text2,(WIDTH//2 - text2.get_width()//2, box_y+8+text1.get_height()))
+        profiler.lap("draw")
+
+        profiler.draw(screen)
+        pygame.display.flip()
+        profiler.lap("flip")
+        profiler.end_frame()
+
+    profiler.close()
+    session.close()
+    pygame.quit()
+    sys.exit()
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -9,6 +9,9 @@ import pygame
 import math
 import sys
 
+from fixed_step import FixedStepLoop, lerp_point, step_damping
+from profiler import FrameProfiler
+
 # =========================
 # CONFIG
 # =========================
@@ -21,6 +24,14 @@ SPRING_COLOR = (255, 180, 180)
 
 PLAYER_SPEED = 350
 
+PROFILE = False                      # Time every frame from the start (F3 also turns it on)
+PROFILE_CSV = "profile_poisson.csv"  # Per-frame timings written on exit
+
+# Sleep: once the boss has settled it stops simulating until the player moves
+SLEEP_SPEED = 2.0     # Settled = slower than this (pixels/second)...
+SLEEP_STRAIN = 0.01   # ...with the spring within 1% of its rest length...
+SLEEP_DELAY = 0.5     # ...for this many seconds in a row
+
 # =========================
 # BOSS INIT
 # =========================
@@ -36,12 +47,15 @@ def initialize_boss(player_pos):
 
     boss = {
         "nodes": [node0, node1],
+        "prev_nodes": [node0, node1],  # positions one physics step ago
         "velocity": [0.0, 0.0],  # velocity of node0 only
         "rest_length": rest_length,
         "base_stiffness": 8.0,
         "poisson_ratio": -.1,  # fake 1D coupling THIS CHANGES THE LENGTH TO GIRTH RATIO.  TRY .1-2.  DO NOT GO NEGATIVE!!!
         "damping": 0.94,
-        "mass": 1.0
+        "mass": 1.0,
+        "asleep": False,
+        "still_time": 0.0  # seconds spent settled
     }
 
     return boss
@@ -53,6 +67,13 @@ def initialize_boss(player_pos):
 
 def update_boss(boss, player_pos, dt):
 
+    # The player moving wakes the boss; otherwise a sleeping boss stays put
+    if player_pos != boss["nodes"][1]:
+        boss["asleep"] = False
+        boss["still_time"] = 0.0
+    elif boss["asleep"]:
+        return
+
     # Pin node1 to player
     boss["nodes"][1] = player_pos
 
@@ -86,8 +107,9 @@ def update_boss(boss, player_pos, dt):
     vx += ax * dt
     vy += ay * dt
 
-    vx *= boss["damping"]
-    vy *= boss["damping"]
+    damping = step_damping(boss["damping"], dt)
+    vx *= damping
+    vy *= damping
 
     x0 += vx * dt
     y0 += vy * dt
@@ -95,15 +117,29 @@ def update_boss(boss, player_pos, dt):
     boss["nodes"][0] = (x0, y0)
     boss["velocity"] = [vx, vy]
 
+    # Settled (slow and unstretched) for long enough? Go to sleep
+    if vx * vx + vy * vy < SLEEP_SPEED * SLEEP_SPEED and abs(strain) < SLEEP_STRAIN:
+        boss["still_time"] += dt
+        if boss["still_time"] >= SLEEP_DELAY:
+            boss["asleep"] = True
+            boss["velocity"] = [0.0, 0.0]
+    else:
+        boss["still_time"] = 0.0
+
+
+def save_boss_state(boss):
+    # Remember node positions before a physics step (for smooth drawing)
+    boss["prev_nodes"] = list(boss["nodes"])
+
 
 # =========================
 # DRAW
 # =========================
 
-def draw_boss(screen, boss):
+def draw_boss(screen, boss, alpha=1.0):
 
-    node0 = boss["nodes"][0]
-    node1 = boss["nodes"][1]
+    node0 = lerp_point(boss["prev_nodes"][0], boss["nodes"][0], alpha)
+    node1 = lerp_point(boss["prev_nodes"][1], boss["nodes"][1], alpha)
 
     # Thickness changes with strain (visual Poisson illusion)
     dx = node1[0] - node0[0]
@@ -135,41 +171,67 @@ def main():
     player_pos = [WIDTH // 2, HEIGHT // 2]
     boss = initialize_boss(player_pos)
 
+    physics_loop = FixedStepLoop()
+    prev_player = tuple(player_pos)
+    keys = pygame.key.get_pressed()
+
+    def physics_step(h):
+        if keys[pygame.K_w]:
+            player_pos[1] -= PLAYER_SPEED * h
+        if keys[pygame.K_s]:
+            player_pos[1] += PLAYER_SPEED * h
+        if keys[pygame.K_a]:
+            player_pos[0] -= PLAYER_SPEED * h
+        if keys[pygame.K_d]:
+            player_pos[0] += PLAYER_SPEED * h
+
+        update_boss(boss, tuple(player_pos), h)
+
+    def save_previous():
+        nonlocal prev_player
+        prev_player = tuple(player_pos)
+        save_boss_state(boss)
+
+    profiler = FrameProfiler(enabled=PROFILE, csv_path=PROFILE_CSV)
+
     running = True
     while running:
 
-        dt = clock.tick(60) / 1000.0
+        frame_dt = clock.tick(60) / 1000.0
+        profiler.begin_frame()
 
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 running = False
+            profiler.handle_event(event)
 
         keys = pygame.key.get_pressed()
 
-        if keys[pygame.K_w]:
-            player_pos[1] -= PLAYER_SPEED * dt
-        if keys[pygame.K_s]:
-            player_pos[1] += PLAYER_SPEED * dt
-        if keys[pygame.K_a]:
-            player_pos[0] -= PLAYER_SPEED * dt
-        if keys[pygame.K_d]:
-            player_pos[0] += PLAYER_SPEED * dt
+        profiler.lap("events")
 
-        update_boss(boss, tuple(player_pos), dt)
+        alpha = physics_loop.advance(frame_dt, physics_step, snapshot=save_previous)
+        profiler.lap("physics")
 
         screen.fill(BACKGROUND)
 
+        player_x, player_y = lerp_point(prev_player, player_pos, alpha)
         pygame.draw.circle(
             screen,
             PLAYER_COLOR,
-            (int(player_pos[0]), int(player_pos[1])),
+            (int(player_x), int(player_y)),
             15
         )
+        profiler.lap("player.draw")
 
-        draw_boss(screen, boss)
+        draw_boss(screen, boss, alpha)
+        profiler.lap("boss.draw")
 
+        profiler.draw(screen)
         pygame.display.flip()
+        profiler.lap("flip")
+        profiler.end_frame()
 
+    profiler.close()
     pygame.quit()
     sys.exit()
 
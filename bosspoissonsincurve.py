@@ -11,6 +11,9 @@ import sys
 import time
 import random
 
+from fixed_step import FixedStepLoop, lerp_point, step_damping
+from profiler import FrameProfiler
+
 # =========================
 # CONFIG
 # =========================
@@ -23,6 +26,9 @@ SPRING_COLOR = (255, 180, 180)
 
 PLAYER_SPEED = 350
 
+PROFILE = False                      # Time every frame from the start (F3 also turns it on)
+PROFILE_CSV = "profile_sincurve.csv" # Per-frame timings written on exit
+
 # =========================
 # BOSS INIT
 # =========================
@@ -38,6 +44,7 @@ def initialize_boss(player_pos):
 
     return {
         "nodes": [node0, node1],
+        "prev_nodes": [node0, node1],  # positions one physics step ago
         "velocity": [0.0, 0.0],
         "rest_length": rest_length,
         "stiffness": 8.0,
@@ -89,8 +96,9 @@ def update_boss(boss, player_pos, dt):
     vx += ax * dt
     vy += ay * dt
 
-    vx *= boss["damping"]
-    vy *= boss["damping"]
+    damping = step_damping(boss["damping"], dt)
+    vx *= damping
+    vy *= damping
 
     x0 += vx * dt
     y0 += vy * dt
@@ -113,14 +121,19 @@ def update_boss(boss, player_pos, dt):
         shock["t"] = 0.0
 
 
+def save_boss_state(boss):
+    # Remember node positions before a physics step (for smooth drawing)
+    boss["prev_nodes"] = list(boss["nodes"])
+
+
 # =========================
 # DRAW SINE EDGE WITH SHOCK
 # =========================
 
-def draw_sine_edge(screen, boss, time_elapsed):
+def draw_sine_edge(screen, boss, time_elapsed, alpha=1.0):
 
-    node0 = boss["nodes"][0]
-    node1 = boss["nodes"][1]
+    node0 = lerp_point(boss["prev_nodes"][0], boss["nodes"][0], alpha)
+    node1 = lerp_point(boss["prev_nodes"][1], boss["nodes"][1], alpha)
 
     x0, y0 = node0
     x1, y1 = node1
@@ -177,11 +190,12 @@ def draw_sine_edge(screen, boss, time_elapsed):
     pygame.draw.lines(screen, boss["color"], False, points, 3)
 
 
-def draw_boss(screen, boss, time_elapsed):
+def draw_boss(screen, boss, time_elapsed, alpha=1.0):
 
-    draw_sine_edge(screen, boss, time_elapsed)
+    draw_sine_edge(screen, boss, time_elapsed, alpha)
 
-    for node in boss["nodes"]:
+    for prev, node in zip(boss["prev_nodes"], boss["nodes"]):
+        node = lerp_point(prev, node, alpha)
         pygame.draw.circle(
             screen,
             BOSS_COLOR,
@@ -205,29 +219,45 @@ def main():
     player_pos = [WIDTH // 2, HEIGHT // 2]
     boss = initialize_boss(player_pos)
 
+    physics_loop = FixedStepLoop()
+    prev_player = tuple(player_pos)
+    keys = pygame.key.get_pressed()
+
+    def physics_step(h):
+        if keys[pygame.K_w]:
+            player_pos[1] -= PLAYER_SPEED * h
+        if keys[pygame.K_s]:
+            player_pos[1] += PLAYER_SPEED * h
+        if keys[pygame.K_a]:
+            player_pos[0] -= PLAYER_SPEED * h
+        if keys[pygame.K_d]:
+            player_pos[0] += PLAYER_SPEED * h
+
+        update_boss(boss, tuple(player_pos), h)
+
+    def save_previous():
+        nonlocal prev_player
+        prev_player = tuple(player_pos)
+        save_boss_state(boss)
+
+    profiler = FrameProfiler(enabled=PROFILE, csv_path=PROFILE_CSV)
+
     start_time = time.time()
 
     running = True
     while running:
 
-        dt = clock.tick(60) / 1000.0
+        frame_dt = clock.tick(60) / 1000.0
+        profiler.begin_frame()
         time_elapsed = time.time() - start_time
 
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 running = False
+            profiler.handle_event(event)
 
         keys = pygame.key.get_pressed()
 
-        if keys[pygame.K_w]:
-            player_pos[1] -= PLAYER_SPEED * dt
-        if keys[pygame.K_s]:
-            player_pos[1] += PLAYER_SPEED * dt
-        if keys[pygame.K_a]:
-            player_pos[0] -= PLAYER_SPEED * dt
-        if keys[pygame.K_d]:
-            player_pos[0] += PLAYER_SPEED * dt
-
         # Manual shock trigger
         if keys[pygame.K_SPACE] and not boss["shock"]["active"]:
             boss["shock"]["active"] = True
@@ -240,21 +270,31 @@ def main():
                 random.randint(50, 255)
             )
 
-        update_boss(boss, tuple(player_pos), dt)
+        profiler.lap("events")
+
+        alpha = physics_loop.advance(frame_dt, physics_step, snapshot=save_previous)
+        profiler.lap("physics")
 
         screen.fill(BACKGROUND)
 
+        player_x, player_y = lerp_point(prev_player, player_pos, alpha)
         pygame.draw.circle(
             screen,
             PLAYER_COLOR,
-            (int(player_pos[0]), int(player_pos[1])),
+            (int(player_x), int(player_y)),
             15
         )
+        profiler.lap("player.draw")
 
-        draw_boss(screen, boss, time_elapsed)
+        draw_boss(screen, boss, time_elapsed, alpha)
+        profiler.lap("boss.draw")
 
+        profiler.draw(screen)
         pygame.display.flip()
+        profiler.lap("flip")
+        profiler.end_frame()
 
+    profiler.close()
     pygame.quit()
     sys.exit()
 
@@ -0,0 +1,119 @@
+# -*- coding: utf-8 -*-
+"""
+Fixed-Timestep Loop Driver
+Shared by the boss scripts so physics runs at a steady rate.
+
+Feeding clock.tick() straight into the physics means one slow frame hands the
+springs a huge dt and they explode. Instead, frame time is poured into an
+"accumulator" and the physics is stepped in equal slices of 1/hz seconds:
+
+    frame time:  |---16ms---|-------40ms (hitch!)-------|---16ms---|
+    physics:     |-|-|-|-|  |-|-|-|-|-|-|-|-|-|-|       |-|-|-|-|
+                 (every slice is exactly 1/240 s)
+
+Whatever is left over (less than one slice) is used to blend between the last
+two physics states when drawing, so motion stays smooth at any frame rate.
+
+USAGE EXAMPLE:
+    loop = FixedStepLoop(hz=240)
+    while running:
+        frame_dt = clock.tick(60) / 1000.0
+        alpha = loop.advance(frame_dt, physics_step, snapshot=save_previous)
+        draw(alpha)   # draw lerp(previous, current, alpha)
+"""
+
+# ==================================================
+# CONFIG
+# ==================================================
+PHYSICS_HZ = 240          # Default physics rate (steps per second)
+MAX_STEPS_PER_FRAME = 16  # Spiral-of-death cap (see FixedStepLoop.advance)
+REFERENCE_DT = 1.0 / 60   # The frame length all the damping values were tuned at
+
+
+# ==================================================
+# LOOP DRIVER
+# ==================================================
+class FixedStepLoop:
+    """
+    Turns variable frame times into a whole number of fixed physics steps.
+
+    PARAMETERS:
+    - hz: Physics steps per second
+    - substeps: How many times step() runs per fixed step (each with dt/substeps)
+    - max_steps: Most fixed steps allowed in one frame before time is dropped
+    """
+
+    def __init__(self, hz=PHYSICS_HZ, substeps=1, max_steps=MAX_STEPS_PER_FRAME):
+        self.dt = 1.0 / hz
+        self.substeps = substeps
+        self.max_steps = max_steps
+
+        self.accumulator = 0.0  # Frame time not yet simulated
+        self.alpha = 1.0        # Blend factor for drawing (0 = previous, 1 = current)
+        self.steps = 0          # Total fixed steps taken so far
+
+    def advance(self, frame_dt, step, snapshot=None):
+        """
+        Run as many fixed steps as the elapsed frame time pays for.
+
+        PARAMETERS:
+        - frame_dt: Real time since the last frame (seconds)
+        - step: Function called as step(h) to advance the physics by h seconds
+        - snapshot: Optional function called before each fixed step so the
+                    caller can remember the "previous" state for interpolation
+
+        RETURNS:
+        - alpha: How far (0-1) we are between the previous and current state
+        """
+        self.accumulator += frame_dt
+        h = self.dt / self.substeps
+
+        taken = 0
+        while self.accumulator >= self.dt:
+            if taken >= self.max_steps:
+                # SPIRAL OF DEATH: if the physics can't keep up, every frame
+                # gets slower and owes even more steps. Drop the backlog and
+                # let the game run in slow motion instead of freezing.
+                self.accumulator %= self.dt
+                break
+
+            if snapshot is not None:
+                snapshot()
+            for _ in range(self.substeps):
+                step(h)
+
+            self.accumulator -= self.dt
+            self.steps += 1
+            taken += 1
+
+        self.alpha = self.accumulator / self.dt
+        return self.alpha
+
+
+# ==================================================
+# HELPERS
+# ==================================================
+def lerp(previous, current, alpha):
+    """Blend two positions (or NumPy arrays of positions) for drawing."""
+    if alpha >= 1.0:
+        return current
+    return previous + (current - previous) * alpha
+
+
+def lerp_point(previous, current, alpha):
+    """Same as lerp() but for plain (x, y) tuples/lists."""
+    return (
+        previous[0] + (current[0] - previous[0]) * alpha,
+        previous[1] + (current[1] - previous[1]) * alpha,
+    )
+
+
+def step_damping(damping, dt):
+    """
+    Convert a per-frame damping factor into the factor for a step of dt seconds.
+
+    The scripts multiply velocity by e.g. 0.8 once per update, tuned at 60 FPS.
+    Stepping at 240 Hz would apply it 4x as often and over-damp everything, so
+    the factor is raised to the power dt / REFERENCE_DT (0.8 per 1/60 s always).
+    """
+    return damping ** (dt / REFERENCE_DT)
@@ -0,0 +1,188 @@
+# -*- coding: utf-8 -*-
+"""
+Arc-Length Paths
+Shared by the boss scripts for moving things along a path at constant speed.
+
+Hopping from sample point to sample point (like CurveFollower does) means the
+speed depends on how the points are spaced, a frame is lost "arriving" at each
+point, and a new follower has to be built for every waypoint segment.
+
+Instead, ArcLengthPath measures the path ONCE. For every sample point it
+stores how far along the path that point is (its "arc length"):
+
+    points:       P0 ------- P1 --- P2 ----------- P3
+    arc length:   0          100    150            300
+
+To find where you are after travelling s = 200 pixels, binary search that
+table for the segment containing 200 (P2 -> P3) and blend between its ends.
+Moving is then just "distance += speed * dt" - any dt, one lookup.
+
+USAGE EXAMPLE:
+    path = ArcLengthPath.from_segments(all_paths, closed=True)
+    follower = PathFollower(path, speed=400)
+    while running:
+        follower.update(dt)
+        x, y = follower.pos
+"""
+
+import bisect
+import math
+
+import numpy as np
+
+
+# ==================================================
+# PATH
+# ==================================================
+class ArcLengthPath:
+    """
+    A polyline that can be sampled by distance travelled along it.
+
+    PARAMETERS:
+    - points: Sequence of (x, y) points (at least 2)
+    - closed: If True the path loops (the last point joins back to the first)
+              and distances wrap around; if False they are clamped to the ends
+    """
+
+    def __init__(self, points, closed=False):
+        points = np.asarray(points, dtype=float).reshape(-1, 2)
+        if len(points) < 2:
+            raise ValueError("ArcLengthPath needs at least 2 points")
+        if closed and not np.array_equal(points[0], points[-1]):
+            points = np.vstack((points, points[:1]))  # Join the loop
+
+        self.points = points
+        self.closed = closed
+
+        # Length of each segment, and the arc length where each point sits
+        delta = np.diff(points, axis=0)
+        self.segment_lengths = np.hypot(delta[:, 0], delta[:, 1])
+        self.cumulative = np.concatenate(([0.0], np.cumsum(self.segment_lengths)))
+        self.length = float(self.cumulative[-1])
+
+        # Plain-Python copies for the single-point lookups (bisect and list
+        # indexing are much faster than NumPy for one value at a time)
+        self._cumulative = self.cumulative.tolist()
+        self._points = points.tolist()
+        self._segment_lengths = self.segment_lengths.tolist()
+
+        # Where each waypoint segment starts (see from_segments)
+        self.segment_starts = [0.0]
+
+    @classmethod
+    def from_segments(cls, segments, closed=False):
+        """
+        Join several point lists (e.g. one per waypoint pair) into one path.
+
+        Each segment's first point is dropped if it repeats the previous
+        segment's last point. segment_at() tells which segment a distance
+        falls in.
+        """
+        points = []
+        starts = []
+        for segment in segments:
+            segment = [tuple(p) for p in segment]
+            if points and segment and segment[0] == points[-1]:
+                segment = segment[1:]
+            starts.append(max(len(points) - 1, 0))  # Index of the segment's first point
+            points.extend(segment)
+
+        path = cls(points, closed=closed)
+        path.segment_starts = [path._cumulative[i] for i in starts]
+        return path
+
+    # --------------------------------------------------
+    # LOOKUPS
+    # --------------------------------------------------
+    def wrap(self, s):
+        """Bring a distance into [0, length]: wrap for loops, clamp otherwise."""
+        if self.closed:
+            return s % self.length if self.length > 0 else 0.0
+        return min(max(s, 0.0), self.length)
+
+    def _locate(self, s):
+        """Index of the segment containing distance s, and how far into it (0-1)."""
+        i = bisect.bisect_right(self._cumulative, s) - 1
+        i = min(max(i, 0), len(self._segment_lengths) - 1)
+        seg_len = self._segment_lengths[i]
+        t = (s - self._cumulative[i]) / seg_len if seg_len > 0 else 0.0
+        return i, t
+
+    def position(self, s):
+        """(x, y) after travelling distance s along the path."""
+        return self._point_at(self.wrap(s))
+
+    def _point_at(self, s):
+        """position() for a distance that is already inside [0, length]."""
+        i, t = self._locate(s)
+        x0, y0 = self._points[i]
+        x1, y1 = self._points[i + 1]
+        return (x0 + (x1 - x0) * t, y0 + (y1 - y0) * t)
+
+    def direction(self, s):
+        """Unit (dx, dy) the path is heading in at distance s."""
+        i, _ = self._locate(self.wrap(s))
+        x0, y0 = self._points[i]
+        x1, y1 = self._points[i + 1]
+        length = math.hypot(x1 - x0, y1 - y0)
+        if length == 0:
+            return (1.0, 0.0)
+        return ((x1 - x0) / length, (y1 - y0) / length)
+
+    def positions(self, s):
+        """Vectorized position(): an array of distances -> (n, 2) array of points."""
+        s = np.asarray(s, dtype=float)
+        if self.closed:
+            s = np.mod(s, self.length) if self.length > 0 else np.zeros_like(s)
+        else:
+            s = np.clip(s, 0.0, self.length)
+
+        i = np.searchsorted(self.cumulative, s, side="right") - 1
+        i = np.clip(i, 0, len(self.segment_lengths) - 1)
+        seg_len = self.segment_lengths[i]
+        t = np.divide(s - self.cumulative[i], seg_len, out=np.zeros_like(s), where=seg_len > 0)
+        p0 = self.points[i]
+        return p0 + (self.points[i + 1] - p0) * t[..., None]
+
+    def segment_at(self, s):
+        """Which waypoint segment (see from_segments) distance s falls in."""
+        return bisect.bisect_right(self.segment_starts, self.wrap(s)) - 1
+
+
+# ==================================================
+# FOLLOWER
+# ==================================================
+class PathFollower:
+    """
+    Moves along an ArcLengthPath at a constant speed.
+
+    PARAMETERS:
+    - path: The ArcLengthPath to follow
+    - speed: Pixels per second
+    - distance: Where along the path to start (pixels)
+    """
+
+    def __init__(self, path, speed=400, distance=0.0):
+        self.path = path
+        self.speed = speed
+        self.distance = path.wrap(distance)  # How far along the path we are
+        self.laps = 0                         # Times around a closed path
+        self.pos = list(path.position(self.distance))
+
+    def update(self, dt):
+        """Move forward by speed * dt (any size of dt works in one step)."""
+        s = self.distance + self.speed * dt
+        if self.path.closed and self.path.length > 0:
+            self.laps += int(s // self.path.length)
+        self.distance = self.path.wrap(s)
+        self.pos[0], self.pos[1] = self.path._point_at(self.distance)
+
+    @property
+    def finished(self):
+        """True once an open path has been followed to its end."""
+        return not self.path.closed and self.distance >= self.path.length
+
+    @property
+    def segment(self):
+        """Index of the waypoint segment we're currently on."""
+        return self.path.segment_at(self.distance)
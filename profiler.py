@@ -0,0 +1,279 @@
+# -*- coding: utf-8 -*-
+"""
+Frame Profiler
+Shared by the boss scripts to show where each frame's time goes.
+
+Wrap each part of the game loop in a named "phase". The profiler times every
+phase with time.perf_counter(), keeps the last few seconds of timings, and
+can draw a little table over the game (press F3):
+
+    phase          p50     p95     p99  ms
+    frame        16.67   16.90   18.20
+    work          2.71    3.40    8.05
+    events        0.02    0.04    0.09
+    chain.update  0.61    0.80    1.35
+    chain.draw    0.14    0.19    0.30
+    flip          1.90    2.40    6.10
+
+p50 is the typical frame, p95/p99 are the slow ones (5% / 1% of frames are
+slower than that) - spikes show up there even when the average looks fine.
+When the game closes every frame's timings are written to a CSV file.
+
+When the profiler is off, phase() hands back a shared "do nothing" object,
+so leaving the `with` blocks in the game costs almost nothing.
+
+USAGE EXAMPLE:
+    profiler = FrameProfiler(enabled=False, csv_path="profile.csv")
+    while running:
+        profiler.begin_frame()
+        with profiler.phase("events"):
+            for event in pygame.event.get():
+                profiler.handle_event(event)   # F3 toggles the overlay
+        with profiler.phase("draw"):
+            draw_everything(screen)
+        profiler.draw(screen)
+        with profiler.phase("flip"):
+            pygame.display.flip()
+        profiler.end_frame()
+    profiler.close()
+
+    # Or, for a loop that just runs top to bottom:
+    #     ...handle events...;  profiler.lap("events")
+    #     ...update...;         profiler.lap("update")
+"""
+
+import csv
+from time import perf_counter
+
+import numpy as np
+import pygame
+
+import text_cache
+
+# ==================================================
+# CONFIG
+# ==================================================
+TOGGLE_KEY = pygame.K_F3   # Shows/hides the overlay (and turns timing on)
+HISTORY = 600              # Frames kept for the percentiles (10 s at 60 FPS)
+OVERLAY_REFRESH = 30       # Frames between overlay updates (so it's readable)
+OVERLAY_POS = (8, 8)
+OVERLAY_FONT_SIZE = 18
+OVERLAY_COLOR = (230, 230, 230)
+OVERLAY_BACKGROUND = (0, 0, 0, 170)
+
+# Extra rows the profiler adds on its own
+FRAME = "frame"   # Time from one begin_frame() to the next (incl. waiting)
+WORK = "work"     # Time from begin_frame() to end_frame()
+
+
+# ==================================================
+# PHASE TIMERS
+# ==================================================
+class _NullPhase:
+    """Stand-in used while profiling is off: entering/leaving does nothing."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_PHASE = _NullPhase()
+
+
+class _Phase:
+    """Times one named phase and adds it to the frame's total for that name."""
+
+    __slots__ = ("totals", "name", "start")
+
+    def __init__(self, totals, name):
+        self.totals = totals
+        self.name = name
+        self.start = 0.0
+
+    def __enter__(self):
+        self.start = perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        # += so a phase that runs several times a frame (e.g. physics
+        # substeps) shows its total for the frame
+        self.totals[self.name] += perf_counter() - self.start
+        return False
+
+
+# ==================================================
+# PROFILER
+# ==================================================
+class FrameProfiler:
+    """
+    Per-phase frame timings with percentiles, an overlay and a CSV dump.
+
+    PARAMETERS:
+    - enabled: Start timing straight away (F3 turns it on later otherwise)
+    - csv_path: Where close() writes every recorded frame (None = don't)
+    - history: How many recent frames the percentiles are taken over
+    """
+
+    def __init__(self, enabled=False, csv_path=None, history=HISTORY):
+        self.enabled = enabled
+        self.visible = False
+        self.csv_path = csv_path
+        self.history = history
+
+        self.frames = 0                # Frames recorded so far
+        self._totals = {FRAME: 0.0, WORK: 0.0}  # name -> seconds spent this frame
+        self._phases = {}              # name -> reusable _Phase timer
+        self._samples = {}             # name -> ring buffer of ms per frame
+        self._rows = []                # Every recorded frame, for the CSV
+        self._frame_start = None
+        self._last_frame_start = None
+        self._lap_start = 0.0
+
+        # Overlay: the table is only re-rendered every OVERLAY_REFRESH frames
+        self._font = None
+        self._digits = None  # GlyphAtlas for the numbers (see text_cache.py)
+        self._overlay = None
+
+    # --------------------------------------------------
+    # RECORDING
+    # --------------------------------------------------
+    def phase(self, name):
+        """Context manager timing one part of the frame: `with profiler.phase("draw"):`"""
+        if not self.enabled:
+            return _NULL_PHASE
+        timer = self._phases.get(name)
+        if timer is None:
+            timer = self._phases[name] = _Phase(self._totals, name)
+            self._totals.setdefault(name, 0.0)
+        return timer
+
+    def lap(self, name):
+        """
+        Charge the time since the last lap() (or begin_frame()) to name.
+
+        Handy for a long game loop that runs top to bottom: call lap("events")
+        after the events, lap("update") after the update, and so on, without
+        re-indenting anything into `with` blocks.
+        """
+        if not self.enabled:
+            return
+        now = perf_counter()
+        self._totals[name] = self._totals.get(name, 0.0) + now - self._lap_start
+        self._lap_start = now
+
+    def begin_frame(self):
+        if not self.enabled:
+            return
+        now = perf_counter()
+        if self._last_frame_start is not None:
+            self._totals[FRAME] = now - self._last_frame_start
+        self._last_frame_start = now
+        self._frame_start = now
+        self._lap_start = now
+
+    def end_frame(self):
+        if not self.enabled or self._frame_start is None:
+            return
+        self._totals[WORK] = perf_counter() - self._frame_start
+
+        slot = self.frames % self.history
+        row = {}
+        for name, seconds in self._totals.items():
+            buffer = self._samples.get(name)
+            if buffer is None:
+                # Phases first seen late count as 0 ms for earlier frames
+                buffer = self._samples[name] = np.zeros(self.history)
+            buffer[slot] = row[name] = seconds * 1000.0
+            self._totals[name] = 0.0
+        if self.csv_path:
+            self._rows.append(row)
+
+        self.frames += 1
+        if self.visible and self.frames % OVERLAY_REFRESH == 0:
+            self._overlay = None  # Re-render with fresh numbers
+
+    # --------------------------------------------------
+    # RESULTS
+    # --------------------------------------------------
+    def stats(self):
+        """{phase name: (p50, p95, p99)} in milliseconds over recent frames."""
+        count = min(self.frames, self.history)
+        if count == 0:
+            return {}
+        return {
+            name: tuple(np.percentile(buffer[:count], (50, 95, 99)))
+            for name, buffer in self._samples.items()
+        }
+
+    def write_csv(self, path=None):
+        """Write one row per recorded frame (milliseconds per phase)."""
+        path = path or self.csv_path
+        if not path or not self._rows:
+            return
+        names = list(self._samples)
+        with open(path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["frame"] + [f"{name}_ms" for name in names])
+            for i, row in enumerate(self._rows):
+                writer.writerow([i] + [f"{row.get(name, 0.0):.4f}" for name in names])
+
+    def close(self):
+        """Call when the game exits: dumps the CSV (if a path was given)."""
+        self.write_csv()
+
+    # --------------------------------------------------
+    # OVERLAY
+    # --------------------------------------------------
+    def handle_event(self, event):
+        """Toggle the overlay on TOGGLE_KEY. Returns True if the event was used."""
+        if event.type == pygame.KEYDOWN and event.key == TOGGLE_KEY:
+            self.visible = not self.visible
+            if self.visible and not self.enabled:
+                # Switched on mid-frame: start the clocks now
+                self.enabled = True
+                self._frame_start = self._lap_start = self._last_frame_start = perf_counter()
+            self._overlay = None
+            return True
+        return False
+
+    def draw(self, screen):
+        """Draw the timing table if the overlay is visible."""
+        if not self.visible:
+            return
+        if self._overlay is None:
+            self._overlay = self._render_overlay()
+        screen.blit(self._overlay, OVERLAY_POS)
+
+    def _render_overlay(self):
+        if self._font is None:
+            self._font = text_cache.get_font(None, OVERLAY_FONT_SIZE)
+            self._digits = text_cache.GlyphAtlas(self._font, OVERLAY_COLOR)
+        font, digits = self._font, self._digits
+
+        # One row per phase: name on the left, numbers right-aligned in columns
+        rows = [("phase", "p50", "p95", "p99 ms")]
+        for name, values in self.stats().items():
+            rows.append((name,) + tuple(f"{v:.2f}" for v in values))
+        if len(rows) == 1:
+            rows.append(("collecting...", "", "", ""))
+
+        # Names barely change, so they come from the text cache; the numbers
+        # change every refresh, so they're copied digit by digit from the atlas
+        names = [text_cache.render(row[0], font, OVERLAY_COLOR) for row in rows]
+        number_widths = [[digits.size(text)[0] for text in row[1:]] for row in rows]
+        widths = [max(name.get_width() for name in names) + 10]
+        widths += [max(row[c] for row in number_widths) + 10 for c in range(3)]
+        line_height = font.get_linesize()
+
+        surface = pygame.Surface((sum(widths) + 6, line_height * len(rows) + 8), pygame.SRCALPHA)
+        surface.fill(OVERLAY_BACKGROUND)
+        for r, row in enumerate(rows):
+            y = 4 + r * line_height
+            surface.blit(names[r], (6, y))
+            x = 6 + widths[0]
+            for c in range(1, 4):
+                x += widths[c]
+                digits.draw(surface, row[c], (x - 10 - number_widths[r][c - 1], y))
+        return surface
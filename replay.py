@@ -0,0 +1,327 @@
+# -*- coding: utf-8 -*-
+"""
+Record & Replay
+Shared by the boss scripts for repeatable runs (benchmarks, regression checks).
+
+Two runs of a boss fight are never the same: the player presses different
+keys, frame times wobble, and random.* gives new numbers every time. That
+makes "is it faster now?" hard to answer. This module removes all three:
+
+    record:   play normally; each frame's keys + mouse are written down,
+              the game steps at a fixed 1/FPS and random is seeded
+    replay:   no window, no waiting - the same inputs, the same seed and the
+              same fixed step, as fast as the computer can go
+
+File layout (little-endian, 7 bytes per frame - about 25 KB per minute):
+
+    header:  b"BRPL" | version u16 | fps u16 | seed u64 | frames u32 | game 16s
+    frames:  held keys u16 (bit i = tracked_keys[i]) | mouse buttons u8 |
+             mouse x i16 | mouse y i16
+
+While replaying, a CHECKSUM of the game state can be written every few frames.
+Replay the same file with the reference code and the optimized code, then
+
+    python replay.py compare reference.txt optimized.txt
+
+prints the first frame where the two stopped agreeing.
+
+USAGE EXAMPLE:
+    python boss-pattern-3.py --record fight.rpl
+    python boss-pattern-3.py --replay fight.rpl --checksums out.txt
+
+    def main(argv=None):
+        session = ReplaySession.from_args(argv, "pattern3", TRACKED_KEYS, FPS)
+        pygame.init()
+        while running:
+            dt = session.tick(clock)
+            controls = session.poll()
+            if controls is None:        # replay finished
+                break
+            keys = controls.keys
+            ...
+            session.end_frame(lambda: (player_pos, boss_pos, hp))
+        session.close()
+"""
+
+import argparse
+import os
+import random
+import struct
+import sys
+import zlib
+from time import perf_counter
+
+import numpy as np
+import pygame
+
+# ==================================================
+# CONFIG
+# ==================================================
+MAGIC = b"BRPL"
+VERSION = 1
+CHECKSUM_EVERY = 60         # Frames between state checksums (1 s at 60 FPS)
+CHECKSUM_PRECISION = 1e-3   # Values are rounded to this before hashing
+
+HEADER = struct.Struct("<4sHHQI16s")
+FRAME_DTYPE = np.dtype([("keys", "<u2"), ("buttons", "u1"), ("x", "<i2"), ("y", "<i2")])
+
+
+# ==================================================
+# INPUT
+# ==================================================
+class KeyState:
+    """
+    Replayed stand-in for pygame.key.get_pressed(): keys[pygame.K_w] -> bool.
+
+    Keys that weren't tracked while recording always read as not pressed.
+    """
+
+    __slots__ = ("mask", "bits")
+
+    def __init__(self, mask, bits):
+        self.mask = mask
+        self.bits = bits  # pygame key -> bit number
+
+    def __getitem__(self, key):
+        bit = self.bits.get(key)
+        return bit is not None and bool(self.mask >> bit & 1)
+
+
+class Controls:
+    """One frame of input: held keys, mouse buttons and the mouse position."""
+
+    __slots__ = ("keys", "mouse_buttons", "mouse_pos")
+
+    def __init__(self, keys, mouse_buttons, mouse_pos):
+        self.keys = keys
+        self.mouse_buttons = mouse_buttons  # (left, middle, right)
+        self.mouse_pos = mouse_pos          # (x, y)
+
+
+# ==================================================
+# CHECKSUMS
+# ==================================================
+def _flatten(value, out):
+    if isinstance(value, (int, float, bool, np.number)):
+        out.append(float(value))
+    elif isinstance(value, np.ndarray):
+        out.extend(value.ravel().tolist())
+    else:
+        # Vector2, tuples, lists, ... (anything iterable)
+        for item in value:
+            _flatten(item, out)
+
+
+def state_checksum(values, precision=CHECKSUM_PRECISION):
+    """
+    CRC32 of a bundle of numbers (floats, ints, Vector2s, arrays, lists of them).
+
+    Values are rounded to `precision` first, so an optimized code path that
+    gets the last few bits of a float differently still matches.
+    """
+    flat = []
+    _flatten(values, flat)
+    quantized = np.round(np.asarray(flat, dtype=float) / precision).astype(np.int64)
+    return zlib.crc32(quantized.tobytes())
+
+
+def read_checksums(path):
+    """{frame: checksum} from a file written by ReplaySession."""
+    checksums = {}
+    with open(path) as f:
+        for line in f:
+            frame, value = line.split()
+            checksums[int(frame)] = int(value, 16)
+    return checksums
+
+
+def compare_checksums(path_a, path_b):
+    """
+    First frame where two checksum files disagree.
+
+    RETURNS:
+    - The frame number, or None if every frame both files have matches
+    """
+    a, b = read_checksums(path_a), read_checksums(path_b)
+    for frame in sorted(set(a) & set(b)):
+        if a[frame] != b[frame]:
+            return frame
+    return None
+
+
+# ==================================================
+# SESSION
+# ==================================================
+class ReplaySession:
+    """
+    Where a game's input, random seed and frame time come from.
+
+    - Normal play: live input, real frame times (nothing changes)
+    - Recording:   live input written to record_path, fixed 1/FPS step
+    - Replaying:   input read from replay_path, fixed step, no window/waiting
+
+    PARAMETERS:
+    - game: Short name stored in the file (a recording only replays in its game)
+    - tracked_keys: The pygame keys the game reads (at most 16)
+    - fps: The game's frame rate (the fixed step is 1 / fps)
+    - record_path / replay_path: Recording file to write / read
+    - checksum_path: Where state checksums are written (None = don't)
+    - checksum_every: Frames between checksums
+    """
+
+    def __init__(self, game, tracked_keys, fps, record_path=None, replay_path=None,
+                 checksum_path=None, checksum_every=CHECKSUM_EVERY):
+        if len(tracked_keys) > 16:
+            raise ValueError("At most 16 keys can be tracked")
+        if record_path and replay_path:
+            raise ValueError("Can't record and replay at the same time")
+
+        self.game = game
+        self.tracked_keys = tuple(tracked_keys)
+        self.bits = {key: i for i, key in enumerate(self.tracked_keys)}
+        self.fps = fps
+        self.record_path = record_path
+        self.replay_path = replay_path
+        self.checksum_path = checksum_path
+        self.checksum_every = checksum_every
+
+        self.frame = 0          # Frames polled so far
+        self._rows = []         # Recorded frames
+        self._checksums = []    # (frame, crc) pairs
+        self._start = perf_counter()
+
+        if replay_path:
+            self.seed, self._frames = self._load(replay_path)
+            # Headless: must be set before pygame.init()
+            os.environ["SDL_VIDEODRIVER"] = "dummy"
+            os.environ["SDL_AUDIODRIVER"] = "dummy"
+        else:
+            self.seed = random.randrange(2 ** 63)
+            self._frames = None
+        random.seed(self.seed)
+
+    @classmethod
+    def from_args(cls, argv, game, tracked_keys, fps):
+        """Build a session from command line options (--record, --replay, ...)."""
+        parser = argparse.ArgumentParser()
+        parser.add_argument("--record", metavar="FILE", help="record this fight's input")
+        parser.add_argument("--replay", metavar="FILE", help="replay a recording headless")
+        parser.add_argument("--checksums", metavar="FILE", help="write state checksums every N frames")
+        parser.add_argument("--checksum-every", type=int, default=CHECKSUM_EVERY, metavar="N")
+        args = parser.parse_args([] if argv is None else argv)
+        return cls(game, tracked_keys, fps, args.record, args.replay,
+                   args.checksums, args.checksum_every)
+
+    @property
+    def replaying(self):
+        return self._frames is not None
+
+    @property
+    def fixed_step(self):
+        """True when every frame advances exactly 1/FPS seconds."""
+        return self.replaying or bool(self.record_path)
+
+    # --------------------------------------------------
+    # PER FRAME
+    # --------------------------------------------------
+    def tick(self, clock):
+        """The frame's dt in seconds (waits for the frame rate unless replaying)."""
+        if self.replaying:
+            return 1.0 / self.fps
+        dt = clock.tick(self.fps) / 1000.0
+        return 1.0 / self.fps if self.record_path else dt
+
+    def poll(self):
+        """
+        This frame's Controls.
+
+        RETURNS:
+        - Controls, or None once a replay has run out of frames
+        """
+        if self.replaying:
+            if self.frame >= len(self._frames):
+                return None
+            keys, buttons, x, y = self._frames[self.frame]
+            self.frame += 1
+            return Controls(KeyState(keys, self.bits),
+                            (bool(buttons & 1), bool(buttons & 2), bool(buttons & 4)),
+                            (x, y))
+
+        keys = pygame.key.get_pressed()
+        mouse_buttons = pygame.mouse.get_pressed()
+        mouse_pos = pygame.mouse.get_pos()
+        if self.record_path:
+            mask = 0
+            for key, bit in self.bits.items():
+                if keys[key]:
+                    mask |= 1 << bit
+            buttons = mouse_buttons[0] | mouse_buttons[1] << 1 | mouse_buttons[2] << 2
+            self._rows.append((mask, buttons, mouse_pos[0], mouse_pos[1]))
+        self.frame += 1
+        return Controls(keys, mouse_buttons, mouse_pos)
+
+    def end_frame(self, state_values):
+        """
+        Call once the frame's update is done.
+
+        PARAMETERS:
+        - state_values: Function returning the numbers to checksum (only
+          called on checksum frames)
+        """
+        if self.checksum_path and self.frame % self.checksum_every == 0:
+            self._checksums.append((self.frame, state_checksum(state_values())))
+
+    # --------------------------------------------------
+    # FILES
+    # --------------------------------------------------
+    def _load(self, path):
+        with open(path, "rb") as f:
+            data = f.read()
+        magic, version, fps, seed, count, game = HEADER.unpack_from(data)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} is not a version {VERSION} recording")
+        game = game.rstrip(b"\0").decode()
+        if game != self.game:
+            raise ValueError(f"{path} was recorded in {game!r}, not {self.game!r}")
+        if fps != self.fps:
+            raise ValueError(f"{path} was recorded at {fps} FPS, the game runs at {self.fps}")
+        frames = np.frombuffer(data, dtype=FRAME_DTYPE, count=count, offset=HEADER.size)
+        return seed, frames.tolist()
+
+    def close(self):
+        """Write the recording / checksums and report how the replay went."""
+        if self.record_path:
+            header = HEADER.pack(MAGIC, VERSION, self.fps, self.seed, len(self._rows),
+                                 self.game.encode())
+            with open(self.record_path, "wb") as f:
+                f.write(header)
+                f.write(np.array(self._rows, dtype=FRAME_DTYPE).tobytes())
+            print(f"Recorded {len(self._rows)} frames to {self.record_path}")
+
+        if self.checksum_path:
+            with open(self.checksum_path, "w") as f:
+                for frame, crc in self._checksums:
+                    f.write(f"{frame} {crc:08x}\n")
+
+        if self.replaying:
+            elapsed = perf_counter() - self._start
+            per_frame = elapsed / max(self.frame, 1) * 1000.0
+            print(f"Replayed {self.frame} frames in {elapsed:.2f} s ({per_frame:.3f} ms/frame)")
+
+
+# ==================================================
+# COMMAND LINE
+# ==================================================
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare two replay checksum files")
+    parser.add_argument("command", choices=["compare"])
+    parser.add_argument("reference")
+    parser.add_argument("candidate")
+    args = parser.parse_args()
+
+    frame = compare_checksums(args.reference, args.candidate)
+    if frame is None:
+        print("Checksums match")
+    else:
+        print(f"Diverged at frame {frame}")
+        sys.exit(1)
@@ -50,6 +50,25 @@ import numpy as np    # Math library for arrays and calculations
 import pygame         # Game library for graphics and window management
 import math           # Standard Python math (sin, cos, distance calculations)
 import sys            # System library (for exiting the program cleanly)
+import functools      # Tools for functions (lru_cache remembers results)
+
+# Our own helper module (fixed_step.py, in this same folder) that runs the
+# physics in small equal steps no matter how fast the screen is drawing
+from fixed_step import FixedStepLoop, lerp, lerp_point, step_damping
+
+# Another helper module (static_layer.py) that draws the background, waypoints
+# and path dots ONCE and reuses that picture every frame
+from static_layer import StaticLayer
+
+# And one (paths.py) that moves things along a path at a steady speed
+from paths import ArcLengthPath, PathFollower
+from splines import SplinePath  # Smooth curved tracks (no sharp corners)
+
+# And one (profiler.py) that shows how long each part of a frame takes
+from profiler import FrameProfiler
+
+# And one (spatial_hash.py) that finds which nodes a shot or sword touched
+from spatial_hash import SpatialHash
 
 # =========================
 # CONFIG - EASY SETTINGS FOR YOUR FRIEND
@@ -82,6 +101,35 @@ TAIL_HP = 30   # Fragile tail
 HEAD_MASS = 8.0   # Heavy head
 TAIL_MASS = 1.5   # Light tail for whip effect
 
+# Physics timing (the screen still draws at 60 FPS)
+PHYSICS_HZ = 240      # Physics steps per second (higher = more stable springs)
+PHYSICS_SUBSTEPS = 1  # Extra slices per physics step for very stiff settings
+
+# Physics solver: "euler" (classic springs), "verlet" (position-based,
+# stays stable for very long snakes and light tails) or "implicit" (handles
+# very stiff springs without extra substeps)
+SOLVER = "euler"
+SOLVER_ITERATIONS = 4  # Verlet only: constraint passes per step (more = tighter)
+
+# Sleeping: a snake that has stopped moving skips its physics until its
+# anchor moves, it takes damage or it changes state (see SLEEPING below)
+SLEEP_SPEED = 2.0        # Settled = average node speed below this (pixels/second)...
+SLEEP_STRETCH = 0.05     # ...no spring changing length by more than this between checks...
+SLEEP_DELAY = 0.5        # ...for this many seconds in a row
+SLEEP_CHECK_EVERY = 8    # Physics steps between "have we settled?" checks
+
+# Body drawing (see ElasticChain.draw)
+RIBBON_MAX_POINTS = 200    # Long snakes are drawn with at most this many outline points
+STRAIN_COLOR_STEP = 0.05   # Strain is rounded to this before picking a colour
+NODE_ANTIALIAS = False     # Smooth edges on the node circles (a bit slower to build)
+
+# Paths made by generate_sine_edge are remembered; this is how many
+PATH_CACHE_SIZE = 256
+
+# Frame profiler: press F3 in the game to show where each frame's time goes
+PROFILE = False                    # True = start timing right away
+PROFILE_CSV = "profile_snake.csv"  # Every timed frame is saved here on exit
+
 # =========================
 # QUICK START GUIDE
 # =========================
@@ -92,9 +140,18 @@ TAIL_MASS = 1.5   # Light tail for whip effect
 # =========================
 
 # ================================================================================
-# REGULAR FUNCTION (not part of a class)
-# This creates a wavy path between two points for the boss to follow
+# REGULAR FUNCTIONS (not part of a class)
+# These create wavy paths between points for the boss to follow
 # ================================================================================
+# MEMOIZATION: the same inputs always give the same path, so each path is
+# remembered (in a "least recently used" cache of PATH_CACHE_SIZE entries).
+# Asking for it again - e.g. every frame for waypoints that follow the player -
+# just hands back the stored array instead of doing the math again.
+#
+# The cached arrays are made read-only so nobody can accidentally change a
+# path that someone else is also using. Call .copy() if you need to edit one.
+# ================================================================================
+
 def generate_sine_edge(p0, p1, samples=25, amplitude=1, cycles=5, y_middle=None):
     """
     Creates a sine wave path between two points.
@@ -107,49 +164,101 @@ def generate_sine_edge(p0, p1, samples=25, amplitude=1, cycles=5, y_middle=None)
     - samples: How many points to create along the path (more = smoother)
     - amplitude: How "tall" the waves are (bigger = more wiggly)
     - cycles: How many complete waves from start to finish
-    - y_middle: Optional middle line (calculated automatically if not provided)
+    - y_middle: Kept for older code; the wave is always centered on the line
+                from p0 to p1, so this doesn't change the result
 
     RETURNS:
-    - A list of (x, y) coordinates forming a wavy path
+    - A (samples, 2) NumPy array: row i holds [x, y] of point i
 
     VISUAL EXAMPLE:
     p0 ~~~^~~~v~~~^~~~ p1
        (sine wave path)
     """
+    # tuple(map(float, ...)) turns lists, Vector2s, arrays... into something
+    # the cache can use as a key
+    return _sine_edge_cached(tuple(map(float, p0)), tuple(map(float, p1)),
+                             int(samples), float(amplitude), float(cycles))
 
+
+@functools.lru_cache(maxsize=PATH_CACHE_SIZE)
+def _sine_edge_cached(p0, p1, samples, amplitude, cycles):
     # Step 1: Extract coordinates from the points
     x0, y0 = p0  # Unpack tuple: p0 = (100, 200) → x0=100, y0=200
     x1, y1 = p1  # Same for endpoint
 
-    # Step 2: Calculate distance and angle between points
+    # Step 2: Calculate distance and direction between points
     length = math.hypot(x1 - x0, y1 - y0)  # hypot = sqrt(dx² + dy²) = distance
     angle = math.atan2(y1 - y0, x1 - x0)   # atan2 = angle in radians
+    cos_a, sin_a = math.cos(angle), math.sin(angle)  # Worked out ONCE, not per point
 
     # Step 3: Create evenly spaced points along the line
     xs = np.linspace(0, length, samples)  # Creates 'samples' numbers from 0 to length
                                            # Example: linspace(0, 100, 5) → [0, 25, 50, 75, 100]
 
-    # Step 4: Calculate middle line for the sine wave
-    if y_middle is None:
-        y_middle = (y0 + y1) / 2  # Default: use the middle between start and end
-
-    # Step 5: Create the sine wave pattern
-    frequency = cycles * 2 * math.pi / length  # How "squished" the waves are
-    ys = y_middle + amplitude * np.sin(frequency * xs)  # Apply sine to all points
-    # This creates: [middle, middle+wave1, middle+wave2, ...]
-
-    # Step 6: Rotate the sine wave to match the angle between p0 and p1
-    # (Because our wave might not be horizontal!)
-    points = []
-    for x, y in zip(xs, ys):  # zip combines lists: zip([1,2], [3,4]) → [(1,3), (2,4)]
-        dx = x
-        dy = y - y_middle
-        # Rotation math (don't worry too much about this part - it's just trigonometry)
-        wx = dx * math.cos(angle) - dy * math.sin(angle) + x0
-        wy = dx * math.sin(angle) + dy * math.cos(angle) + y0
-        points.append((wx, wy))  # Add rotated point to our list
-
-    return points  # Give back the list of coordinates
+    # Step 4: Create the sine wave pattern (sideways distance from the line)
+    frequency = cycles * 2 * math.pi / length if length > 0 else 0.0  # How "squished" the waves are
+    dys = amplitude * np.sin(frequency * xs)
+
+    # Step 5: Rotate the whole wave to match the angle between p0 and p1
+    # (Because our wave might not be horizontal!) - all points at once
+    points = np.empty((samples, 2))
+    points[:, 0] = xs * cos_a - dys * sin_a + x0
+    points[:, 1] = xs * sin_a + dys * cos_a + y0
+
+    points.flags.writeable = False  # Shared through the cache: read-only!
+    return points
+
+
+def generate_sine_loop(waypoints, samples=25, amplitude=1, cycles=5, alternate=True):
+    """
+    Creates the sine wave paths for a whole waypoint loop in one call.
+
+    Segment i goes from waypoints[i] to waypoints[i + 1], and the last one
+    goes back to waypoints[0]. This does exactly what calling
+    generate_sine_edge() once per segment would, but for every segment at
+    the same time.
+
+    PARAMETERS:
+    - waypoints: List of (x, y) points (at least 2)
+    - samples, amplitude, cycles: Same as generate_sine_edge
+    - alternate: If True, odd segments use -amplitude (flipped waves)
+
+    RETURNS:
+    - A (len(waypoints), samples, 2) NumPy array: paths[i] is segment i
+    """
+    key = tuple(tuple(map(float, p)) for p in waypoints)
+    return _sine_loop_cached(key, int(samples), float(amplitude), float(cycles), bool(alternate))
+
+
+@functools.lru_cache(maxsize=PATH_CACHE_SIZE)
+def _sine_loop_cached(waypoints, samples, amplitude, cycles, alternate):
+    starts = np.array(waypoints)                # (S, 2): where each segment begins
+    ends = np.roll(starts, -1, axis=0)          # (S, 2): ...and where it ends
+
+    delta = ends - starts
+    lengths = np.hypot(delta[:, 0], delta[:, 1])
+    safe_lengths = np.where(lengths > 0, lengths, 1.0)
+    cos_a = np.where(lengths > 0, delta[:, 0] / safe_lengths, 1.0)  # Same as cos(atan2(...))
+    sin_a = delta[:, 1] / safe_lengths
+
+    # Amplitude for each segment: + - + - ... when alternating
+    amplitudes = np.full(len(starts), amplitude)
+    if alternate:
+        amplitudes[1::2] *= -1
+
+    # (S, samples) grids: one row per segment
+    u = np.linspace(0.0, 1.0, samples)
+    xs = lengths[:, None] * u                              # Distance along each line
+    frequency = np.where(lengths > 0, cycles * 2 * math.pi / safe_lengths, 0.0)
+    dys = amplitudes[:, None] * np.sin(frequency[:, None] * xs)
+
+    paths = np.empty((len(starts), samples, 2))
+    paths[:, :, 0] = xs * cos_a[:, None] - dys * sin_a[:, None] + starts[:, 0, None]
+    paths[:, :, 1] = xs * sin_a[:, None] + dys * cos_a[:, None] + starts[:, 1, None]
+
+    paths.flags.writeable = False
+    return paths
+
 # ================================================================================
 # YOUR FIRST CLASS! - CurveFollower
 # ================================================================================
@@ -163,6 +272,10 @@ def generate_sine_edge(p0, p1, samples=25, amplitude=1, cycles=5, y_middle=None)
 #   boss.points, boss.speed, boss.index, boss.pos
 #
 # This keeps related data organized and easier to manage!
+#
+# NOTE: main() now uses PathFollower from paths.py, which rides the whole
+# looped track at an exact, steady speed. CurveFollower is kept here because
+# it's the simplest example of a class in this file.
 # ================================================================================
 
 class CurveFollower:
@@ -269,6 +382,200 @@ class CurveFollower:
 
 
 
+# ================================================================================
+# HELPER FUNCTION - Solving a "chain-shaped" system of equations
+# ================================================================================
+# The implicit solver (ElasticChain._step_implicit) needs to solve one equation
+# per node, where each node's equation only mentions itself and its two
+# neighbours (because each node only has springs to its neighbours!):
+#
+#   A[i] @ x[i-1]  +  B[i] @ x[i]  +  C[i] @ x[i+1]  =  d[i]
+#
+# Each x[i] is a 2D vector (x and y), so A, B, C are little 2×2 matrices.
+# This is called a BLOCK-TRIDIAGONAL system.
+#
+# CYCLIC REDUCTION: use the odd-numbered equations to eliminate the
+# odd-numbered unknowns from the even ones. That leaves a system with HALF the
+# size and the same shape, so we repeat until one equation is left, then fill
+# the odd unknowns back in on the way out. Every step works on whole arrays,
+# and the total work is O(n) - no giant n×n matrix is ever built.
+# ================================================================================
+
+def _inverse_2x2(M):
+    """Invert a stack of 2×2 matrices, shape (n, 2, 2)."""
+    a, b = M[:, 0, 0], M[:, 0, 1]
+    c, d = M[:, 1, 0], M[:, 1, 1]
+    inv = np.empty_like(M)
+    det = a * d - b * c
+    inv[:, 0, 0] = d / det
+    inv[:, 0, 1] = -b / det
+    inv[:, 1, 0] = -c / det
+    inv[:, 1, 1] = a / det
+    return inv
+
+
+def solve_block_tridiagonal(A, B, C, d):
+    """
+    Solve A[i] x[i-1] + B[i] x[i] + C[i] x[i+1] = d[i] for every i.
+
+    PARAMETERS:
+    - A, B, C: (n, 2, 2) arrays of blocks (A[0] and C[n-1] are ignored)
+    - d: (n, 2) array of right-hand sides
+
+    RETURNS:
+    - x: (n, 2) array of solutions
+    """
+    n = len(B)
+    if n == 1:
+        return (_inverse_2x2(B) @ d[:, :, None])[:, :, 0]
+
+    # Even rows are kept, odd rows get eliminated
+    A_e, B_e, C_e, d_e = A[0::2], B[0::2], C[0::2], d[0::2]
+    A_o, C_o, d_o = A[1::2], C[1::2], d[1::2]
+    B_o_inv = _inverse_2x2(B[1::2])
+    n_even, n_odd = len(B_e), len(B_o_inv)
+
+    # Even row k has an odd neighbour on the left when k >= 1 (row 2k-1)
+    # and on the right when k < n_odd (row 2k+1)
+    left = -A_e[1:] @ B_o_inv[:n_even - 1]
+    right = -C_e[:n_odd] @ B_o_inv
+
+    A_new = np.zeros_like(A_e)
+    B_new = B_e.copy()
+    C_new = np.zeros_like(C_e)
+    d_new = d_e.copy()
+
+    A_new[1:] = left @ A_o[:n_even - 1]
+    B_new[1:] += left @ C_o[:n_even - 1]
+    d_new[1:] += (left @ d_o[:n_even - 1, :, None])[:, :, 0]
+
+    C_new[:n_odd] = right @ C_o
+    B_new[:n_odd] += right @ A_o
+    d_new[:n_odd] += (right @ d_o[:, :, None])[:, :, 0]
+
+    # Solve the half-size system, then fill the odd unknowns back in:
+    # x[2k+1] = B⁻¹ (d - A x[2k] - C x[2k+2])
+    x = np.empty_like(d)
+    x_even = solve_block_tridiagonal(A_new, B_new, C_new, d_new)
+    x[0::2] = x_even
+
+    rhs = d_o - (A_o @ x_even[:n_odd, :, None])[:, :, 0]
+    m = min(n_odd, n_even - 1)
+    rhs[:m] -= (C_o[:m] @ x_even[1:m + 1, :, None])[:, :, 0]
+    x[1::2] = (B_o_inv @ rhs[:, :, None])[:, :, 0]
+    return x
+
+
+# ================================================================================
+# HELPER FUNCTIONS - Drawing the body as one ribbon
+# ================================================================================
+# Instead of one thick line per spring, the body is drawn as a RIBBON: walk
+# along the spine, step sideways by the body's half-width on both sides, and
+# join the two edges into one polygon outline:
+#
+#   left edge:   L0 ---- L1 ---- L2 ---- L3
+#   spine:       n0 ---- n1 ---- n2 ---- n3
+#   right edge:  R0 ---- R1 ---- R2 ---- R3
+#
+#   polygon = L0 L1 L2 L3 R3 R2 R1 R0  (go out along the left, back along the right)
+#
+# Springs whose strain rounds to the same colour share one polygon, so a calm
+# snake is just a handful of draw calls no matter how many nodes it has.
+# ================================================================================
+
+def strain_color(strain):
+    """
+    Colour of a spring with the given strain.
+
+    - RED/PINK = tension (stretched), brighter the more it stretches
+    - GRAY = compression (squished), darker the more it squishes
+    """
+    if strain > 0:
+        hot = min(255, int(120 + 300 * strain))
+        return (255, hot, hot)
+    fade = max(60, int(160 + 200 * strain))
+    return (fade, fade, fade)
+
+
+def ribbon_edges(points, half_widths):
+    """
+    Left and right edges of a ribbon that follows points.
+
+    PARAMETERS:
+    - points: (n, 2) array of spine positions
+    - half_widths: (n,) array, distance from the spine to each edge
+
+    RETURNS:
+    - left, right: (n, 2) arrays of edge positions
+    """
+    if len(points) < 2:
+        return points.copy(), points.copy()  # A lone node has no ribbon
+
+    # Direction of the spine at each point: central difference in the middle,
+    # one-sided at the two ends
+    tangents = np.empty_like(points)
+    tangents[1:-1] = points[2:] - points[:-2]
+    tangents[0] = points[1] - points[0]
+    tangents[-1] = points[-1] - points[-2]
+
+    lengths = np.hypot(tangents[:, 0], tangents[:, 1])
+    lengths[lengths < 1e-9] = 1.0  # Two nodes on top of each other: any normal will do
+
+    # Normal = tangent turned 90 degrees, scaled to the half-width
+    offset = np.empty_like(points)
+    offset[:, 0] = -tangents[:, 1]
+    offset[:, 1] = tangents[:, 0]
+    offset *= (half_widths / lengths)[:, None]
+    return points + offset, points - offset
+
+
+# ================================================================================
+# HELPER FUNCTION - Node sprites (draw each circle once, then just copy it)
+# ================================================================================
+# Drawing a circle means working out every pixel inside it. A node's size and
+# colour never change between frames, so we draw each (radius, colour) circle
+# ONCE onto its own small Surface and keep it in a dictionary. Every frame
+# after that, the whole snake is one screen.blits() call that just copies
+# those little pictures into place.
+# ================================================================================
+
+_sprite_cache = {}  # (radius, color, antialias) -> Surface
+
+
+def node_sprite(radius, color, antialias=False):
+    """
+    A (2*radius × 2*radius) Surface with a filled circle centered in it.
+
+    Blitting it at (x - radius, y - radius) gives the same pixels as
+    pygame.draw.circle(screen, color, (x, y), radius).
+    """
+    cache_key = (radius, color, antialias)
+    sprite = _sprite_cache.get(cache_key)
+    if sprite is None:
+        size = max(1, 2 * radius)
+        has_window = pygame.display.get_surface() is not None
+
+        if antialias:
+            # Soft edges need real per-pixel transparency
+            sprite = pygame.Surface((size, size), pygame.SRCALPHA)
+            pygame.draw.aacircle(sprite, color, (radius, radius), radius)
+            if has_window:
+                sprite = sprite.convert_alpha()
+        else:
+            # Hard edges only need a "see-through" colour key, which blits
+            # much faster than per-pixel alpha. The inverted colour can never
+            # be the same as the circle's own colour.
+            sprite = pygame.Surface((size, size))
+            if has_window:
+                sprite = sprite.convert()  # Match the screen's pixel format
+            key_color = tuple(255 - c for c in color)
+            sprite.fill(key_color)
+            pygame.draw.circle(sprite, color, (radius, radius), radius)
+            sprite.set_colorkey(key_color, pygame.RLEACCEL)
+        _sprite_cache[cache_key] = sprite
+    return sprite
+
+
 # ================================================================================
 # THE BIG CLASS! - ElasticChain (The Snake Boss)
 # ================================================================================
@@ -317,62 +624,52 @@ class ElasticChain:
     # Example: my_snake = ElasticChain((400, 300))
     # ============================================================================
 
-    def __init__(self, anchor_pos):
+    def __init__(self, anchor_pos, num_nodes=None, solver=None):
         """
         Build a new elastic snake!
 
         PARAMETERS:
         - anchor_pos: Where to place the snake's tail initially (x, y)
+        - num_nodes: How many nodes to build (defaults to NUM_NODES)
+        - solver: "euler", "verlet" or "implicit" (defaults to SOLVER)
 
         This method creates all the nodes, sets their properties, and
         connects them with springs.
         """
 
         # ========================================================================
-        # STEP 1: Create empty lists to store data for each node
+        # STEP 1: Decide how many nodes we have
         # ========================================================================
-        # We use LISTS because we have multiple nodes (10 by default)
-        # Lists are like containers: my_list = [item1, item2, item3]
-
-        self.nodes = []       # Will store positions: [(x0,y0), (x1,y1), ...]
-        self.velocities = []  # Will store speeds: [[vx0,vy0], [vx1,vy1], ...]
-
-        # Each node has different properties (gradients from head to tail):
-        self.masses = []      # Weight of each node [8.0, 7.3, 6.6, ..., 1.5]
-        self.radii = []       # Visual size [48, 45, 42, ..., 19]
-
-        # HP (Health Points) system - each node can take damage!
-        self.node_max_hp = [] # Maximum HP each node can have
-        self.node_hp = []     # Current HP (starts at maximum)
+        # Every per-node value is stored in a NumPy ARRAY instead of a list.
+        # This is called "structure of arrays": one contiguous array per
+        # property (all positions together, all masses together, ...).
+        # NumPy can then do the math for EVERY node at once, which is what
+        # lets the snake have thousands of nodes instead of ~100.
+
+        if num_nodes is None:
+            num_nodes = NUM_NODES
+        self.num_nodes = num_nodes
+
+        # Gradient position for every node at once: t goes from 1 (node 0) to
+        # 0 (last node). Example with 10 nodes: [1.0, 0.89, 0.78, ..., 0.0]
+        if num_nodes > 1:
+            t = 1.0 - np.arange(num_nodes) / (num_nodes - 1)
+        else:
+            t = np.zeros(num_nodes)
 
         # ========================================================================
         # STEP 2: Calculate HP for each node (gradient from head to tail)
         # ========================================================================
-        # GRADIENT means smoothly changing from one value to another
-        # Head (node 0): tough (120 HP)
-        # Middle nodes: medium HP
-        # Tail (last node): fragile (30 HP)
+        # GRADIENT means smoothly changing from one value to another.
+        # Linear interpolation (lerp): result = start * (1-t) + end * t
+        # np.trunc() chops off the decimals, just like int() does for one number.
 
-        for i in range(NUM_NODES):
-            # Calculate gradient position: t goes from 0 (head) to 1 (tail)
-            # Example with 10 nodes:
-            #   i=0: t = 1.0 - 0/9 = 1.0 (head)
-            #   i=5: t = 1.0 - 5/9 = 0.44 (middle)
-            #   i=9: t = 1.0 - 9/9 = 0.0 (tail)
-            t = 1.0 - i / (NUM_NODES - 1) if NUM_NODES > 1 else 0
-
-            # Linear interpolation (lerp): blend between two values
-            # Formula: result = start * (1-t) + end * t
-            # When t=1 (head): hp = HEAD_HP * 1 + TAIL_HP * 0 = 120
-            # When t=0 (tail): hp = HEAD_HP * 0 + TAIL_HP * 1 = 30
-            hp = int(HEAD_HP * (1 - t) + TAIL_HP * t)
-
-            self.node_max_hp.append(hp)  # Save maximum HP
-            self.node_hp.append(hp)      # Current HP starts at max
+        self.node_max_hp = np.trunc(HEAD_HP * (1 - t) + TAIL_HP * t)  # Maximum HP
+        self.node_hp = self.node_max_hp.copy()  # Current HP (starts at maximum)
 
         # Calculate total HP for the whole snake
-        self.total_hp = sum(self.node_hp)  # sum([120, 107, ..., 30]) = total
-        self.max_total_hp = self.total_hp   # Remember starting total
+        self.total_hp = float(self.node_hp.sum())  # Sum of every node's HP
+        self.max_total_hp = self.total_hp          # Remember starting total
 
         # ========================================================================
         # STEP 3: Create mass gradient (heavy head → light tail)
@@ -380,6 +677,7 @@ class ElasticChain:
         # WHY? Heavy head = stable, light tail = whips around dramatically!
         base_mass = HEAD_MASS   # 8.0 for head
         tip_mass = TAIL_MASS    # 1.5 for tail
+        self.masses = base_mass * (1 - t) + tip_mass * t  # Weight of each node
 
         # ========================================================================
         # STEP 4: Create size gradient (big head → small tail)
@@ -387,45 +685,70 @@ class ElasticChain:
         # The head should look bigger and more intimidating!
         base_radius = NODE_RADIUS  # 48 pixels for head
         tip_radius = int(NODE_RADIUS * 0.4) if 'NODE_RADIUS_TIP' not in globals() else NODE_RADIUS_TIP
-
-        # Loop through all nodes and calculate their mass and size
-        for i in range(NUM_NODES):
-            t = 1.0 - i / (NUM_NODES - 1)  # Same gradient calculation as HP
-
-            # Blend between head and tail values
-            mass = base_mass * (1 - t) + tip_mass * t
-            radius = int(base_radius * (1 - t) + tip_radius * t)
-
-            self.masses.append(mass)    # Save this node's mass
-            self.radii.append(radius)   # Save this node's visual size
+        self.radii = np.trunc(base_radius * (1 - t) + tip_radius * t)  # Visual size
 
         # ========================================================================
         # STEP 5: Create initial positions for all nodes
         # ========================================================================
+        # self.nodes is an (N, 2) array: row i holds [x, y] of node i.
+        # self.velocities has the same shape and holds [vx, vy].
         self.spacing_scale = 1.0  # Can be changed later to stretch/compress snake
 
         spacing = .25  # How far apart nodes start (very small = compact)
 
-        # Place nodes in a horizontal line
-        for i in range(NUM_NODES):
-            # Start from anchor and spread left
-            x = anchor_pos[0] - spacing * (NUM_NODES - i)
-            y = anchor_pos[1]
-            self.nodes.append((x, y))           # Add position
-            self.velocities.append([0.0, 0.0])  # Start not moving
+        # Place nodes in a horizontal line, starting from anchor and spreading left
+        self.nodes = np.empty((num_nodes, 2))
+        self.nodes[:, 0] = anchor_pos[0] - spacing * (num_nodes - np.arange(num_nodes))
+        self.nodes[:, 1] = anchor_pos[1]
+        self.velocities = np.zeros((num_nodes, 2))  # Start not moving
+
+        # Positions at the start of the last physics step. draw() blends
+        # between these and self.nodes (see save_state() and FixedStepLoop)
+        self.prev_nodes = self.nodes.copy()
 
         # ========================================================================
         # STEP 6: Calculate rest lengths (natural spring lengths)
         # ========================================================================
         # Each spring connecting two nodes has a "rest length" = how long it
         # "wants" to be. If stretched or compressed, it pulls back to this length!
-
-        self.rest_lengths = []
-        for i in range(NUM_NODES - 1):  # One less spring than nodes
-            # Calculate distance between this node and next node
-            dx = self.nodes[i + 1][0] - self.nodes[i][0]
-            dy = self.nodes[i + 1][1] - self.nodes[i][1]
-            self.rest_lengths.append(math.hypot(dx, dy))  # Save distance
+        # np.diff gives [node1-node0, node2-node1, ...] (one less spring than nodes)
+
+        delta = np.diff(self.nodes, axis=0)
+        self.rest_lengths = np.hypot(delta[:, 0], delta[:, 1])
+
+        # links[i] is 1.0 while spring i is connected and 0.0 once it has been
+        # cut (see SEVERING below). node_ids remembers each node's original
+        # number, which stays the same when dead nodes are removed.
+        self.links = np.ones(num_nodes - 1)
+        self.node_ids = np.arange(num_nodes)
+        self.initial_num_nodes = num_nodes
+        self.cuts = 0                 # How many times the snake has been cut
+        self.batched = False          # Set by ChainBatch (see remove_dead_nodes)
+        self._dead_pending = False    # A node died since the last update()
+
+        # Sleeping (see SLEEPING below): True = update() skips the physics
+        self.sleeping = False
+        self._still_time = 0.0        # Seconds the snake has looked settled
+        self._sleep_steps = 0         # Steps since the last settled check
+        self._sleep_elapsed = 0.0     # Seconds since the last settled check
+
+        # Reusable scratch arrays (so update() never has to build brand-new
+        # lists every frame): spring forces for "euler", start-of-step
+        # positions for "verlet"
+        self._forces = np.zeros((num_nodes, 2))
+        self._step_start = np.zeros((num_nodes, 2))
+
+        # Node pictures for draw(), built the first time they're needed
+        # (see _node_sprites)
+        self._sprites = []
+        self._sprite_key = None
+
+        # Grid for finding which nodes got hit (see refresh_hit_grid)
+        self.hit_grid = SpatialHash()
+
+        # Which physics solver to use (see _step_euler and _step_verlet)
+        self.solver = SOLVER if solver is None else solver
+        self.solver_iterations = SOLVER_ITERATIONS
 
         # ========================================================================
         # STEP 7: Set physics parameters
@@ -443,6 +766,11 @@ class ElasticChain:
         self.state_time = 0.0         # How long we've been in this state
         self.stiffness_scale = 1.0    # Multiplier for spring stiffness
 
+        # ========================================================================
+        # STEP 9: Fill the coefficient cache (see refresh_coefficients)
+        # ========================================================================
+        self.refresh_coefficients()
+
     # ============================================================================
     # STATE TRANSITION METHODS
     # ============================================================================
@@ -476,6 +804,7 @@ class ElasticChain:
         self.base_stiffness = 20.0       # How tight the springs are
         self.poisson_ratio = 0.4         # Material property (medium thickness change)
         self.damping = 0.8               # Energy loss (0=no friction, 1=instant stop)
+        self.refresh_coefficients()      # Settings changed → rebuild the cache
 
     def _enter_expanded(self):
         """
@@ -498,6 +827,7 @@ class ElasticChain:
         self.base_stiffness = 14.0       # Lower base stiffness
         self.poisson_ratio = 0.4         # Same material property
         self.damping = 0.85              # Slightly more damping (smoother movement)
+        self.refresh_coefficients()      # Settings changed → rebuild the cache
 
     def _enter_rigid(self):
         """
@@ -520,6 +850,63 @@ class ElasticChain:
         self.base_stiffness = 14.0       # Lower base (but stretched far = still tense)
         self.poisson_ratio = 0.8         # High Poisson = thickness changes a lot
         self.damping = 0.8               # Normal damping
+        self.refresh_coefficients()      # Settings changed → rebuild the cache
+
+    # ============================================================================
+    # COEFFICIENT CACHE - Work things out once, not every frame
+    # ============================================================================
+    # Lots of numbers the physics needs (1/mass, each node's damping, the
+    # stretched rest lengths, the overall spring constant) only change when the
+    # state changes or someone edits the masses. So we compute them here, store
+    # them, and update()/draw() just read them.
+    # ============================================================================
+
+    def refresh_coefficients(self):
+        """
+        Rebuild the cached per-node and per-spring physics numbers.
+
+        Called automatically by __init__ and the _enter_* state methods.
+        Call it yourself after changing masses, rest_lengths, links,
+        spacing_scale, base_stiffness, stiffness_scale or damping by hand.
+        """
+        self.inv_masses = 1.0 / self.masses  # Multiplying is cheaper than dividing
+        self._inv_mass_pinned = self.inv_masses.copy()
+        self._inv_mass_pinned[-1] = 0.0      # Verlet: the pinned tail never moves
+
+        # Tail whip: each node's mass as a fraction of the heaviest, 0.2-1.0
+        self.mass_ratio = np.clip(self.masses[:-1] / self.masses.max(), 0.2, 1.0)
+
+        # Rest lengths after the state's stretch, and each spring's constant
+        # before the Poisson effect (which depends on strain, so stays live).
+        # Cut springs get 0, so they pull on nothing.
+        self.effective_rest_lengths = self.rest_lengths * self.spacing_scale
+        self.spring_stiffness = self.base_stiffness * self.stiffness_scale * self.links
+
+        # Kinetic energy below which the snake counts as settled (see SLEEPING).
+        # New settings mean a new rest shape, so a sleeping snake wakes up.
+        self._sleep_energy = 0.5 * float(self.masses.sum()) * SLEEP_SPEED ** 2
+        self._check_lengths = None
+        self.wake()
+
+        # Per-node damping also depends on dt, so it's filled in on the first
+        # step that uses a new dt (see _local_damping)
+        self._damping_dt = None
+        self._damping_cache = None
+
+    def _local_damping(self, dt):
+        """
+        Per-node damping factors for a step of length dt (cached).
+
+        Lighter nodes get LESS damping so they keep their speed → WHIP!
+        If damping=0.8 and mass_ratio=1.0: local_damping = 0.8^1.0 = 0.8 (heavy)
+        If damping=0.8 and mass_ratio=0.25: local_damping = 0.8^0.25 = 0.945 (light)
+        step_damping() keeps "0.8" meaning "per 1/60 second" even when the
+        physics runs in smaller steps (e.g. 240 times per second)
+        """
+        if dt != self._damping_dt:
+            self._damping_cache = (step_damping(self.damping, dt) ** self.mass_ratio)[:, None]
+            self._damping_dt = dt
+        return self._damping_cache
 
     # ============================================================================
     # DAMAGE METHOD - Health system (for future combat features)
@@ -548,15 +935,17 @@ class ElasticChain:
         chain.damage_node(0, 10)  # Deal 10 damage to the head
         chain.damage_node(9, 50)  # Deal 50 damage to the tail (overkill if HP<50)
 
-        NOTE: This method is set up for future features but not currently used
+        NOTE: A node that reaches 0 HP is cut out of the snake at the start
+        of the next update() (see remove_dead_nodes), so node numbers stay
+        the same until then.
         """
 
         # ========================================================================
         # Validation checks
         # ========================================================================
 
-        # Check if node index is valid (must be 0 to NUM_NODES-1)
-        if i < 0 or i >= NUM_NODES:
+        # Check if node index is valid (must be 0 to num_nodes-1)
+        if i < 0 or i >= self.num_nodes:
             return  # Invalid index, do nothing
             # Example: If NUM_NODES=10, valid indices are 0-9
 
@@ -582,15 +971,310 @@ class ElasticChain:
         if self.total_hp < 0:
             self.total_hp = 0
 
+        # Getting hit wakes a sleeping snake (see SLEEPING)
+        self.wake()
+
+        # Dead? Then it gets cut out on the next update()
+        if self.node_hp[i] <= 0:
+            self._dead_pending = True
+
         # ========================================================================
         # Future enhancements could add:
         # ========================================================================
         # - Visual effects when damaged (flash red, particle effects)
-        # - Remove nodes when HP reaches 0 (snake gets shorter!)
         # - Different behavior based on damage (enrage when low HP)
         # - Sound effects for damage
         # - Damage numbers floating up from the hit location
 
+    # ============================================================================
+    # AREA DAMAGE - Hit many nodes at once
+    # ============================================================================
+    # An explosion or a beam crossing a long snake can hit hundreds of nodes
+    # in one frame. Calling damage_node() for each one means hundreds of
+    # Python-level checks; these do the same job on the whole HP array in a
+    # few NumPy operations:
+    #
+    #   hits per node:  [0, 10, 20, 0, 10]     (summed, a node hit twice
+    #   HP before:      [50, 5, 30, 40, 0]      takes both hits)
+    #   damage dealt:   [0,  5, 20,  0, 0]     (never more than the HP left,
+    #   HP after:       [50, 0, 10, 40, 0]      dead nodes take nothing)
+    #   died:           [1]                    (was alive, is now at 0)
+    # ============================================================================
+
+    def damage_nodes(self, indices, amounts):
+        """
+        Apply damage to many nodes in one go.
+
+        PARAMETERS:
+        - indices: Node numbers to damage (invalid ones are ignored, and a
+                   node listed several times takes every hit)
+        - amounts: Damage per entry in indices, or one number for all of them
+
+        RETURNS:
+        - Array of the node numbers that died from this damage (HP went from
+          above 0 to 0)
+
+        USAGE EXAMPLE:
+        died = chain.damage_nodes([3, 4, 5], 25)
+        died = chain.damage_nodes(nodes, bullet_damage[shots])
+        """
+        indices = np.asarray(indices, dtype=int).ravel()
+        amounts = np.broadcast_to(np.asarray(amounts, dtype=float), indices.shape)
+        valid = (indices >= 0) & (indices < self.num_nodes)
+
+        # Total damage each node takes (bincount adds up repeated indices)
+        hits = np.bincount(indices[valid], weights=amounts[valid], minlength=self.num_nodes)
+
+        # Clamp: nobody loses more HP than they have, dead nodes lose nothing
+        alive = self.node_hp > 0
+        dmg = np.where(alive, np.minimum(hits, self.node_hp), 0.0)
+
+        self.node_hp -= dmg   # In place (a ChainBatch shares this array)
+        dealt = float(dmg.sum())
+        self.total_hp = max(self.total_hp - dealt, 0.0)
+        if dealt > 0:
+            self.wake()
+
+        died = np.flatnonzero(alive & (self.node_hp <= 0))
+        if len(died):
+            self._dead_pending = True
+        return died
+
+    def damage_in_radius(self, center, radius, amount):
+        """
+        Damage every node touched by a circle (an explosion, a shockwave...).
+
+        A node counts as touched when its circle overlaps the blast circle,
+        so big nodes are easier to catch than small ones.
+
+        PARAMETERS:
+        - center: (x, y) middle of the blast
+        - radius: Blast radius in pixels
+        - amount: Damage dealt to each node it touches
+
+        RETURNS:
+        - Array of the node numbers that died (see damage_nodes)
+
+        USAGE EXAMPLE:
+        died = chain.damage_in_radius(bomb_pos, 120, 40)
+        """
+        d = self.nodes - np.asarray(center, dtype=float)
+        reach = self.radii + radius
+        touched = np.einsum("ij,ij->i", d, d) <= reach * reach  # NaN -> False
+        return self.damage_nodes(np.flatnonzero(touched), amount)
+
+    # ============================================================================
+    # SEVERING - Dead nodes cut the snake into pieces!
+    # ============================================================================
+    # When a node dies, the springs on both sides of it are cut and the node
+    # is removed. Everything in front of the gap becomes a separate piece that
+    # flops around on its own; only the piece holding the tail stays pinned
+    # to the path.
+    #
+    #   before:  [h0 - n1 - n2 - n3 - n4 - n5 - t6]      n2 and n4 die
+    #   after:   [h0 - n1 | n3 | n5 - t6]                ("|" = cut spring)
+    #
+    # The pieces still live in the SAME arrays, one after another. A cut is
+    # just links[i] = 0 (that spring's stiffness becomes 0), so the physics
+    # still steps every piece in one vectorized pass - a 5000-node snake
+    # shredded into hundreds of pieces costs the same as one whole snake.
+    #
+    # The dead nodes are removed by sliding the living ones down to fill the
+    # gaps (in place, inside the arrays we already have), then using a
+    # shorter view of each array. Nothing new is allocated per piece.
+    #
+    # The tail is the anchor, so it is never removed: if it dies, the spring
+    # holding the snake to it is cut and the rest of the snake flies free.
+    # ============================================================================
+
+    def remove_dead_nodes(self):
+        """
+        Cut dead nodes (HP 0) out of the snake.
+
+        Called automatically at the start of update() after a node dies.
+
+        RETURNS:
+        - The original numbers (node_ids) of the nodes that were removed
+
+        NOTE: Chains in a ChainBatch share the batch's fixed-size arrays, so
+        their dead nodes are only cut loose (both springs), not removed.
+        """
+        self._dead_pending = False
+        dead = self.node_hp <= 0
+        if not dead.any():
+            return np.zeros(0, dtype=int)
+
+        # ------------------------------------------------------------------------
+        # Cut every spring that touches a dead node
+        # ------------------------------------------------------------------------
+        cut = (dead[:-1] | dead[1:]) & (self.links > 0)
+        if cut.any():
+            self.links[cut] = 0.0
+            self.cuts += 1
+
+        dead[-1] = False  # The anchor stays (see above)
+        if self.batched or not dead.any():
+            self.refresh_coefficients()
+            return np.zeros(0, dtype=int)
+
+        # ------------------------------------------------------------------------
+        # Slide the living nodes down over the dead ones
+        # ------------------------------------------------------------------------
+        # keep = [0, 1, 3, 5, 6]: new node k is old node keep[k], and new
+        # spring k joins old nodes keep[k] and keep[k+1]. Nodes that were
+        # neighbours keep their spring; a gap between them means a cut.
+        removed = self.node_ids[dead]
+        keep = np.flatnonzero(~dead)
+        k = len(keep)
+        left, right = keep[:-1], keep[1:]
+        links = self.links[left] * (right == left + 1)
+
+        self.links[:k - 1] = links
+        self.links = self.links[:k - 1]
+        self.rest_lengths[:k - 1] = self.rest_lengths[left]
+        self.rest_lengths = self.rest_lengths[:k - 1]
+        for name in ("nodes", "velocities", "prev_nodes", "masses", "radii", "node_hp",
+                     "node_max_hp", "node_ids", "_forces", "_step_start"):
+            array = getattr(self, name)
+            array[:k] = array[keep]          # Compact in place...
+            setattr(self, name, array[:k])   # ...and keep a shorter view
+
+        self.num_nodes = k
+        self.refresh_coefficients()
+        return removed
+
+    def pieces(self):
+        """
+        Where each separate piece of the snake lives in the arrays.
+
+        RETURNS:
+        - (starts, ends): piece p is nodes[starts[p]:ends[p]]; the last piece
+          holds the tail
+
+        USAGE EXAMPLE:
+        starts, ends = chain.pieces()
+        print(f"The snake is in {len(starts)} pieces")
+        """
+        cuts = np.flatnonzero(self.links == 0) + 1
+        starts = np.concatenate(([0], cuts))
+        ends = np.concatenate((cuts, [self.num_nodes]))
+        return starts, ends
+
+    # ============================================================================
+    # HIT DETECTION - Which nodes did that shot touch?
+    # ============================================================================
+    # Testing every projectile against every node is (projectiles x nodes)
+    # checks - a million for 1000 of each. The hit grid (a SpatialHash) sorts
+    # the nodes into grid cells so each shot only checks the nodes near it.
+    # The nodes move, so the grid is rebuilt once per frame after the physics.
+    # ============================================================================
+
+    def refresh_hit_grid(self):
+        """
+        Rebuild self.hit_grid from the current node positions and radii.
+
+        Dead nodes (HP 0) are left out, so they can't be hit again.
+
+        RETURNS:
+        - The SpatialHash, ready for batch queries
+
+        USAGE EXAMPLE:
+        grid = chain.refresh_hit_grid()
+        shots, nodes = grid.query_segments(old_positions, new_positions, radius=5)
+        chain.damage_nodes(nodes, 10)
+        """
+        self.hit_grid.rebuild(self.nodes, self.radii, active=self.node_hp > 0)
+        return self.hit_grid
+
+    # ============================================================================
+    # SLEEPING - Don't simulate a snake that isn't moving
+    # ============================================================================
+    # Once the anchor stops and the wobbling dies down, every physics step
+    # moves the nodes by (almost) nothing. A snake that has stayed SETTLED
+    # (barely moving, springs no longer stretching or squashing) for
+    # SLEEP_DELAY seconds goes to sleep, and update() skips the physics until
+    # something wakes it:
+    #   - its anchor moves
+    #   - it takes damage
+    #   - it changes state (anything that calls refresh_coefficients)
+    #
+    #   awake:   step, step, ..., check: settled? ... settled for 0.5 s → sleep
+    #   asleep:  pin the tail → did the anchor move? no → done, no physics
+    #
+    # The springs don't have to be at their rest length: a long snake creeps
+    # towards its rest shape at well under a pixel per second, which nobody
+    # can see, so it's allowed to doze off a bit stretched.
+    #
+    # Checking costs about as much as a step, so it only happens every
+    # SLEEP_CHECK_EVERY steps. Moving nodes by hand (knockback, teleport)?
+    # Call wake() afterwards.
+    # ============================================================================
+
+    def wake(self):
+        """Start simulating again (and restart the settled timer)."""
+        self.sleeping = False
+        self._still_time = 0.0
+
+    def _check_settled(self):
+        """
+        True when the snake is barely moving and its springs hold still.
+
+        Moving = KINETIC ENERGY (½ × mass × speed², added up over all nodes),
+        compared with what it would be if every node moved at SLEEP_SPEED.
+        Springs = how much each spring's length (its strain × rest length)
+        changed since the last check; cut springs don't count.
+        """
+        delta = self.nodes[1:] - self.nodes[:-1]
+        lengths = np.hypot(delta[:, 0], delta[:, 1])
+        previous, self._check_lengths = self._check_lengths, lengths
+        if previous is None:
+            return False  # Nothing to compare with yet
+
+        v = self.velocities
+        kinetic = 0.5 * float(np.einsum("i,ij,ij->", self.masses, v, v))
+        if not kinetic <= self._sleep_energy:  # "not <=" so NaN counts as moving
+            return False
+        still = np.abs(lengths - previous) <= SLEEP_STRETCH
+        return bool(np.all(still | (self.links == 0)))
+
+    def _note_settled(self, settled, elapsed):
+        """Add up settled time since the last check; sleep after SLEEP_DELAY."""
+        if not settled:
+            self._still_time = 0.0
+            return
+        self._still_time += elapsed
+        if self._still_time >= SLEEP_DELAY:
+            self.sleeping = True
+            self.velocities[:] = 0.0  # Stop whatever tiny drift is left
+
+    # ============================================================================
+    # STATE TIMER - Automatic phase changes
+    # ============================================================================
+    # This is split out of update() so that a ChainBatch (see below) can run
+    # every snake's state machine while doing the physics for all of them
+    # together in one go.
+    # ============================================================================
+
+    def update_state(self, dt):
+        """
+        Advance the state timer and switch states when it's time.
+
+        PARAMETERS:
+        - dt: Delta time - how much time has passed since last frame (seconds)
+        """
+
+        # Track how long we've been in the current state
+        self.state_time += dt  # Add elapsed time (example: 0.016 seconds per frame)
+
+        # The snake automatically changes behavior over time!
+        # This creates varied, interesting movement patterns
+        if self.state == "idle" and self.state_time > 10.0:
+            # After 10 seconds of idle, switch to expanded
+            self._enter_expanded()
+        elif self.state == "expanded" and self.state_time > 20.0:
+            # After 20 seconds total, switch to rigid
+            self._enter_rigid()
+
     # ============================================================================
     # UPDATE PHYSICS - The heart of the simulation!
     # ============================================================================
@@ -613,28 +1297,21 @@ class ElasticChain:
         1. Updates state timer (for automatic state changes)
         2. Checks if we should transition to a new state
         3. Pins the tail to the anchor point
-        4. Calculates spring forces between all nodes
-        5. Updates velocities and positions using physics
+        4. Moves all the other nodes with the chosen solver
+           ("euler": spring forces → velocities → positions,
+            "verlet": move first, then pull springs back to length,
+            "implicit": solve for the velocities at the END of the step)
+        5. Puts the snake to sleep once it has settled (see SLEEPING)
         """
 
         # ========================================================================
-        # STEP 1: Update state timer
+        # STEPS 1-2: Update state timer and check for state transitions
         # ========================================================================
-        # Track how long we've been in the current state
-        self.state_time += dt  # Add elapsed time (example: 0.016 seconds per frame)
-
-        # ========================================================================
-        # STEP 2: Check for automatic state transitions
-        # ========================================================================
-        # The snake automatically changes behavior over time!
-        # This creates varied, interesting movement patterns
+        self.update_state(dt)
 
-        if self.state == "idle" and self.state_time > 10.0:
-            # After 10 seconds of idle, switch to expanded
-            self._enter_expanded()
-        elif self.state == "expanded" and self.state_time > 20.0:
-            # After 20 seconds total, switch to rigid
-            self._enter_rigid()
+        # Cut out any nodes that died since last time (see SEVERING)
+        if self._dead_pending:
+            self.remove_dead_nodes()
 
         # ========================================================================
         # STEP 3: Pin the tail to the anchor point
@@ -642,21 +1319,58 @@ class ElasticChain:
         # "Kinematic" means this node is controlled directly, not by physics
         # The last node (tail) follows the path - it's our anchor point
 
-        self.nodes[-1] = anchor_pos           # Set tail position ([-1] = last item)
-        self.velocities[-1] = [0.0, 0.0]      # Tail has no velocity (it's pinned!)
+        # If the anchor moved, the snake can't stay asleep (see SLEEPING)
+        tail = self.nodes[-1]
+        if anchor_pos[0] != tail[0] or anchor_pos[1] != tail[1]:
+            self.wake()
+
+        self.nodes[-1] = anchor_pos        # Set tail position ([-1] = last row)
+        self.velocities[-1] = 0.0          # Tail has no velocity (it's pinned!)
+
+        if self.num_nodes < 2 or self.sleeping:
+            return  # Nothing else to move (only the anchor left, or asleep)
 
         # ========================================================================
-        # STEP 4: Create empty force list
+        # STEP 4: Move the rest of the snake with the chosen solver
         # ========================================================================
-        # Forces are pushes/pulls that will affect each node
-        # Start with zero force on each node, then add spring forces
+        if self.solver == "verlet":
+            self._step_verlet(dt)
+        elif self.solver == "implicit":
+            self._step_implicit(dt)
+        else:
+            self._step_euler(dt)
 
-        forces = [[0.0, 0.0] for _ in range(NUM_NODES)]
-        # This creates: [[0,0], [0,0], [0,0], ...] one for each node
-        # Each [0,0] represents force in X and Y directions
+        # ========================================================================
+        # STEP 5: Every few steps, check whether the snake has settled
+        # ========================================================================
+        self._sleep_steps += 1
+        self._sleep_elapsed += dt
+        if self._sleep_steps >= SLEEP_CHECK_EVERY:
+            self._note_settled(self._check_settled(), self._sleep_elapsed)
+            self._sleep_steps = 0
+            self._sleep_elapsed = 0.0
+
+    # ============================================================================
+    # SOLVER 1: EXPLICIT EULER - Classic spring physics
+    # ============================================================================
+    # Springs push/pull → forces → velocities → positions.
+    # Simple and fast, but if the springs are very stiff, the nodes are very
+    # light, or dt is large, the nodes can overshoot and the snake "explodes".
+    # ============================================================================
+
+    def _step_euler(self, dt):
+        """
+        Advance all free nodes by one explicit Euler step.
+
+        PARAMETERS:
+        - dt: Length of the step (seconds)
+        """
+
+        nodes = self.nodes
+        velocities = self.velocities
 
         # ========================================================================
-        # STEP 5: Calculate spring forces between connected nodes
+        # STEP A: Calculate spring forces between ALL connected nodes at once
         # ========================================================================
         # SPRING PHYSICS EXPLANATION:
         # Imagine a rubber band connecting two nodes:
@@ -666,69 +1380,35 @@ class ElasticChain:
         #
         # Formula: Force = stiffness × distance_from_rest
         # Direction: Always toward equilibrium (rest length)
+        #
+        # VECTORIZED: instead of a for-loop over springs, every line below
+        # works on whole arrays. delta[i] is the vector from node i to node i+1.
+
+        delta = nodes[1:] - nodes[:-1]                 # (N-1, 2) spring vectors
+        L = np.hypot(delta[:, 0], delta[:, 1])         # Current spring lengths
+
+        rest = self.effective_rest_lengths             # Desired lengths (cached)
+        stretch = L - rest                             # How far from rest
+        strain = stretch / rest                        # As a percentage
+
+        # Poisson effect: real materials get stiffer when stretched
+        stiffness = self.spring_stiffness * (1 + self.poisson_ratio * np.abs(strain))
+
+        # Hooke's Law (F = k × Δx), divided by L so that multiplying by delta
+        # gives the X and Y components. Springs with L == 0 get no force
+        # (same as skipping them - avoids divide by zero).
+        F_over_L = np.divide(stiffness * stretch, L, out=np.zeros_like(L), where=L != 0)
+        spring_forces = delta * F_over_L[:, None]
 
-        for i in range(NUM_NODES - 1):  # For each spring (one less than nodes)
-            # ----------------------------------------------------------------
-            # Get positions of the two nodes this spring connects
-            # ----------------------------------------------------------------
-            x0, y0 = self.nodes[i]      # Current node position
-            x1, y1 = self.nodes[i + 1]  # Next node position
-
-            # ----------------------------------------------------------------
-            # Calculate current distance between nodes
-            # ----------------------------------------------------------------
-            dx = x1 - x0                    # Horizontal distance
-            dy = y1 - y0                    # Vertical distance
-            L = math.hypot(dx, dy)          # Total distance (Pythagorean theorem)
-
-            if L == 0:
-                continue  # Skip if nodes are at exact same position (avoid divide by zero)
-
-            # ----------------------------------------------------------------
-            # Calculate how stretched/compressed the spring is
-            # ----------------------------------------------------------------
-            rest = self.rest_lengths[i] * self.spacing_scale  # Desired length
-            strain = (L - rest) / rest  # Strain = how far from rest (as percentage)
-
-            # Example: If L=120 and rest=100:
-            #   strain = (120-100)/100 = 0.2 (20% stretched)
-            # Example: If L=80 and rest=100:
-            #   strain = (80-100)/100 = -0.2 (20% compressed)
-
-            # ----------------------------------------------------------------
-            # Calculate spring stiffness (can change based on strain!)
-            # ----------------------------------------------------------------
-            # Poisson effect: real materials get stiffer when stretched
-            stiffness = self.base_stiffness * self.stiffness_scale * (1 + self.poisson_ratio * abs(strain))
-
-            # ----------------------------------------------------------------
-            # Calculate force magnitude using Hooke's Law: F = k × Δx
-            # ----------------------------------------------------------------
-            F = stiffness * (L - rest)  # Force magnitude
-            # If stretched (L > rest): F is positive (pulling)
-            # If compressed (L < rest): F is negative (pushing)
-
-            # ----------------------------------------------------------------
-            # Convert force magnitude to X and Y components
-            # ----------------------------------------------------------------
-            # We need to apply force in the direction connecting the nodes
-            fx = F * dx / L  # Force in X direction (normalized by distance)
-            fy = F * dy / L  # Force in Y direction (normalized by distance)
-
-            # Why divide by L? To normalize the direction vector!
-            # Example: if dx=30 and L=50, then dx/L = 0.6 (60% in X direction)
-
-            # ----------------------------------------------------------------
-            # Apply equal and opposite forces (Newton's 3rd Law!)
-            # ----------------------------------------------------------------
-            # "For every action, there is an equal and opposite reaction"
-            forces[i][0] += fx      # Node i gets pulled in +X direction
-            forces[i][1] += fy      # Node i gets pulled in +Y direction
-            forces[i + 1][0] -= fx  # Node i+1 gets pulled in -X direction (opposite!)
-            forces[i + 1][1] -= fy  # Node i+1 gets pulled in -Y direction
-
-        # ========================================================================
-        # STEP 6: Update positions using physics integration
+        # Equal and opposite forces (Newton's 3rd Law!):
+        # node i is pulled toward node i+1, node i+1 is pulled toward node i
+        forces = self._forces
+        forces.fill(0.0)
+        forces[:-1] += spring_forces
+        forces[1:] -= spring_forces
+
+        # ========================================================================
+        # STEP B: Update positions using physics integration
         # ========================================================================
         # PHYSICS INTEGRATION EXPLANATION:
         # This is how we turn forces into movement! Three-step process:
@@ -736,78 +1416,206 @@ class ElasticChain:
         #   2. Acceleration → Velocity (velocity changes based on acceleration)
         #   3. Velocity → Position (position changes based on velocity)
         #
-        # Example: A heavy node with force=100 and mass=10
-        #   → acceleration = 100/10 = 10 units/sec²
-        #   → if dt=0.016 sec, velocity changes by 10×0.016 = 0.16 units/sec
-        #   → if velocity=5, position changes by 5×0.016 = 0.08 units
-
-        for i in range(NUM_NODES - 1):  # Update all nodes except the pinned tail
-            # ----------------------------------------------------------------
-            # Get current velocity
-            # ----------------------------------------------------------------
-            vx, vy = self.velocities[i]  # Current speed in X and Y
-
-            # ----------------------------------------------------------------
-            # Calculate acceleration from force (F = ma → a = F/m)
-            # ----------------------------------------------------------------
-            ax = forces[i][0] / self.masses[i]  # Acceleration X = Force X / mass
-            ay = forces[i][1] / self.masses[i]  # Acceleration Y = Force Y / mass
-
-            # Heavier nodes (larger mass) accelerate slower with same force!
-            # Example: mass=8, force=160 → acceleration=20
-            # Example: mass=2, force=160 → acceleration=80 (much faster!)
-
-            # ----------------------------------------------------------------
-            # Update velocity (add acceleration × time)
-            # ----------------------------------------------------------------
-            vx += ax * dt  # New velocity = old velocity + (acceleration × time)
-            vy += ay * dt
-
-            # Example: If vx=100, ax=50, dt=0.016:
-            #   vx_new = 100 + (50 × 0.016) = 100.8
-
-            # ----------------------------------------------------------------
-            # TAIL WHIP AMPLIFICATION - Cool physics trick!
-            # ----------------------------------------------------------------
-            # CONCEPT: In real whips, the tip moves MUCH faster than the handle!
-            # WHY? Energy is conserved, but mass decreases toward the tip
-            #
-            # We simulate this by applying LESS damping to lighter nodes:
-            # - Heavy head: loses lots of energy (high damping)
-            # - Light tail: keeps more energy (low damping) → WHIP EFFECT!
-
-            # Calculate what fraction of max mass this node has
-            mass_ratio = self.masses[i] / max(self.masses)
-            # Example: head with mass=8, max=8 → ratio=1.0 (100% of max)
-            # Example: tail with mass=2, max=8 → ratio=0.25 (25% of max)
-
-            mass_ratio = max(0.2, min(1.0, mass_ratio))  # Clamp between 0.2 and 1.0
-
-            # Apply less damping to lighter nodes
-            # If damping=0.8 and mass_ratio=1.0: local_damping = 0.8^1.0 = 0.8 (heavy)
-            # If damping=0.8 and mass_ratio=0.25: local_damping = 0.8^0.25 = 0.945 (light)
-            # Lighter nodes keep more velocity → whip effect!
-            local_damping = self.damping ** mass_ratio
-
-            # Apply damping (friction/energy loss)
-            vx *= local_damping  # Reduce X velocity
-            vy *= local_damping  # Reduce Y velocity
-
-            # ----------------------------------------------------------------
-            # Update position (add velocity × time)
-            # ----------------------------------------------------------------
-            x, y = self.nodes[i]  # Get current position
-            x += vx * dt  # New X = old X + (velocity X × time)
-            y += vy * dt  # New Y = old Y + (velocity Y × time)
-
-            # Example: If x=100, vx=50, dt=0.016:
-            #   x_new = 100 + (50 × 0.016) = 100.8
-
-            # ----------------------------------------------------------------
-            # Save updated position and velocity
-            # ----------------------------------------------------------------
-            self.nodes[i] = (x, y)        # Update position
-            self.velocities[i] = [vx, vy]  # Update velocity
+        # [:-1] means "every node except the pinned tail"
+
+        v = velocities[:-1]
+        v += forces[:-1] * self.inv_masses[:-1, None] * dt  # v += a × dt
+
+        # ----------------------------------------------------------------
+        # TAIL WHIP AMPLIFICATION - Cool physics trick!
+        # ----------------------------------------------------------------
+        # Lighter nodes get LESS damping so they keep their speed → WHIP!
+        # (the per-node factors are cached - see _local_damping)
+        v *= self._local_damping(dt)
+
+        # New position = old position + velocity × time
+        nodes[:-1] += v * dt
+
+    # ============================================================================
+    # SOLVER 2: VERLET + DISTANCE CONSTRAINTS - Rock-solid long snakes
+    # ============================================================================
+    # Instead of turning spring forces into velocities, we:
+    #   1. Let every node coast along its velocity ("predict" where it goes)
+    #   2. Walk over the springs and directly MOVE the two nodes of each one
+    #      back toward the rest length (a "distance constraint")
+    #   3. Work out the velocity from how far each node actually moved
+    #
+    # Step 2 can never overshoot, so this stays stable even with huge dt or
+    # thousands of nodes. Each spring's stiffness becomes a "compliance"
+    # (1 / stiffness): soft springs only get nudged, stiff springs get snapped
+    # almost all the way back. This trick is called XPBD.
+    # ============================================================================
+
+    def _step_verlet(self, dt):
+        """
+        Advance all free nodes by one position-based (Verlet/XPBD) step.
+
+        PARAMETERS:
+        - dt: Length of the step (seconds)
+
+        Uses the same rest lengths × spacing_scale, stiffness, Poisson ratio
+        and damping as _step_euler, so idle/expanded/rigid all carry over.
+        """
+        nodes = self.nodes
+        velocities = self.velocities
+        start = self._step_start
+        start[:] = nodes  # Remember where every node began this step
+
+        # ------------------------------------------------------------------------
+        # 1. Damping + predict (coast along current velocity)
+        # ------------------------------------------------------------------------
+        velocities[:-1] *= self._local_damping(dt)
+        nodes[:-1] += velocities[:-1] * dt
+
+        # ------------------------------------------------------------------------
+        # 2. Distance constraints
+        # ------------------------------------------------------------------------
+        # inv_mass = 1/mass: light nodes get moved more than heavy ones.
+        # The pinned tail gets 0 so it never moves.
+        inv_mass = self._inv_mass_pinned
+
+        rest = self.effective_rest_lengths
+
+        # Same Poisson-stiffened spring constant as _step_euler, measured once
+        # at the predicted positions, then turned into compliance / dt²
+        delta = nodes[1:] - nodes[:-1]
+        strain = (np.hypot(delta[:, 0], delta[:, 1]) - rest) / rest
+        stiffness = self.spring_stiffness * (1 + self.poisson_ratio * np.abs(strain))
+        compliance = np.divide(1.0, stiffness * dt * dt, out=np.zeros_like(stiffness),
+                               where=stiffness > 0)
+        links = self.links  # Cut springs (0) don't push at all
+
+        # lam = how much each constraint has "pushed" so far this step
+        lam = np.zeros(self.num_nodes - 1)
+
+        # RED-BLACK ORDER: springs 0, 2, 4, ... never share a node, so they can
+        # all be solved at once; then springs 1, 3, 5, ... the same way.
+        n_springs = self.num_nodes - 1
+        for _ in range(self.solver_iterations):
+            for first in (0, 1):
+                s = slice(first, n_springs, 2)          # Which springs
+                count = len(range(first, n_springs, 2))
+                if count == 0:
+                    continue
+                left = nodes[first:first + 2 * count:2]       # Node i of each spring
+                right = nodes[first + 1:first + 2 * count:2]  # Node i+1 of each spring
+                w0 = inv_mass[first:first + 2 * count:2]
+                w1 = inv_mass[first + 1:first + 2 * count:2]
+
+                d = right - left
+                L = np.hypot(d[:, 0], d[:, 1])
+                C = L - rest[s]  # How far from rest length (the "constraint error")
+
+                # XPBD update: how much to push this pass
+                d_lam = links[s] * (-C - compliance[s] * lam[s]) / (w0 + w1 + compliance[s])
+                lam[s] += d_lam
+
+                # Push both nodes along the spring direction (zero-length
+                # springs have no direction, so they're skipped)
+                push = d * np.divide(d_lam, L, out=np.zeros_like(L), where=L != 0)[:, None]
+                left -= w0[:, None] * push
+                right += w1[:, None] * push
+
+        # ------------------------------------------------------------------------
+        # 3. Velocity = distance actually moved / time
+        # ------------------------------------------------------------------------
+        velocities[:-1] = (nodes[:-1] - start[:-1]) / dt
+
+    # ============================================================================
+    # SOLVER 3: IMPLICIT (BACKWARD) EULER - For really stiff springs
+    # ============================================================================
+    # Explicit Euler uses the forces at the START of the step. With stiff
+    # springs those forces are huge, the nodes overshoot, and it explodes.
+    # Implicit Euler instead asks: "what velocities at the END of the step
+    # would be consistent with the spring forces at the END of the step?"
+    #
+    # That's a system of equations, one per node - but every node only touches
+    # its two neighbours, so it's block-tridiagonal and solve_block_tridiagonal
+    # does it in O(n). The answer never overshoots, no matter how stiff.
+    # ============================================================================
+
+    def _step_implicit(self, dt):
+        """
+        Advance all free nodes by one linearized backward-Euler step.
+
+        PARAMETERS:
+        - dt: Length of the step (seconds)
+
+        Solves (M - dt² K) Δv = dt (f + dt K v), where K is how the spring
+        forces change when the nodes move (the "stiffness matrix").
+        """
+        nodes = self.nodes
+        velocities = self.velocities
+
+        # ------------------------------------------------------------------------
+        # 1. Spring forces and directions (same formulas as _step_euler)
+        # ------------------------------------------------------------------------
+        delta = nodes[1:] - nodes[:-1]
+        L = np.hypot(delta[:, 0], delta[:, 1])
+        rest = self.effective_rest_lengths
+        stretch = L - rest
+        stiffness = self.spring_stiffness * (1 + self.poisson_ratio * np.abs(stretch / rest))
+
+        inv_L = np.divide(1.0, L, out=np.zeros_like(L), where=L != 0)
+        direction = delta * inv_L[:, None]  # Unit vector along each spring
+
+        forces = self._forces
+        forces.fill(0.0)
+        spring_forces = direction * (stiffness * stretch)[:, None]
+        forces[:-1] += spring_forces
+        forces[1:] -= spring_forces
+
+        # ------------------------------------------------------------------------
+        # 2. Each spring's 2×2 stiffness block
+        # ------------------------------------------------------------------------
+        # Along the spring it's just k. Sideways it's k × (1 - rest/L), which
+        # we clamp at 0 so a squashed spring never makes the system unstable.
+        along = direction[:, :, None] * direction[:, None, :]  # n nᵀ
+        sideways = np.clip(1.0 - rest * inv_L, 0.0, 1.0)
+        K = stiffness[:, None, None] * (along + sideways[:, None, None] * (np.eye(2) - along))
+
+        # K v: how the forces would change if nodes kept their current velocity
+        K_dv = (K @ (velocities[1:] - velocities[:-1])[:, :, None])[:, :, 0]
+        Kv = np.zeros_like(forces)
+        Kv[:-1] += K_dv
+        Kv[1:] -= K_dv
+
+        # ------------------------------------------------------------------------
+        # 3. Build and solve the block-tridiagonal system for the free nodes
+        # ------------------------------------------------------------------------
+        # Free nodes are 0 .. N-2 (the tail is pinned). Free node i touches
+        # spring i-1 (to its left) and spring i (to its right).
+        h2 = dt * dt
+        n_free = self.num_nodes - 1
+        B = np.zeros((n_free, 2, 2))
+        B[:, 0, 0] = self.masses[:-1]
+        B[:, 1, 1] = self.masses[:-1]
+        B += h2 * K                # Spring i (to the right, incl. the tail spring)
+        B[1:] += h2 * K[:-1]       # Spring i-1 (to the left)
+
+        A = np.zeros_like(B)
+        C = np.zeros_like(B)
+        A[1:] = -h2 * K[:n_free - 1]
+        C[:-1] = -h2 * K[:n_free - 1]
+
+        rhs = dt * (forces[:-1] + dt * Kv[:-1])
+        velocities[:-1] += solve_block_tridiagonal(A, B, C, rhs)
+
+        # ------------------------------------------------------------------------
+        # 4. Damping (tail whip, same as _step_euler) and move
+        # ------------------------------------------------------------------------
+        velocities[:-1] *= self._local_damping(dt)
+        nodes[:-1] += velocities[:-1] * dt
+
+    def save_state(self):
+        """
+        Remember the current positions as the "previous" physics state.
+
+        Call this right before each fixed physics step. draw() can then blend
+        between the previous and current positions so the snake moves smoothly
+        even when the screen refreshes at a different rate than the physics.
+        """
+        self.prev_nodes[:] = self.nodes
 
     # ============================================================================
     # DRAW METHOD - Visualize the snake!
@@ -818,160 +1626,445 @@ class ElasticChain:
     #   2. Draw the nodes (circles) on top
     # ============================================================================
 
-    def draw(self, screen):
+    def node_palette(self):
+        """
+        Gradient colour of every node, as an (N, 3) integer array.
+
+        Nodes are colored from head to tail:
+        - Head: Purple/blue (tough, important)
+        - Middle: Blend of colors
+        - Tail: Orange/red (vulnerable)
+        """
+        # Gradient position: 0.0 at head → 1.0 at tail
+        # (from the original node numbers, so colors don't shift when dead
+        # nodes are removed)
+        t = self.node_ids / max(self.initial_num_nodes - 1, 1)
+        # Example with 10 nodes: t = [0.0, 0.11, 0.22, ..., 1.0]
+
+        # RGB = (Red, Green, Blue) where each is 0-255
+        # We blend between two color schemes:
+        #   Head (t=0): (0, 100, 255) → bluish purple
+        #   Tail (t=1): (255, 100, 0) → orange/red
+        return np.stack((
+            255 * t,           # Red: 0 at head → 255 at tail
+            100 * (1 - t),     # Green: stays around 100
+            255 * (1 - t),     # Blue: 255 at head → 0 at tail
+        ), axis=1).astype(int)
+
+    def _node_sprites(self):
+        """
+        The list of node pictures, one per node (see node_sprite).
+
+        Only rebuilt when the radii or the palette change (for example after
+        changing NODE_RADIUS or the number of nodes); every other frame just
+        hands back the same list.
+        """
+        # The palette only depends on the number of nodes
+        key = (self.radii.tobytes(), self.num_nodes, NODE_ANTIALIAS)
+        if key != self._sprite_key:
+            palette = self.node_palette()
+            self._sprites = [
+                node_sprite(int(radius), tuple(color), NODE_ANTIALIAS)
+                for radius, color in zip(self.radii.tolist(), palette.tolist())
+            ]
+            self._sprite_key = key
+        return self._sprites
+
+    def draw(self, screen, alpha=1.0):
         """
         Draw the elastic snake boss on the screen.
 
         PARAMETERS:
         - screen: The pygame display surface to draw on
+        - alpha: Blend between previous (0.0) and current (1.0) physics state
 
         VISUAL STRUCTURE:
-        Springs (lines) show the connections and tension/compression
+        Body (one ribbon) shows the connections and tension/compression
         Nodes (circles) show the actual body segments
         """
 
-        base_thickness = 6  # Starting thickness for spring visualization
-
-        # ========================================================================
-        # PASS 1: Draw the springs (connections between nodes)
-        # ========================================================================
-        # Springs are drawn as lines whose color and thickness change based on
-        # whether they're stretched (tension) or compressed
-
-        for i in range(NUM_NODES - 1):  # One spring for each pair of nodes
-            # ----------------------------------------------------------------
-            # Get the two nodes this spring connects
-            # ----------------------------------------------------------------
-            x0, y0 = self.nodes[i]      # First node position
-            x1, y1 = self.nodes[i + 1]  # Second node position
-
-            # ----------------------------------------------------------------
-            # Calculate spring length and strain
-            # ----------------------------------------------------------------
-            dx = x1 - x0                # Horizontal distance
-            dy = y1 - y0                # Vertical distance
-            L = math.hypot(dx, dy)      # Current length (actual distance)
-            rest = self.rest_lengths[i] * self.spacing_scale  # Rest length (desired)
-
-            if rest <= 0:
-                continue  # Skip if rest length is invalid
-
-            # Calculate strain (how stretched/compressed)
-            strain = (L - rest) / rest  # Positive = stretched, negative = compressed
-            # Example: L=120, rest=100 → strain = 0.2 (20% stretched)
-
-            # ----------------------------------------------------------------
-            # Calculate visual thickness using Poisson effect
-            # ----------------------------------------------------------------
-            # POISSON EFFECT: Real materials get thinner when stretched!
-            # - Stretch a rubber band → it gets longer AND thinner
-            # - Compress it → it gets shorter AND thicker
-            #
-            # Formula: thickness_factor = 1 - ν × strain
-            # Where ν (nu) is the Poisson ratio (material property)
-
-            poisson = self.poisson_ratio
-            thickness_factor = 1 - poisson * strain
-
-            # Clamp the factor so thickness never becomes too small or huge
-            thickness_factor = max(5, min(10, thickness_factor))
-
-            # Calculate final thickness
-            thickness = max(40, int(base_thickness * (1 - poisson * strain)))
-
-            # ----------------------------------------------------------------
-            # Choose color based on tension/compression
-            # ----------------------------------------------------------------
-            # This gives visual feedback about the physics state!
-            # - RED = tension (stretched)
-            # - GRAY = compression (squished)
-
-            if strain > 0:
-                # TENSION (stretched) → Show as RED/PINK
-                # More stretch = brighter/hotter red
-                hot = min(255, int(120 + 300 * strain))  # Calculate brightness
-                color = (255, hot, hot)  # RGB: full red, variable green/blue
-                # Example: strain=0.1 → hot=150 → color=(255, 150, 150) pink
-                # Example: strain=0.4 → hot=240 → color=(255, 240, 240) bright pink
-            else:
-                # COMPRESSION (squished) → Show as GRAY
-                # More compression = darker gray
-                fade = max(60, int(160 + 200 * strain))  # Calculate darkness
-                color = (fade, fade, fade)  # Gray = equal RGB values
-                # Example: strain=-0.2 → fade=120 → color=(120,120,120) dark gray
-                # Example: strain=-0.5 → fade=60 → color=(60,60,60) very dark
-
-            # ----------------------------------------------------------------
-            # Safety check: Ensure positions are valid numbers
-            # ----------------------------------------------------------------
-            # Sometimes physics can produce NaN (Not a Number) or Infinity
-            # This prevents crashes if that happens
-            if not all(map(math.isfinite, (x0, y0, x1, y1))):
-                continue  # Skip drawing this spring if positions are invalid
-
-            # ----------------------------------------------------------------
-            # Draw the spring as a line
-            # ----------------------------------------------------------------
-            pygame.draw.line(
-                screen,                      # Where to draw
-                color,                       # What color (red/gray)
-                (int(x0), int(y0)),         # Start point
-                (int(x1), int(y1)),         # End point
-                thickness                    # How thick the line is
-            )
-            # Note: int() converts floats to integers (pygame needs whole pixels!)
+        # Positions to draw: in between the last two physics steps
+        nodes = lerp(self.prev_nodes, self.nodes, alpha)
+
+        # Sometimes physics can produce NaN (Not a Number) or Infinity.
+        # Park those nodes at (0, 0) so the math below stays finite, and
+        # remember not to draw anything that touches them.
+        finite = np.isfinite(nodes).all(axis=1)
+        if not finite.all():
+            nodes = np.where(finite[:, None], nodes, 0.0)
+
+        # Dead nodes (only a dead anchor, or nodes in a ChainBatch - see
+        # remove_dead_nodes) aren't drawn either
+        visible = finite & (self.node_hp > 0)
+
+        # ========================================================================
+        # PASS 1: Draw the body as a ribbon (see ribbon_edges above)
+        # ========================================================================
+        # The ribbon changes color and thickness based on whether each spring
+        # is stretched (tension) or compressed
+
+        # ----------------------------------------------------------------
+        # Calculate every spring's strain at once
+        # ----------------------------------------------------------------
+        delta = nodes[1:] - nodes[:-1]
+        L = np.hypot(delta[:, 0], delta[:, 1])  # Current lengths
+        rest = self.effective_rest_lengths       # Rest lengths (cached)
+
+        # Springs we can't draw, and cut springs (gaps between pieces)
+        bad = (rest <= 0) | ~finite[:-1] | ~finite[1:] | (self.links == 0)
+        strain = np.where(bad, 0.0, (L - rest) / np.where(rest > 0, rest, 1.0))
+        # Positive = stretched, negative = compressed
+        # Example: L=120, rest=100 → strain = 0.2 (20% stretched)
+
+        # ----------------------------------------------------------------
+        # Calculate visual thickness using Poisson effect
+        # ----------------------------------------------------------------
+        # POISSON EFFECT: Real materials get thinner when stretched!
+        # - Stretch a rubber band → it gets longer AND thinner
+        # - Compress it → it gets shorter AND thicker
+        #
+        # Formula: thickness_factor = 1 - ν × strain
+        # Where ν (nu) is the Poisson ratio (material property)
+        thickness_factor = np.minimum(np.maximum(1 - self.poisson_ratio * strain, 0.3), 1.2)
+
+        # Each node sits between two springs: average their factors
+        # (the two end nodes only have one spring each)
+        padded = np.concatenate((thickness_factor[:1], thickness_factor, thickness_factor[-1:]))
+        half_widths = self.radii * 0.5 * (padded[:-1] + padded[1:])
+
+        # ----------------------------------------------------------------
+        # Level of detail: very long snakes use fewer outline points
+        # ----------------------------------------------------------------
+        # 10,000 nodes squeezed onto a 1200-pixel screen overlap anyway, so
+        # only keep RIBBON_MAX_POINTS of them (always including both ends).
+        # Each kept segment takes the average strain of the springs it covers.
+        if self.num_nodes > RIBBON_MAX_POINTS:
+            keep = np.unique(np.linspace(0, self.num_nodes - 1, RIBBON_MAX_POINTS).astype(int))
+            counts = np.diff(keep)
+            strain = np.add.reduceat(strain, keep[:-1]) / counts
+            bad = np.add.reduceat(bad.astype(int), keep[:-1]) > 0
+            points, half_widths = nodes[keep], half_widths[keep]
+        else:
+            points = nodes
+
+        left, right = ribbon_edges(points, half_widths)
+        left, right = left.tolist(), right.tolist()  # Plain lists slice faster
+
+        # ----------------------------------------------------------------
+        # Group neighbouring springs that get the same color
+        # ----------------------------------------------------------------
+        # Round each strain to the nearest STRAIN_COLOR_STEP, then find where
+        # the rounded value changes: each stretch in between is ONE polygon.
+        levels = np.round(strain / STRAIN_COLOR_STEP).astype(int)
+        levels[bad] = np.iinfo(int).max  # Never matches a real level
+        levels = levels.tolist()
+        bad = bad.tolist()
+
+        start = 0
+        for end in range(1, len(levels) + 1):
+            if end < len(levels) and levels[end] == levels[start]:
+                continue  # Same color as the run so far: keep going
+            if not bad[start]:  # Skip springs with invalid positions
+                # Springs start..end-1 join points start..end
+                outline = left[start:end + 1] + right[start:end + 1][::-1]
+                color = strain_color(levels[start] * STRAIN_COLOR_STEP)
+                pygame.draw.polygon(screen, color, outline)
+            start = end
 
         # ========================================================================
         # PASS 2: Draw the nodes (body segments)
         # ========================================================================
-        # Nodes are drawn as circles with a gradient color from head to tail
-        # - Head: Purple/blue (tough, important)
-        # - Middle: Blend of colors
-        # - Tail: Orange/red (vulnerable)
-
-        for i, (x, y) in enumerate(self.nodes):
-            # enumerate gives us: i=index (0,1,2...) and (x,y)=position
-            # Example: enumerate([(10,20), (30,40)]) → (0,(10,20)), (1,(30,40))
-
-            # ----------------------------------------------------------------
-            # Calculate gradient position (0.0 at head → 1.0 at tail)
-            # ----------------------------------------------------------------
-            t = i / (NUM_NODES - 1)  # Normalize index to 0.0-1.0 range
-            # Example with 10 nodes:
-            #   i=0: t=0/9=0.0 (head)
-            #   i=5: t=5/9=0.55 (middle)
-            #   i=9: t=9/9=1.0 (tail)
-
-            # ----------------------------------------------------------------
-            # Create gradient color using interpolation
-            # ----------------------------------------------------------------
-            # RGB = (Red, Green, Blue) where each is 0-255
-            # We blend between two color schemes:
-            #   Head (t=0): (0, 100, 255) → bluish purple
-            #   Tail (t=1): (255, 100, 0) → orange/red
-
-            color = (
-                int(255 * t),           # Red: 0 at head → 255 at tail
-                int(100 * (1 - t)),     # Green: stays around 100
-                int(255 * (1 - t))      # Blue: 255 at head → 0 at tail
-            )
-            # Example at head (t=0): (0, 100, 255) = blue/purple
-            # Example at middle (t=0.5): (127, 50, 127) = purple/pink
-            # Example at tail (t=1): (255, 0, 0) = red
-
-            # ----------------------------------------------------------------
-            # Draw the node as a circle
-            # ----------------------------------------------------------------
-            pygame.draw.circle(
-                screen,              # Where to draw
-                color,               # What color (gradient)
-                (int(x), int(y)),   # Center position
-                self.radii[i]       # Radius (size) - gets smaller toward tail!
-            )
-            # Remember: self.radii was set up in __init__ with a gradient
-            # Head has big radius (48), tail has small radius (19)
-
-               
+        # Each node is a pre-drawn circle picture (see _node_sprites), copied
+        # onto the screen with its top-left corner at (x - radius, y - radius)
+        sprites = self._node_sprites()
+        corners = (nodes - self.radii[:, None]).astype(int)  # pygame needs whole pixels!
+        if visible.all():
+            screen.blits(zip(sprites, corners.tolist()), doreturn=False)
+        else:
+            # Skip nodes with invalid positions (and dead ones)
+            screen.blits([(sprite, corner) for sprite, corner, ok
+                          in zip(sprites, corners.tolist(), visible.tolist()) if ok],
+                         doreturn=False)
+
+
+# ================================================================================
+# MANY SNAKES AT ONCE! - ChainBatch
+# ================================================================================
+# One ElasticChain already does its math on whole arrays. But if an arena has
+# 100 snakes, calling 100 separate update()s still means 100 trips through
+# Python. ChainBatch glues all the snakes' arrays end-to-end into ONE big set of
+# arrays and runs the spring physics for every snake in a single pass.
+#
+# VISUAL DIAGRAM (3 snakes with 4, 2 and 3 nodes):
+#   big array:  [a0 a1 a2 a3 | b0 b1 | c0 c1 c2]
+#   springs:     a0-a1 a1-a2 a2-a3   b0-b1   c0-c1 c1-c2
+#   (no spring between a3 and b0 - they belong to different snakes!)
+#
+# Each snake's own arrays become VIEWS (windows) into the big arrays, so
+# chain.draw(screen) and chain.damage_node(i, amount) keep working unchanged.
+# ================================================================================
+
+class ChainBatch:
+    """
+    A group of ElasticChains that are all stepped by one vectorized update.
+
+    The batch always uses the "euler" solver, whatever each chain's own
+    solver setting is.
+
+    USAGE EXAMPLE:
+    batch = ChainBatch([ElasticChain((100, 100), num_nodes=n) for n in (10, 30, 50)])
+    batch.update([(100, 100), (300, 200), (500, 300)], dt)
+    batch[1].damage_node(0, 10)   # Still a normal ElasticChain!
+    batch.draw(screen)
+    """
+
+    def __init__(self, chains):
+        """
+        Pack existing chains into shared arrays.
+
+        PARAMETERS:
+        - chains: List of ElasticChain objects (they can have different sizes)
+
+        NOTE: After this, each chain's arrays are views into the batch. Don't
+        replace them (chain.nodes = ...) or the chain stops being part of it.
+        """
+        self.chains = list(chains)
+
+        # ========================================================================
+        # STEP 1: Work out where each snake lives in the big arrays
+        # ========================================================================
+        # counts = [4, 2, 3] → starts = [0, 4, 6], ends = [4, 6, 9]
+        counts = np.array([chain.num_nodes for chain in self.chains])
+        self.ends = np.cumsum(counts)
+        self.starts = self.ends - counts
+        self.tails = self.ends - 1  # Pinned anchor node of every snake
+
+        # ========================================================================
+        # STEP 2: Glue the arrays end-to-end and hand views back to each snake
+        # ========================================================================
+        self.nodes = np.concatenate([chain.nodes for chain in self.chains])
+        self.velocities = np.concatenate([chain.velocities for chain in self.chains])
+        self.prev_nodes = np.concatenate([chain.prev_nodes for chain in self.chains])
+        self.masses = np.concatenate([chain.masses for chain in self.chains])
+        self.radii = np.concatenate([chain.radii for chain in self.chains])
+        self.node_hp = np.concatenate([chain.node_hp for chain in self.chains])
+        self.node_max_hp = np.concatenate([chain.node_max_hp for chain in self.chains])
+        self.rest_lengths = np.concatenate([chain.rest_lengths for chain in self.chains])
+
+        # Springs are packed the same way, but each snake has one spring fewer
+        # than nodes, so snake k's springs start k places earlier
+        for k, (chain, start, end) in enumerate(zip(self.chains, self.starts, self.ends)):
+            chain.nodes = self.nodes[start:end]
+            chain.velocities = self.velocities[start:end]
+            chain.prev_nodes = self.prev_nodes[start:end]
+            chain.masses = self.masses[start:end]
+            chain.radii = self.radii[start:end]
+            chain.node_hp = self.node_hp[start:end]
+            chain.node_max_hp = self.node_max_hp[start:end]
+            chain.rest_lengths = self.rest_lengths[start - k:end - 1 - k]
+            chain.batched = True  # Dead nodes are cut loose, not removed
+
+        # ========================================================================
+        # STEP 3: Index tables for springs
+        # ========================================================================
+        # A spring starts at every node EXCEPT the last node of each snake.
+        # spring_chain[s] tells us which snake spring s belongs to, so we can
+        # look up that snake's stiffness, damping, etc.
+        spring_mask = np.ones(len(self.nodes), dtype=bool)
+        spring_mask[self.tails] = False
+        self.spring_start = np.flatnonzero(spring_mask)
+        self.spring_chain = np.repeat(np.arange(len(self.chains)), counts - 1)
+
+        # Free (not pinned) nodes and the snake each node belongs to
+        self.free = np.flatnonzero(spring_mask)
+        self.node_chain = np.repeat(np.arange(len(self.chains)), counts)
+
+        self._forces = np.zeros_like(self.nodes)
+        self.hit_grid = SpatialHash()  # One grid for every snake (see refresh_hit_grid)
+
+        # Sleeping snakes are left out of the physics (see _awake_indices)
+        self._asleep = None
+        self._awake = None
+        self._sleep_steps = 0
+        self._sleep_elapsed = 0.0
+        self._check_lengths = np.full(len(self.spring_start), np.nan)  # NaN = not measured yet
+        self.refresh_coefficients()
+
+    def refresh_coefficients(self):
+        """
+        Rebuild the batch's coefficient cache from every chain's own cache.
+
+        Called automatically when any chain changes state. Like
+        ElasticChain.refresh_coefficients, call it yourself after editing
+        masses or physics settings by hand (after refreshing those chains).
+        """
+        free = self.free
+        fc = self.node_chain[free]
+        self.inv_masses = np.concatenate([chain.inv_masses for chain in self.chains])
+        self.mass_ratio = np.concatenate([chain.mass_ratio for chain in self.chains])
+        self.effective_rest_lengths = np.concatenate(
+            [chain.effective_rest_lengths for chain in self.chains])
+
+        sc = self.spring_chain
+        self.spring_stiffness = np.concatenate([chain.spring_stiffness for chain in self.chains])
+        self.links = np.concatenate([chain.links for chain in self.chains])
+        self._sleep_energy = np.array([chain._sleep_energy for chain in self.chains])
+        self.poisson = np.array([chain.poisson_ratio for chain in self.chains])[sc]
+        self.damping = np.array([chain.damping for chain in self.chains])[fc]
+
+        self._states = [(chain.state, chain.cuts) for chain in self.chains]
+        self._damping_dt = None
+        self._damping_cache = None
+
+    def _awake_indices(self, asleep):
+        """
+        Index arrays for the springs and free nodes of the snakes that are
+        awake (rebuilt only when some snake falls asleep or wakes up).
+
+        RETURNS:
+        - (spring starts, spring numbers, free nodes, free node numbers);
+          with everyone awake these are plain "take everything" slices
+        """
+        if asleep != self._asleep:
+            self._asleep = asleep
+            awake = ~np.array(asleep, dtype=bool)
+            if awake.all():
+                springs = free = slice(None)
+            else:
+                springs = np.flatnonzero(awake[self.spring_chain])
+                free = np.flatnonzero(awake[self.node_chain[self.free]])
+            self._awake = (self.spring_start[springs], springs, self.free[free], free)
+        return self._awake
+
+    def __len__(self):
+        return len(self.chains)
+
+    def __getitem__(self, k):
+        return self.chains[k]
+
+    def update(self, anchors, dt):
+        """
+        Update every snake in the batch for one frame.
+
+        PARAMETERS:
+        - anchors: One (x, y) anchor position per snake, in the same order
+        - dt: Delta time (seconds)
+
+        Does exactly what ElasticChain.update does, but for all snakes at once.
+        """
+
+        # ========================================================================
+        # STEP 1: State machines (cheap - one small step per snake, not per node)
+        # ========================================================================
+        for chain in self.chains:
+            chain.update_state(dt)
+            if chain._dead_pending:
+                chain.remove_dead_nodes()  # Cuts its springs (see SEVERING)
+
+        # Only gather the snakes' physics settings again if one changed state
+        # (or got cut)
+        if [(chain.state, chain.cuts) for chain in self.chains] != self._states:
+            self.refresh_coefficients()
+
+        # ========================================================================
+        # STEP 2: Pin every tail to its anchor
+        # ========================================================================
+        nodes = self.nodes
+        velocities = self.velocities
+        anchors = np.asarray(anchors, dtype=float).reshape(-1, 2)
+        for k in np.flatnonzero((nodes[self.tails] != anchors).any(axis=1)):
+            self.chains[k].wake()  # Its anchor moved (see SLEEPING)
+        nodes[self.tails] = anchors
+        velocities[self.tails] = 0.0
+
+        # Sleeping snakes sit this step out
+        asleep = [chain.sleeping for chain in self.chains]
+        if all(asleep):
+            return
+        a, springs, free, free_k = self._awake_indices(asleep)
+
+        # ========================================================================
+        # STEP 3: Spring forces for every spring of every (awake) snake
+        # ========================================================================
+        delta = nodes[a + 1] - nodes[a]
+        L = np.hypot(delta[:, 0], delta[:, 1])
+
+        rest = self.effective_rest_lengths[springs]
+        stretch = L - rest
+        strain = stretch / rest
+        stiffness = self.spring_stiffness[springs] * (1 + self.poisson[springs] * np.abs(strain))
+
+        F_over_L = np.divide(stiffness * stretch, L, out=np.zeros_like(L), where=L != 0)
+        spring_forces = delta * F_over_L[:, None]
+
+        forces = self._forces
+        forces.fill(0.0)
+        forces[a] += spring_forces
+        forces[a + 1] -= spring_forces
+
+        # ========================================================================
+        # STEP 4: Integrate every free node
+        # ========================================================================
+        v = velocities[free] + forces[free] * self.inv_masses[free, None] * dt
+        if dt != self._damping_dt:
+            self._damping_cache = (step_damping(self.damping, dt) ** self.mass_ratio)[:, None]
+            self._damping_dt = dt
+        v *= self._damping_cache[free_k]
+        velocities[free] = v
+        nodes[free] += v * dt
+
+        # ========================================================================
+        # STEP 5: Every few steps, put the snakes that have settled to sleep
+        # ========================================================================
+        # Same test as ElasticChain._check_settled, for every snake at once:
+        # add up each snake's kinetic energy and count its springs that
+        # changed length (reusing this step's lengths) with bincount.
+        self._sleep_steps += 1
+        self._sleep_elapsed += dt
+        if self._sleep_steps >= SLEEP_CHECK_EVERY:
+            n = len(self.chains)
+            kinetic = np.bincount(self.node_chain[free], minlength=n,
+                                  weights=0.5 * self.masses[free] * np.einsum("ij,ij->i", v, v))
+            moving = ~(np.abs(L - self._check_lengths[springs]) <= SLEEP_STRETCH)
+            self._check_lengths[springs] = L
+            moving = np.bincount(self.spring_chain[springs], minlength=n,
+                                 weights=moving & (self.links[springs] > 0))
+            settled = (kinetic <= self._sleep_energy) & (moving == 0)
+            for k in np.flatnonzero(~np.array(asleep, dtype=bool)):
+                self.chains[k]._note_settled(settled[k], self._sleep_elapsed)
+            self._sleep_steps = 0
+            self._sleep_elapsed = 0.0
+
+    def refresh_hit_grid(self):
+        """
+        Rebuild self.hit_grid from every snake's nodes at once.
+
+        Queries return indices into the batch's big arrays; split_hits()
+        turns them into (snake, node) pairs.
+        """
+        self.hit_grid.rebuild(self.nodes, self.radii, active=self.node_hp > 0)
+        return self.hit_grid
+
+    def split_hits(self, ids):
+        """
+        Batch node indices -> (which snake, node index inside that snake).
+
+        USAGE EXAMPLE:
+        shots, ids = batch.refresh_hit_grid().query_points(bullet_positions)
+        for k, i in zip(*batch.split_hits(ids)):
+            batch[k].damage_node(i, 10)
+        """
+        chain = self.node_chain[ids]
+        return chain, ids - self.starts[chain]
+
+    def save_state(self):
+        """Remember current positions of every snake (see ElasticChain.save_state)."""
+        self.prev_nodes[:] = self.nodes
+
+    def draw(self, screen, alpha=1.0):
+        """Draw every snake in the batch."""
+        for chain in self.chains:
+            chain.draw(screen, alpha)
 
 
 # ================================================================================
@@ -1088,6 +2181,7 @@ def main():
     PATH_AMPLITUDE = 10    # How wavy the path is (higher = more wiggly)
     PATH_CYCLES = 6        # How many waves between waypoints
     PATH_SPEED = 400       # How fast the boss moves (pixels/second)
+    PATH_STYLE = "sine"    # "sine" = wavy lines, "spline" = one smooth curve through the waypoints
 
     # ========================================================================
     # Generate paths between all consecutive waypoints
@@ -1095,41 +2189,67 @@ def main():
     # This creates a path segment between each pair of points
     # Example with 4 waypoints: [0→1, 1→2, 2→3, 3→0]
 
-    all_paths = []  # Will store all the path segments
-
-    for i in range(len(waypoints)):
-        # Get current waypoint and next waypoint (wraps around at end)
-        start_point = waypoints[i]
-        end_point = waypoints[(i + 1) % len(waypoints)]
-        # The % (modulo) operator makes it wrap: if i=3 and len=4, then (3+1)%4 = 0
-        # This creates a loop: last waypoint connects back to first!
-
-        # Generate wavy path between these two points
-        path_segment = generate_sine_edge(
-            start_point,
-            end_point,
+    if PATH_STYLE == "spline":
+        # One smooth Catmull-Rom curve through every waypoint, measured once
+        # (see splines.py) - no sharp corners at the waypoints
+        track = SplinePath.catmull_rom(waypoints, closed=True)
+        all_paths = track.segments
+    else:
+        # Generate wavy paths between ALL pairs of waypoints in one go
+        all_paths = generate_sine_loop(
+            waypoints,
             samples=PATH_SAMPLES,
-            amplitude=PATH_AMPLITUDE if i % 2 == 0 else -PATH_AMPLITUDE,
+            amplitude=PATH_AMPLITUDE,
+            cycles=PATH_CYCLES,
+            alternate=True
             # Alternate wave direction each segment for visual variety!
             # Even segments (0,2,4...): positive amplitude
             # Odd segments (1,3,5...): negative amplitude (flipped waves)
-            cycles=PATH_CYCLES
         )
 
-        all_paths.append(path_segment)
+        # Join all the segments into ONE looping track, measured once up front
+        track = ArcLengthPath.from_segments(all_paths, closed=True)
+    # all_paths[i] is the path from waypoint i to waypoint i+1. The last one
+    # goes back to waypoint 0: this creates a loop!
+
+    for i in range(len(waypoints)):
+        start_point = waypoints[i]
+        end_point = waypoints[(i + 1) % len(waypoints)]
+        # The % (modulo) operator makes it wrap: if i=3 and len=4, then (3+1)%4 = 0
         print(f"  Path {i}: {start_point} → {end_point}")
 
     print(f"=========================")
 
+    # ========================================================================
+    # Background layer: the path preview never moves, so draw it once
+    # ========================================================================
+    # paint() draws dots to show waypoints and path preview onto the layer.
+    # The layer only runs it again if path_key (what the paths were built
+    # from) changes.
+
+    def paint_path_preview(surface):
+        # Draw all waypoints as small circles
+        for waypoint in waypoints:
+            pygame.draw.circle(surface, PLAYER_COLOR, waypoint, 8)
+
+        # Draw sample points along ALL path segments (every 10th point)
+        for path_segment in all_paths:
+            for p in path_segment[::10]:  # [::10] means "every 10th element"
+                pygame.draw.circle(surface, (80, 80, 120), (int(p[0]), int(p[1])), 2)
+                # This creates a visual preview of the entire path loop!
+
+    background = StaticLayer((WIDTH, HEIGHT), BACKGROUND, paint_path_preview)
+    path_key = (tuple(waypoints), PATH_STYLE, PATH_SAMPLES, PATH_AMPLITUDE, PATH_CYCLES)
+
     # ============================================================================
     # STEP 5: Create game objects
     # ============================================================================
     # Now we create instances (objects) from our classes!
     # Remember: Classes are blueprints, objects are the actual things we build
 
-    # Start with the first path segment
-    boss_path = CurveFollower(all_paths[0], speed=PATH_SPEED)
-    # This creates a "train" that follows the first "track"
+    # Something that rides along the track (made in STEP 4) at a steady speed
+    boss_path = PathFollower(track, speed=PATH_SPEED)
+    # This creates a "train" that follows the whole "track", forever
 
     current_path_index = 0  # Track which path segment we're on (0, 1, 2, ...)
 
@@ -1137,6 +2257,61 @@ def main():
     chain = ElasticChain(boss_path.pos)
     # The snake's tail starts at wherever the path follower is currently positioned
 
+    # Create the fixed-step driver: physics always moves in 1/PHYSICS_HZ second
+    # steps, so one slow frame can't make the springs explode
+    physics_loop = FixedStepLoop(hz=PHYSICS_HZ, substeps=PHYSICS_SUBSTEPS)
+    prev_anchor = tuple(boss_path.pos)  # Anchor position one physics step ago
+
+    # Times each part of the frame (see profiler.py); F3 shows the numbers
+    profiler = FrameProfiler(enabled=PROFILE, csv_path=PROFILE_CSV)
+
+    # ============================================================================
+    # PHYSICS STEP - everything that moves the boss, for one small step h
+    # ============================================================================
+    # These are "nested functions": they live inside main() so they can see
+    # (and, with "nonlocal", change) main's variables like boss_path.
+
+    def physics_step(h):
+        nonlocal current_path_index
+
+        # ------------------------------------------------------------------------
+        # Update the path follower
+        # ------------------------------------------------------------------------
+        with profiler.phase("boss_path.update"):
+            boss_path.update(h)  # Move along the path a bit
+        # This moves the "anchor point" that the snake's tail follows.
+        # The track loops, so after the last waypoint it carries straight on
+        # to the first one: 0→1→2→3→0→1→2→3→0... (infinite loop!)
+
+        # ------------------------------------------------------------------------
+        # Check if we moved onto the next path segment
+        # ------------------------------------------------------------------------
+        if boss_path.segment != current_path_index:
+            current_path_index = boss_path.segment
+
+            # Optional: Vary speed on different segments for interesting behavior
+            # Uncomment to make alternate segments faster/slower:
+            # if current_path_index % 2 == 0:
+            #     boss_path.speed = PATH_SPEED * 1.5  # 50% faster
+            # else:
+            #     boss_path.speed = PATH_SPEED * 0.75  # 25% slower
+
+            print(f"Switching to path segment {current_path_index}")
+
+        # ------------------------------------------------------------------------
+        # Update the snake physics
+        # ------------------------------------------------------------------------
+        with profiler.phase("chain.update"):
+            chain.update(tuple(boss_path.pos), h)
+        # tuple(boss_path.pos) converts the position to a tuple (x, y)
+        # This runs the physics simulation for one step (springs, forces, etc.)
+
+    def save_previous():
+        # Remember where everything was before the next step (for smooth drawing)
+        nonlocal prev_anchor
+        prev_anchor = tuple(boss_path.pos)
+        chain.save_state()
+
     # ============================================================================
     # STEP 6: THE GAME LOOP!
     # ============================================================================
@@ -1147,116 +2322,81 @@ def main():
     running = True  # Flag to control the loop
     while running:  # Keep looping while running is True
         # ========================================================================
-        # 6A: Calculate delta time (time since last frame)
+        # 6A: Calculate frame time (time since last frame)
         # ========================================================================
-        dt = clock.tick(60) / 1000.0
+        frame_dt = clock.tick(60) / 1000.0
+        profiler.begin_frame()  # Start timing this frame (if profiling)
         # clock.tick(60) does two things:
         #   1. Waits to maintain 60 FPS (frames per second)
         #   2. Returns milliseconds since last frame
         # We divide by 1000 to convert milliseconds → seconds
-        # Example: If running at 60 FPS, dt ≈ 0.0166 seconds (16.6 ms)
+        # Example: If running at 60 FPS, frame_dt ≈ 0.0166 seconds (16.6 ms)
 
         # ========================================================================
         # 6B: Handle events (user input)
         # ========================================================================
         # Events are things that happen: mouse clicks, key presses, window close
-        for event in pygame.event.get():  # Get all events that happened this frame
-            if event.type == pygame.QUIT:  # Did user click the X button?
-                running = False  # Set flag to False → loop will exit
+        with profiler.phase("events"):
+            for event in pygame.event.get():  # Get all events that happened this frame
+                if event.type == pygame.QUIT:  # Did user click the X button?
+                    running = False  # Set flag to False → loop will exit
+                profiler.handle_event(event)  # F3 shows/hides the profiler
 
         # ========================================================================
-        # 6C: Update the path follower
+        # 6C-6E: Run the physics in fixed steps
         # ========================================================================
-        boss_path.update(dt)  # Move along the path a bit
-        # This moves the "anchor point" that the snake's tail follows
+        # At 60 FPS and PHYSICS_HZ = 240 this runs physics_step 4 times.
+        # alpha (0-1) says how far we are between the last two steps.
+        alpha = physics_loop.advance(frame_dt, physics_step, snapshot=save_previous)
 
         # ========================================================================
-        # 6D: Check if we reached end of current path segment - advance to next!
+        # 6F-6G: Clear the screen and draw the path visualization
         # ========================================================================
-        if boss_path.index >= len(boss_path.points) - 1:
-            # We've reached the last point in the current path segment
-            # Time to move to the next waypoint!
-
-            # Move to next path segment (wraps around to create a loop)
-            current_path_index = (current_path_index + 1) % len(all_paths)
-            # Example with 4 paths: 0→1→2→3→0→1→2→3→0... (infinite loop!)
-
-            # Create a new path follower for the next segment
-            boss_path = CurveFollower(all_paths[current_path_index], speed=PATH_SPEED)
-
-            # Optional: Vary speed on different segments for interesting behavior
-            # Uncomment to make alternate segments faster/slower:
-            # if current_path_index % 2 == 0:
-            #     boss_path.speed = PATH_SPEED * 1.5  # 50% faster
-            # else:
-            #     boss_path.speed = PATH_SPEED * 0.75  # 25% slower
-
-            print(f"Switching to path segment {current_path_index}")
-            # This creates continuous movement through all waypoints!
-
-        # ========================================================================
-        # 6E: Update the snake physics
-        # ========================================================================
-        chain.update(tuple(boss_path.pos), dt)
-        # tuple(boss_path.pos) converts the position to a tuple (x, y)
-        # This runs the physics simulation for one frame (springs, forces, etc.)
-
-        # ========================================================================
-        # 6F: Clear the screen
-        # ========================================================================
-        screen.fill(BACKGROUND)
-        # Fill the entire screen with the background color (dark blue-ish)
+        with profiler.phase("background"):
+            background.draw(screen, key=path_key)
+        # Covers the entire screen with the background color (dark blue-ish)
+        # plus the waypoints and path dots, in one copy
         # This "erases" the previous frame so we can draw the new one
         # Without this, everything would smear across the screen!
 
-        # ========================================================================
-        # 6G: Draw the path visualization (optional - helps see the path)
-        # ========================================================================
-        # Draw dots to show waypoints and path preview
-
-        # Draw all waypoints as small circles
-        for i, waypoint in enumerate(waypoints):
-            # Draw waypoint marker
-            pygame.draw.circle(screen, PLAYER_COLOR, waypoint, 8)
-            # Draw waypoint number (optional - helps identify waypoints)
-            # You could add text rendering here if you import pygame.font
-
-        # Draw sample points along ALL path segments (every 10th point)
-        for path_segment in all_paths:
-            for p in path_segment[::10]:  # [::10] means "every 10th element"
-                pygame.draw.circle(screen, (80, 80, 120), (int(p[0]), int(p[1])), 2)
-                # This creates a visual preview of the entire path loop!
-
         # ========================================================================
         # 6H: Draw the snake boss
         # ========================================================================
-        chain.draw(screen)
+        with profiler.phase("chain.draw"):
+            chain.draw(screen, alpha)
         # This calls the draw() method we defined in the ElasticChain class
-        # It draws all the springs and nodes!
+        # It draws all the springs and nodes (blended by alpha)!
 
         # ========================================================================
         # 6I: Draw the anchor point (where the path follower is)
         # ========================================================================
+        anchor_x, anchor_y = lerp_point(prev_anchor, boss_path.pos, alpha)
         pygame.draw.circle(
             screen,                                    # Where to draw
             BOSS_COLOR,                                # Color (reddish)
-            (int(boss_path.pos[0]), int(boss_path.pos[1])),  # Position
+            (int(anchor_x), int(anchor_y)),            # Position
             8                                          # Radius (small dot)
         )
         # This shows where the tail is being pulled to
 
+        profiler.draw(screen)  # Timing table on top of everything (F3)
+
         # ========================================================================
         # 6J: Update the display
         # ========================================================================
-        pygame.display.flip()
+        with profiler.phase("flip"):
+            pygame.display.flip()
         # "flip" means "show everything we just drew"
         # Pygame uses "double buffering": we draw to an invisible buffer,
         # then flip it to visible all at once (prevents flickering!)
 
+        profiler.end_frame()
+
     # ============================================================================
     # STEP 7: Clean up and exit
     # ============================================================================
     # When the loop exits (user closed window), clean up properly
+    profiler.close()  # Saves PROFILE_CSV if any frames were timed
     pygame.quit()  # Shut down pygame
     sys.exit()     # Exit the program
 
@@ -0,0 +1,216 @@
+# -*- coding: utf-8 -*-
+"""
+Spatial Hash Broadphase
+Shared by the boss scripts for finding which snake nodes something hit.
+
+Checking every projectile against every node costs projectiles x nodes tests
+(1000 x 1000 = a million per frame). A SPATIAL HASH cuts the screen into a
+grid of square cells and files each node under every cell its circle touches:
+
+    +-----+-----+-----+
+    |  o  |     |     |      A query only looks in the cells it touches,
+    |   (=|==)  |     |      so it is tested against the few nodes filed
+    +-----+-----+-----+      there instead of all of them.
+    |     |  *  |     |
+    |     |     |   o |      * = projectile: 1 cell, 0 candidates
+    +-----+-----+-----+
+
+Everything is NumPy: the grid is a sorted array of cell keys (rebuilt each
+frame in one go) and a batch of queries is looked up with searchsorted, then
+checked exactly. Points, circles and segments are all "capsules" (a segment
+with a radius), so they share the same test.
+
+USAGE EXAMPLE:
+    grid = SpatialHash()
+    grid.rebuild(chain.nodes, chain.radii)
+    shots, nodes = grid.query_segments(old_positions, new_positions, radius=5)
+    for shot, node in zip(shots, nodes):
+        chain.damage_node(node, 10)
+"""
+
+import numpy as np
+
+# ==================================================
+# CONFIG
+# ==================================================
+CELL_SIZE_SCALE = 1.5  # Default cell size = this x the median node radius
+MAX_CELLS = 1 << 20    # Cell coordinates are folded into this many columns
+
+
+# ==================================================
+# HELPERS
+# ==================================================
+def _expand_ranges(starts, counts):
+    """
+    Flatten many index ranges into one array.
+
+    starts=[5, 20], counts=[3, 2]  ->  items=[0, 0, 0, 1, 1], values=[5, 6, 7, 20, 21]
+    """
+    total = int(counts.sum())
+    items = np.repeat(np.arange(len(counts)), counts)
+    offsets = np.cumsum(counts) - counts
+    values = np.arange(total) - np.repeat(offsets - starts, counts)
+    return items, values
+
+
+def _segment_distance_sq(a, b, centers):
+    """Squared distance from each point in centers to segment a-b (row by row)."""
+    ab = b - a
+    ac = centers - a
+    length_sq = np.einsum("ij,ij->i", ab, ab)
+    t = np.einsum("ij,ij->i", ac, ab) / np.where(length_sq > 0, length_sq, 1.0)
+    t = np.minimum(np.maximum(t, 0.0), 1.0)
+    closest = a + ab * t[:, None]
+    d = centers - closest
+    return np.einsum("ij,ij->i", d, d)
+
+
+# ==================================================
+# SPATIAL HASH
+# ==================================================
+class SpatialHash:
+    """
+    Uniform grid of circles (e.g. snake nodes) for batch hit queries.
+
+    PARAMETERS:
+    - cell_size: Width of a grid cell in pixels (None = pick one from the
+                 radii on every rebuild)
+    """
+
+    def __init__(self, cell_size=None):
+        self.cell_size = cell_size
+        self.centers = np.zeros((0, 2))
+        self.radii = np.zeros(0)
+        self.ids = np.zeros(0, dtype=int)  # Caller's index of each circle
+
+        self._cell = 1.0
+        self._keys = np.zeros(0, dtype=np.int64)  # Sorted cell keys
+        self._entries = np.zeros(0, dtype=int)    # Circle filed under each key
+        self._first = np.zeros((0, 2), dtype=np.int64)  # Each circle's top-left cell
+
+    def __len__(self):
+        return len(self.ids)
+
+    # --------------------------------------------------
+    # BUILD
+    # --------------------------------------------------
+    def _cells(self, lo, hi):
+        """
+        Every cell touched by each box lo-hi (the (n, 2) corners).
+
+        RETURNS:
+        - first: (n, 2) top-left cell of each box
+        - items: Which box each cell belongs to
+        - cx, cy: The cell's column and row
+        """
+        first = np.floor(lo / self._cell).astype(np.int64)
+        last = np.floor(hi / self._cell).astype(np.int64)
+        span = last - first + 1
+        items, cell = _expand_ranges(np.zeros(len(span), dtype=np.int64), span[:, 0] * span[:, 1])
+        cx = first[items, 0] + cell // span[items, 1]
+        cy = first[items, 1] + cell % span[items, 1]
+        return first, items, cx, cy
+
+    @staticmethod
+    def _key(cx, cy):
+        # Far-apart cells may share a key; that only adds candidates, which
+        # the exact test then throws away
+        return cx * MAX_CELLS + cy % MAX_CELLS
+
+    def rebuild(self, centers, radii, active=None):
+        """
+        File every circle under the cells it overlaps (call once per frame).
+
+        PARAMETERS:
+        - centers: (n, 2) circle centers (e.g. chain.nodes)
+        - radii: (n,) circle radii
+        - active: Optional (n,) bool mask; False circles are left out (and so
+                  are circles with NaN/inf positions)
+        """
+        centers = np.asarray(centers, dtype=float).reshape(-1, 2)
+        radii = np.broadcast_to(np.asarray(radii, dtype=float), len(centers))
+        keep = np.isfinite(centers).all(axis=1)
+        if active is not None:
+            keep &= active
+        self.ids = np.flatnonzero(keep)
+        self.centers = centers[self.ids]
+        self.radii = radii[self.ids]
+
+        if self.cell_size is not None:
+            self._cell = float(self.cell_size)
+        elif len(self.radii):
+            self._cell = max(CELL_SIZE_SCALE * float(np.median(self.radii)), 1.0)
+
+        r = self.radii[:, None]
+        self._first, items, cx, cy = self._cells(self.centers - r, self.centers + r)
+        keys = self._key(cx, cy)
+        order = np.argsort(keys, kind="stable")
+        self._keys = keys[order]
+        self._entries = items[order]
+
+    # --------------------------------------------------
+    # QUERIES
+    # --------------------------------------------------
+    def query_segments(self, a, b, radius=0.0):
+        """
+        Which circles each (thick) segment a[i] -> b[i] touches.
+
+        PARAMETERS:
+        - a, b: (m, 2) segment start and end points (e.g. last and current
+                projectile positions, so fast shots can't skip a node)
+        - radius: Thickness of the segments, scalar or (m,)
+
+        RETURNS:
+        - (queries, ids): Two int arrays; queries[k] hit circle ids[k]
+          (ids are indices into the arrays given to rebuild()). Each pair
+          appears once.
+        """
+        a = np.asarray(a, dtype=float).reshape(-1, 2)
+        b = np.asarray(b, dtype=float).reshape(-1, 2)
+        radius = np.broadcast_to(np.asarray(radius, dtype=float), len(a))
+        empty = (np.zeros(0, dtype=int), np.zeros(0, dtype=int))
+        if len(a) == 0 or len(self._keys) == 0:
+            return empty
+
+        # ----------------------------------------------------------------
+        # Broad phase: the grid cells under each query's bounding box
+        # ----------------------------------------------------------------
+        valid = np.flatnonzero(np.isfinite(a).all(axis=1) & np.isfinite(b).all(axis=1))
+        r = radius[valid, None]
+        lo = np.minimum(a[valid], b[valid]) - r
+        hi = np.maximum(a[valid], b[valid]) + r
+        first, items, cx, cy = self._cells(lo, hi)
+        keys = self._key(cx, cy)
+
+        # Every circle filed under those cells is a candidate
+        start = np.searchsorted(self._keys, keys, side="left")
+        stop = np.searchsorted(self._keys, keys, side="right")
+        which, slot = _expand_ranges(start, stop - start)
+        circles = self._entries[slot]
+        items = items[which]
+
+        # A query and a circle sharing several cells meet once per cell. Only
+        # keep the meeting in the top-left cell of their overlap, so every
+        # pair is reported once (and cells that merely share a key drop out)
+        corner = np.maximum(first[items], self._first[circles])
+        once = (corner[:, 0] == cx[which]) & (corner[:, 1] == cy[which])
+        queries, circles = valid[items[once]], circles[once]
+        if len(queries) == 0:
+            return empty
+
+        # ----------------------------------------------------------------
+        # Narrow phase: exact capsule vs circle test
+        # ----------------------------------------------------------------
+        reach = self.radii[circles] + radius[queries]
+        hit = _segment_distance_sq(a[queries], b[queries], self.centers[circles]) <= reach * reach
+        return queries[hit].astype(int), self.ids[circles[hit]]
+
+    def query_circles(self, centers, radii):
+        """Which circles each query circle overlaps (see query_segments)."""
+        centers = np.asarray(centers, dtype=float).reshape(-1, 2)
+        return self.query_segments(centers, centers, radii)
+
+    def query_points(self, points):
+        """Which circles each point is inside (see query_segments)."""
+        points = np.asarray(points, dtype=float).reshape(-1, 2)
+        return self.query_segments(points, points, 0.0)
@@ -0,0 +1,229 @@
+# -*- coding: utf-8 -*-
+"""
+Spline Paths
+Smooth Catmull-Rom and Bezier tracks for the boss scripts to follow.
+
+Joining waypoints with straight (or sine-wave) segments leaves a sharp corner
+at every waypoint. A SPLINE is a smooth curve through (Catmull-Rom) or guided
+by (Bezier) a list of control points:
+
+    straight:     A --------- B            spline:    A ----.__
+                              |                               `-.
+                              |                                  B
+                              C                                  |
+                                                                 C
+
+Curves are slow to measure, so SplinePath does all the hard work ONCE when it
+is built: it walks the curve and writes down the position and heading every
+LUT_SPACING pixels of arc length (a "lookup table", LUT). After that, "where
+am I after s pixels?" is just index = s / spacing - no searching at all - and
+positions() answers it for a whole array of distances (many snakes on the
+same track) in one go.
+
+SplinePath is an ArcLengthPath (paths.py), so PathFollower works with it.
+
+USAGE EXAMPLE:
+    track = SplinePath.catmull_rom(waypoints, closed=True)
+    follower = PathFollower(track, speed=400)
+    xy = track.positions(distances)        # (n, 2) for n snakes
+    angle = track.headings(distances)      # (n,) radians
+"""
+
+import math
+
+import numpy as np
+
+from paths import ArcLengthPath
+
+# ==================================================
+# CONFIG
+# ==================================================
+SAMPLES_PER_SEGMENT = 32  # Points used to measure each curve piece
+LUT_SPACING = 1.0         # Pixels of arc length between lookup table entries
+
+
+# ==================================================
+# CURVE MATH
+# ==================================================
+# Both curves are "cubic": each piece is a weighted blend of 4 control
+# points, with weights that depend on t (0 at the start of the piece, 1 at
+# the end). The weights for every t are one (T, 4) matrix, so a whole piece -
+# or every piece at once - is a single matrix multiply.
+
+def _catmull_rom_weights(t):
+    """Blend weights for points (P0, P1, P2, P3); the curve runs P1 -> P2."""
+    t2, t3 = t * t, t * t * t
+    return 0.5 * np.stack((
+        -t3 + 2 * t2 - t,
+        3 * t3 - 5 * t2 + 2,
+        -3 * t3 + 4 * t2 + t,
+        t3 - t2,
+    ), axis=-1)
+
+
+def _bezier_weights(t):
+    """Bernstein weights for (P0, P1, P2, P3); the curve runs P0 -> P3."""
+    u = 1 - t
+    return np.stack((u * u * u, 3 * u * u * t, 3 * u * t * t, t * t * t), axis=-1)
+
+
+def _evaluate(controls, weights):
+    """
+    Blend every piece's 4 control points with every row of weights.
+
+    - controls: (pieces, 4, 2)
+    - weights: (T, 4)
+    RETURNS (pieces, T, 2)
+    """
+    return np.einsum("tk,pkd->ptd", weights, controls)
+
+
+def catmull_rom_pieces(points, closed=False):
+    """
+    The (pieces, 4, 2) control groups of a Catmull-Rom spline through points.
+
+    The curve passes through every point. Open curves repeat the first and
+    last point so the ends have a neighbour to aim with.
+    """
+    points = np.asarray(points, dtype=float).reshape(-1, 2)
+    n = len(points)
+    if closed:
+        idx = np.arange(n)
+        groups = np.stack(((idx - 1) % n, idx, (idx + 1) % n, (idx + 2) % n), axis=1)
+    else:
+        idx = np.arange(n - 1)
+        groups = np.stack((np.maximum(idx - 1, 0), idx, idx + 1, np.minimum(idx + 2, n - 1)), axis=1)
+    return points[groups]
+
+
+def bezier_pieces(points, closed=False):
+    """
+    The (pieces, 4, 2) control groups of a chain of cubic Bezier curves.
+
+    Points go: anchor, handle, handle, anchor, handle, handle, anchor, ...
+    so an open chain needs 3k + 1 points and a closed one 3k (the last
+    piece ends back at the first anchor).
+    """
+    points = np.asarray(points, dtype=float).reshape(-1, 2)
+    if closed:
+        if len(points) % 3 != 0:
+            raise ValueError("A closed Bezier chain needs a multiple of 3 points")
+        points = np.vstack((points, points[:1]))
+    elif len(points) < 4 or (len(points) - 1) % 3 != 0:
+        raise ValueError("An open Bezier chain needs 3k + 1 points (4, 7, 10, ...)")
+
+    starts = np.arange(0, len(points) - 1, 3)
+    return points[starts[:, None] + np.arange(4)]
+
+
+# ==================================================
+# SPLINE PATH
+# ==================================================
+class SplinePath(ArcLengthPath):
+    """
+    A smooth track with O(1) lookups of position and heading by distance.
+
+    Usually made with SplinePath.catmull_rom() or SplinePath.bezier().
+
+    PARAMETERS:
+    - pieces: (pieces, 4, 2) control groups (see catmull_rom_pieces)
+    - weights: Function turning a t array into (T, 4) blend weights
+    - closed: True if the track loops
+    - samples_per_segment: Points used to measure each piece
+    - lut_spacing: Pixels of arc length between lookup table entries
+    """
+
+    def __init__(self, pieces, weights, closed=False,
+                 samples_per_segment=SAMPLES_PER_SEGMENT, lut_spacing=LUT_SPACING):
+        # ----------------------------------------------------------------
+        # Step 1: sample every piece densely (all pieces in one multiply)
+        # ----------------------------------------------------------------
+        t = np.linspace(0.0, 1.0, samples_per_segment + 1)
+        dense = _evaluate(pieces, weights(t))  # (pieces, samples + 1, 2)
+
+        # Each piece's last point is the next piece's first: keep it once
+        points = np.concatenate((dense[:, :-1].reshape(-1, 2), dense[-1, -1:]))
+        super().__init__(points, closed=closed)
+
+        self.segments = list(dense)  # One (samples + 1, 2) array per piece
+        self.segment_starts = self.cumulative[::samples_per_segment][:len(pieces)].tolist()
+
+        # ----------------------------------------------------------------
+        # Step 2: lookup tables, evenly spaced by ARC LENGTH
+        # ----------------------------------------------------------------
+        # Measuring the dense polyline (ArcLengthPath.positions does the
+        # binary searches) only happens here, once.
+        count = max(2, int(math.ceil(self.length / lut_spacing)) + 1)
+        self.lut_spacing = self.length / (count - 1) if self.length > 0 else 1.0
+        self.lut_points = ArcLengthPath.positions(self, np.linspace(0.0, self.length, count))
+
+        # Heading = direction of travel, from the neighbouring table entries
+        if closed:
+            ahead = np.roll(self.lut_points[:-1], -1, axis=0)
+            behind = np.roll(self.lut_points[:-1], 1, axis=0)
+            tangents = np.vstack((ahead - behind, [[0.0, 0.0]]))
+            tangents[-1] = tangents[0]  # Last entry is the first one again
+        else:
+            tangents = np.gradient(self.lut_points, axis=0)
+        lengths = np.hypot(tangents[:, 0], tangents[:, 1])
+        lengths[lengths == 0] = 1.0
+        self.lut_tangents = tangents / lengths[:, None]
+
+        self._lut_points = self.lut_points.tolist()
+        self._lut_last = count - 2  # Last index a lookup can blend from
+
+    @classmethod
+    def catmull_rom(cls, points, closed=False, **kwargs):
+        """A smooth track that passes through every point."""
+        return cls(catmull_rom_pieces(points, closed), _catmull_rom_weights, closed, **kwargs)
+
+    @classmethod
+    def bezier(cls, points, closed=False, **kwargs):
+        """A chain of cubic Bezier curves (see bezier_pieces for the layout)."""
+        return cls(bezier_pieces(points, closed), _bezier_weights, closed, **kwargs)
+
+    # --------------------------------------------------
+    # O(1) LOOKUPS
+    # --------------------------------------------------
+    def _point_at(self, s):
+        """Position for a distance already inside [0, length] (no searching)."""
+        f = s / self.lut_spacing
+        i = min(int(f), self._lut_last)
+        t = f - i
+        x0, y0 = self._lut_points[i]
+        x1, y1 = self._lut_points[i + 1]
+        return (x0 + (x1 - x0) * t, y0 + (y1 - y0) * t)
+
+    def _lut_index(self, s):
+        """Wrapped distances -> (table index, blend factor) arrays."""
+        s = np.asarray(s, dtype=float)
+        if self.closed:
+            s = np.mod(s, self.length) if self.length > 0 else np.zeros_like(s)
+        else:
+            s = np.clip(s, 0.0, self.length)
+        f = s / self.lut_spacing
+        i = np.minimum(f.astype(int), self._lut_last)
+        return i, (f - i)[..., None]
+
+    def positions(self, s):
+        """Vectorized position(): an array of distances -> (n, 2) array of points."""
+        i, t = self._lut_index(s)
+        p0 = self.lut_points[i]
+        return p0 + (self.lut_points[i + 1] - p0) * t
+
+    def directions(self, s):
+        """Unit heading vectors at an array of distances -> (n, 2) array."""
+        i, t = self._lut_index(s)
+        d = self.lut_tangents[i] * (1 - t) + self.lut_tangents[i + 1] * t
+        length = np.hypot(d[..., 0], d[..., 1])
+        return d / np.where(length > 0, length, 1.0)[..., None]
+
+    def direction(self, s):
+        """Unit (dx, dy) the track is heading in at distance s."""
+        dx, dy = self.directions(s)
+        return (float(dx), float(dy))
+
+    def headings(self, s):
+        """Heading angles in radians (0 = right, pi/2 = down) at distances s."""
+        d = self.directions(s)
+        return np.arctan2(d[..., 1], d[..., 0])
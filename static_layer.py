@@ -0,0 +1,94 @@
+# -*- coding: utf-8 -*-
+"""
+Static Background Layer
+Shared by the boss scripts for everything on screen that doesn't move.
+
+Redrawing the backdrop, waypoints, path dots or graph lines every frame costs
+the same as drawing them the first time, even though they look exactly the
+same. A StaticLayer draws them ONCE onto its own Surface and then each frame
+is a single blit:
+
+    first frame:   fill + 4 waypoints + 20 path dots  ->  layer surface
+    every frame:   screen.blit(layer surface)          (one call)
+
+The layer only redraws itself when its "key" changes - any value that
+describes what's on it (the list of waypoints, the graph's node positions, ...).
+
+USAGE EXAMPLE:
+    def paint(surface):
+        for waypoint in waypoints:
+            pygame.draw.circle(surface, (80, 200, 255), waypoint, 8)
+
+    layer = StaticLayer((WIDTH, HEIGHT), BACKGROUND, paint)
+    while running:
+        layer.draw(screen, key=tuple(waypoints))   # replaces screen.fill(...)
+        draw_moving_things(screen)
+"""
+
+import pygame
+
+
+# ==================================================
+# LAYER
+# ==================================================
+class StaticLayer:
+    """
+    A pre-drawn background: a fill colour plus whatever paint() draws on it.
+
+    PARAMETERS:
+    - size: (width, height) of the layer, usually the window size
+    - background: Fill colour drawn under everything else
+    - paint: Function called as paint(surface) to draw the static content
+    """
+
+    def __init__(self, size, background, paint):
+        self.size = size
+        self.background = background
+        self.paint = paint
+
+        self.surface = None  # The pre-drawn picture (built on first use)
+        self.key = None      # What the picture was drawn for
+        self.rebuilds = 0    # How many times it has been (re)drawn
+
+    def invalidate(self):
+        """Force a redraw on the next draw() call."""
+        self.surface = None
+
+    def refresh(self, key=None):
+        """
+        Redraw the layer if it hasn't been drawn yet or key has changed.
+
+        RETURNS:
+        - True if the layer was redrawn
+        """
+        if self.surface is not None and key == self.key:
+            return False
+
+        if self.surface is None:
+            self.surface = pygame.Surface(self.size)
+            # Match the screen's pixel format so blitting is a straight copy
+            if pygame.display.get_surface() is not None:
+                self.surface = self.surface.convert()
+
+        self.surface.fill(self.background)
+        self.paint(self.surface)
+        self.key = key
+        self.rebuilds += 1
+        return True
+
+    def draw(self, screen, offset=(0, 0), key=None):
+        """
+        Draw the layer onto screen, redrawing it first if key has changed.
+
+        PARAMETERS:
+        - screen: Surface to draw on (the layer covers it, so no fill is needed)
+        - offset: Shift in pixels, e.g. for camera shake
+        - key: Anything describing the static content (compared with ==)
+        """
+        self.refresh(key)
+
+        ox, oy = int(offset[0]), int(offset[1])
+        if ox or oy:
+            # A shifted layer leaves a strip uncovered at the screen edge
+            screen.fill(self.background)
+        screen.blit(self.surface, (ox, oy))
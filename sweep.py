@@ -0,0 +1,215 @@
+# -*- coding: utf-8 -*-
+"""
+Parameter Sweep - map out which snake settings stay stable
+
+Instead of changing NUM_NODES, HEAD_MASS, TAIL_MASS and base_stiffness by hand
+and watching the window, this runs every combination headless, spread over
+all CPU cores (one ElasticChain simulation per combination), and writes one
+CSV row per run:
+
+    solver, state, num_nodes, head_mass, tail_mass, stiffness, dt,
+    stable, blew_up_at, max_strain, energy_drift, ms_per_step
+
+Each run follows the same figure-eight anchor as bench_solvers.py for
+SIM_SECONDS, then parks the anchor for SETTLE_SECONDS:
+
+- stable / blew_up_at: 0 and the time (seconds) if nodes went NaN/inf or
+  faster than MAX_SPEED
+- max_strain: the worst stretch seen, as a fraction of rest length
+- energy_drift: spring + kinetic energy at the end of the parked part divided
+  by the energy when the anchor stopped. Damping should make it shrink
+  (< 1); above 1 means the solver is pumping energy in
+- ms_per_step: average time of one update() while the anchor moves
+
+USAGE:
+    python sweep.py                              # full grid, every core
+    python sweep.py --quick                      # small grid
+    python sweep.py --workers 4 --output my_sweep.csv
+"""
+
+import os
+
+# Quiet, windowless workers (set before pygame is imported anywhere; the
+# worker processes inherit it)
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import argparse
+import csv
+import itertools
+import math
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from bench_solvers import anchor_at
+from snakeforrealthistime import ElasticChain
+
+# =========================
+# CONFIG
+# =========================
+SOLVERS = ["euler", "verlet", "implicit"]
+STATES = ["idle", "rigid"]
+NUM_NODES = [10, 30, 100]
+HEAD_MASSES = [1.0, 2.0, 4.0, 8.0, 16.0]
+TAIL_MASSES = [0.25, 0.5, 1.0, 1.5, 3.0]
+STIFFNESSES = [5.0, 20.0, 80.0, 320.0, 1280.0]
+STEP_RATES = [240, 60]  # Physics steps per second (PHYSICS_HZ)
+
+QUICK_NUM_NODES = [10, 30]
+QUICK_HEAD_MASSES = [2.0, 8.0]
+QUICK_TAIL_MASSES = [0.5, 1.5]
+QUICK_STIFFNESSES = [20.0, 320.0]
+
+SIM_SECONDS = 3.0      # Following the moving anchor
+SETTLE_SECONDS = 1.0   # Anchor parked (for energy_drift)
+MAX_SPEED = 1e5        # Anything faster than this (pixels/second) counts as exploded
+
+COLUMNS = ["solver", "state", "num_nodes", "head_mass", "tail_mass", "stiffness", "dt",
+           "stable", "blew_up_at", "max_strain", "energy_drift", "ms_per_step"]
+
+
+# =========================
+# ONE RUN
+# =========================
+def make_chain(solver, state, num_nodes, head_mass, tail_mass, stiffness):
+    """An ElasticChain frozen in one state, with the given masses and stiffness."""
+    chain = ElasticChain(anchor_at(0.0), num_nodes=num_nodes, solver=solver)
+    getattr(chain, f"_enter_{state}")()
+    chain.state_time = -math.inf  # Stay in this state for the whole run
+
+    # Same head-to-tail gradient ElasticChain builds from HEAD_MASS/TAIL_MASS
+    t = 1.0 - np.arange(num_nodes) / max(num_nodes - 1, 1)
+    chain.masses = head_mass * (1 - t) + tail_mass * t
+    chain.base_stiffness = stiffness
+    chain.refresh_coefficients()
+    return chain
+
+
+def energy(chain):
+    """Kinetic energy + energy stored in the springs (ignoring the Poisson part)."""
+    v = chain.velocities
+    kinetic = 0.5 * np.einsum("i,ij,ij->", chain.masses, v, v)
+    delta = np.diff(chain.nodes, axis=0)
+    stretch = np.hypot(delta[:, 0], delta[:, 1]) - chain.effective_rest_lengths
+    return float(kinetic + 0.5 * np.sum(chain.spring_stiffness * stretch * stretch))
+
+
+def run_one(params):
+    """
+    Simulate one combination and measure it.
+
+    PARAMETERS:
+    - params: (solver, state, num_nodes, head_mass, tail_mass, stiffness, dt)
+
+    RETURNS:
+    - One result row (dict with COLUMNS as keys)
+    """
+    solver, state, num_nodes, head_mass, tail_mass, stiffness, dt = params
+    chain = make_chain(solver, state, num_nodes, head_mass, tail_mass, stiffness)
+    moving_steps = int(SIM_SECONDS / dt)
+    total_steps = moving_steps + int(SETTLE_SECONDS / dt)
+
+    max_strain = 0.0
+    blew_up_at = None
+    energy_start = energy_end = math.nan
+    update_time = 0.0
+
+    with np.errstate(all="ignore"):
+        for step in range(total_steps):
+            moving = step < moving_steps
+            if step == moving_steps:
+                energy_start = energy(chain)
+            anchor = anchor_at(min(step, moving_steps) * dt)
+
+            start = time.perf_counter()
+            chain.update(anchor, dt)
+            if moving:
+                update_time += time.perf_counter() - start
+
+            delta = np.diff(chain.nodes, axis=0)
+            strain = np.abs(np.hypot(delta[:, 0], delta[:, 1]) / chain.effective_rest_lengths - 1.0)
+            worst = strain.max() if len(strain) else 0.0
+            if not np.isfinite(worst) or np.abs(chain.velocities).max() > MAX_SPEED:
+                blew_up_at = step * dt
+                break
+            max_strain = max(max_strain, float(worst))
+        else:
+            energy_end = energy(chain)
+
+    return {
+        "solver": solver,
+        "state": state,
+        "num_nodes": num_nodes,
+        "head_mass": head_mass,
+        "tail_mass": tail_mass,
+        "stiffness": stiffness,
+        "dt": f"{dt:.6g}",
+        "stable": int(blew_up_at is None),
+        "blew_up_at": "" if blew_up_at is None else f"{blew_up_at:.4f}",
+        "max_strain": f"{max_strain:.4g}",
+        "energy_drift": f"{energy_end / energy_start:.4g}" if energy_start > 0 else "",
+        "ms_per_step": f"{update_time / max(min(step + 1, moving_steps), 1) * 1000.0:.4f}",
+    }
+
+
+# =========================
+# SWEEP
+# =========================
+def parameter_grid(quick=False):
+    """Every (solver, state, num_nodes, head_mass, tail_mass, stiffness, dt) to run."""
+    if quick:
+        sizes, heads, tails, stiffnesses = (QUICK_NUM_NODES, QUICK_HEAD_MASSES,
+                                            QUICK_TAIL_MASSES, QUICK_STIFFNESSES)
+    else:
+        sizes, heads, tails, stiffnesses = NUM_NODES, HEAD_MASSES, TAIL_MASSES, STIFFNESSES
+    return list(itertools.product(SOLVERS, STATES, sizes, heads, tails, stiffnesses,
+                                  [1.0 / hz for hz in STEP_RATES]))
+
+
+def print_summary(rows):
+    """Share of stable runs per step rate, stiffness and solver."""
+    print(f"\n=== Stable runs (of {len(rows)}) ===")
+    print(f"{'dt':>8} {'stiffness':>10} " + " ".join(f"{s:>10}" for s in SOLVERS))
+    for dt, stiffness in sorted({(row["dt"], row["stiffness"]) for row in rows},
+                                key=lambda key: (float(key[0]), key[1])):
+        cells = []
+        for solver in SOLVERS:
+            runs = [row["stable"] for row in rows if row["solver"] == solver
+                    and row["dt"] == dt and row["stiffness"] == stiffness]
+            cells.append(f"{sum(runs):>5}/{len(runs):<4}" if runs else f"{'-':>10}")
+        print(f"{'1/' + str(round(1 / float(dt))):>8} {stiffness:>10.0f} " + " ".join(cells))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless ElasticChain stability sweep")
+    parser.add_argument("--output", default="sweep_results.csv", help="Where to write results (CSV)")
+    parser.add_argument("--workers", type=int, default=None, help="Processes to use (default: all cores)")
+    parser.add_argument("--quick", action="store_true", help="Run a small grid")
+    args = parser.parse_args()
+
+    jobs = parameter_grid(args.quick)
+    workers = args.workers or os.cpu_count() or 1
+    # Several runs per message so the workers aren't waiting on the queue
+    chunksize = max(1, len(jobs) // (workers * 8))
+    print(f"Running {len(jobs)} simulations on {workers} process(es)...")
+
+    rows = []
+    start = time.perf_counter()
+    with open(args.output, "w", newline="") as f, ProcessPoolExecutor(workers) as pool:
+        writer = csv.DictWriter(f, fieldnames=COLUMNS)
+        writer.writeheader()
+        for row in pool.map(run_one, jobs, chunksize=chunksize):
+            writer.writerow(row)  # Written as they finish, so a stopped sweep keeps its rows
+            rows.append(row)
+            if len(rows) % 100 == 0:
+                print(f"  {len(rows)}/{len(jobs)} done ({time.perf_counter() - start:.0f} s)")
+
+    print_summary(rows)
+    print(f"\nWrote {args.output} in {time.perf_counter() - start:.1f} s")
+
+
+if __name__ == "__main__":
+    main()
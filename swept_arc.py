@@ -0,0 +1,168 @@
+# -*- coding: utf-8 -*-
+"""
+Swept Arc Collision
+Shared by the boss scripts for sword hits that don't depend on frame rate.
+
+Checking only the blade tip once per frame misses anything the blade passes
+over between frames. At 30 FPS a 0.2 s, 180 degree swing is 6 samples, 30
+degrees apart - room for a whole boss to sit between two of them:
+
+         tip (frame 2)
+            .                      Instead, every frame tests the whole
+           / :  <- boss here       SECTOR the blade swept since the last
+          /  :     is skipped      frame: the pie slice between the old and
+         /   :                     the new blade angle, out to the blade's
+    player ------ tip (frame 1)    length. Over a swing the slices join up
+                                   into the full arc, whatever the frame rate.
+
+The tests are exact (no oversampling), and take whole NumPy arrays of
+targets, so the same sweep can be checked against the boss, every projectile
+(parrying) or every snake node in one call:
+
+- circles: hit when the circle comes within its radius of the sector
+- boxes:   axis-aligned rectangles (the boss, projectile squares)
+
+USAGE EXAMPLE:
+    arc = SweptArc(player_pos, SWORD_RANGE, facing, old_angle, new_angle)
+    if arc.hits_rect(boss_rect):
+        damage_boss()
+    parried = arc.hits_boxes(projectiles.pos[live], PROJECTILE_SIZE / 2)
+    nodes = arc.hits_circles(chain.nodes, chain.radii)
+"""
+
+import math
+
+import numpy as np
+
+# ==================================================
+# CONFIG
+# ==================================================
+MAX_PIECE_DEG = 90.0  # Longer sweeps are split into slices this wide (the tests need convex slices)
+
+
+# ==================================================
+# HELPERS
+# ==================================================
+def _cross(a, b):
+    """2D cross product a x b, row by row (b may be a single vector)."""
+    return a[..., 0] * b[..., 1] - a[..., 1] * b[..., 0]
+
+
+def _segment_distance_sq(tip, points):
+    """Squared distance from each point to the segment (0, 0)-tip."""
+    t = np.clip(points @ tip / (tip @ tip), 0.0, 1.0)
+    d = points - t[:, None] * tip
+    return np.einsum("ij,ij->i", d, d)
+
+
+def _ray_entry(direction, lo, hi):
+    """
+    How far along the ray (0, 0) + t * direction each box lo-hi starts
+    (inf where the ray misses it).
+    """
+    with np.errstate(divide="ignore", invalid="ignore"):
+        t1 = lo / direction
+        t2 = hi / direction
+    enter = np.maximum(np.minimum(t1, t2).max(axis=1), 0.0)
+    leave = np.maximum(t1, t2).min(axis=1)
+    return np.where(enter <= leave, enter, np.inf)
+
+
+# ==================================================
+# SWEPT ARC
+# ==================================================
+class SweptArc:
+    """
+    The area a blade covered while turning from one angle to another.
+
+    PARAMETERS:
+    - origin: Where the blade is held (e.g. the player position)
+    - length: Blade length (SWORD_RANGE)
+    - facing: Direction angle 0 points along (any length)
+    - start_angle, end_angle: Blade angle (degrees, same direction as
+                              pygame's Vector2.rotate) at the last frame and now
+    """
+
+    def __init__(self, origin, length, facing, start_angle, end_angle):
+        self.origin = np.asarray(origin, dtype=float)
+        self.length = float(length)
+        base = math.degrees(math.atan2(facing[1], facing[0]))
+        lo, hi = sorted((start_angle, end_angle))
+
+        # (from, to) unit directions of each slice, none wider than MAX_PIECE_DEG
+        pieces = max(1, math.ceil((hi - lo) / MAX_PIECE_DEG))
+        edges = np.radians(base + np.linspace(lo, hi, pieces + 1))
+        dirs = np.column_stack([np.cos(edges), np.sin(edges)])
+        self.pieces = list(zip(dirs[:-1], dirs[1:]))
+
+    @staticmethod
+    def _inside(points, first, last):
+        """Which points lie in the (infinite) wedge between two directions."""
+        return ((_cross(first, points) >= 0) & (_cross(points, last) >= 0)
+                & (points @ (first + last) >= 0))
+
+    # --------------------------------------------------
+    # TARGETS
+    # --------------------------------------------------
+    def hits_circles(self, centers, radii=0.0):
+        """
+        Which circles the sweep touched.
+
+        PARAMETERS:
+        - centers: (n, 2) circle centers (e.g. chain.nodes)
+        - radii: Scalar or (n,) radii
+
+        RETURNS:
+        - (n,) bool array
+        """
+        p = np.asarray(centers, dtype=float).reshape(-1, 2) - self.origin
+        r = np.broadcast_to(np.asarray(radii, dtype=float), len(p))
+        hit = np.zeros(len(p), dtype=bool)
+
+        # Only circles within reach of the whole blade circle can be hit
+        reach = self.length + r
+        near = np.flatnonzero(np.einsum("ij,ij->i", p, p) <= reach * reach)
+        p, r = p[near], r[near]
+        for first, last in self.pieces:
+            # Inside the wedge the nearest part of the slice is the arc (and
+            # that's in reach); outside it, one of the two straight edges
+            touched = self._inside(p, first, last)
+            for edge in (first, last):
+                touched |= _segment_distance_sq(edge * self.length, p) <= r * r
+            hit[near[touched]] = True
+        return hit
+
+    def hits_boxes(self, centers, half_sizes):
+        """
+        Which axis-aligned boxes the sweep touched.
+
+        PARAMETERS:
+        - centers: (n, 2) box centers (e.g. projectile positions)
+        - half_sizes: Half width/height; scalar, (2,) or (n, 2)
+
+        RETURNS:
+        - (n,) bool array
+        """
+        c = np.asarray(centers, dtype=float).reshape(-1, 2) - self.origin
+        half = np.broadcast_to(np.asarray(half_sizes, dtype=float), c.shape)
+        lo, hi = c - half, c + half
+        hit = np.zeros(len(c), dtype=bool)
+
+        # The point of each box closest to the blade's origin; boxes whose
+        # closest point is out of reach can't be hit at all
+        closest = np.clip(0.0, lo, hi)
+        near = np.flatnonzero(np.einsum("ij,ij->i", closest, closest) <= self.length ** 2)
+        lo, hi, closest = lo[near], hi[near], closest[near]
+        for first, last in self.pieces:
+            # The wedge's nearest point inside the box is that closest point if
+            # it's in the wedge, or else where one of the wedge's edges enters
+            # the box. Within blade length = hit
+            entry = np.minimum(_ray_entry(first, lo, hi), _ray_entry(last, lo, hi))
+            touched = self._inside(closest, first, last) | (entry <= self.length)
+            hit[near[touched]] = True
+        return hit
+
+    def hits_rect(self, rect):
+        """Whether the sweep touched a pygame.Rect (e.g. boss_rect)."""
+        center = (rect.x + rect.width / 2, rect.y + rect.height / 2)
+        return bool(self.hits_boxes(center, (rect.width / 2, rect.height / 2))[0])
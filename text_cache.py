@@ -0,0 +1,187 @@
+# -*- coding: utf-8 -*-
+"""
+Text Cache
+Shared by the boss scripts (and the profiler) for drawing text cheaply.
+
+Text is one of the slowest things to draw in pygame:
+
+    pygame.font.SysFont(None, 24)     looks the font up and loads it again
+    font.render("Boss HP: 12", ...)   rasterizes every letter again
+
+and the HUD does both every frame, even though the words hardly change.
+This module keeps three caches:
+
+    fonts:   (name, size, bold, italic) -> Font        loaded once, kept forever
+    texts:   (text, font, colour, aa)   -> Surface     the last TEXT_CACHE_SIZE
+                                                         used (an "LRU" cache)
+    glyphs:  GlyphAtlas                 -> one strip of  "0123456789" rendered
+                                           characters    once; a number is drawn
+                                                         by copying its digits
+
+Numbers that change all the time (HP, timers, frame times) would fill the
+text cache with one surface per value, so they go through a GlyphAtlas:
+
+    atlas strip:  | 0 | 1 | 2 | 3 | 4 | 5 | 6 | 7 | 8 | 9 | . | - |
+    draw("120"):    copy "1", then "2", then "0" next to each other
+
+USAGE EXAMPLE:
+    font = text_cache.get_font(None, 24)
+    label = text_cache.render("Boss HP: ", font, (240, 240, 240))
+    screen.blit(label, (10, 10))
+
+    hp_digits = text_cache.GlyphAtlas(font, (240, 240, 240))
+    hp_digits.draw(screen, str(boss_hp), (10 + label.get_width(), 10))
+"""
+
+from collections import OrderedDict
+
+import pygame
+
+# ==================================================
+# CONFIG
+# ==================================================
+TEXT_CACHE_SIZE = 256     # Rendered strings kept before the oldest is dropped
+DIGITS = "0123456789.-+:%/ "  # What a GlyphAtlas holds unless told otherwise
+
+
+# ==================================================
+# FONTS
+# ==================================================
+_fonts = {}
+
+
+def get_font(name=None, size=24, bold=False, italic=False):
+    """
+    A font, loaded the first time it's asked for and shared after that.
+
+    PARAMETERS:
+    - name: System font name like "arial" (None = pygame's default font)
+    - size: Height in pixels
+    - bold / italic: Style
+
+    Same arguments as pygame.font.SysFont, so SysFont(...) -> get_font(...).
+    """
+    key = (name, size, bold, italic)
+    font = _fonts.get(key)
+    if font is None:
+        if name is None:
+            # SysFont(None) ends up here anyway; skip the system font scan
+            font = pygame.font.Font(None, size)
+            font.bold, font.italic = bold, italic
+        else:
+            font = pygame.font.SysFont(name, size, bold=bold, italic=italic)
+        _fonts[key] = font
+    return font
+
+
+# ==================================================
+# RENDERED TEXT (LRU CACHE)
+# ==================================================
+class TextCache:
+    """
+    Rendered text surfaces, keyed by (text, font, colour, antialias).
+
+    Keeps the max_entries most recently used; asking for one moves it to
+    the back of the line, and the one at the front is dropped when full.
+
+    PARAMETERS:
+    - max_entries: How many surfaces to keep
+    """
+
+    def __init__(self, max_entries=TEXT_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._surfaces = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._surfaces)
+
+    def render(self, text, font, color, antialias=True):
+        """Same as font.render(text, antialias, color), but only done once."""
+        key = (text, font, tuple(color), antialias)
+        surface = self._surfaces.get(key)
+        if surface is not None:
+            self._surfaces.move_to_end(key)
+            self.hits += 1
+            return surface
+
+        self.misses += 1
+        surface = font.render(text, antialias, color)
+        self._surfaces[key] = surface
+        if len(self._surfaces) > self.max_entries:
+            self._surfaces.popitem(last=False)  # Least recently used
+        return surface
+
+    def clear(self):
+        self._surfaces.clear()
+
+
+_cache = TextCache()
+
+
+def render(text, font, color, antialias=True):
+    """Render through the shared TextCache (see TextCache.render)."""
+    return _cache.render(text, font, color, antialias)
+
+
+# ==================================================
+# GLYPH ATLAS
+# ==================================================
+class GlyphAtlas:
+    """
+    A few characters rendered once into a single strip, for drawing numbers.
+
+    Characters that aren't in the strip are rendered on their own the first
+    time they're drawn and kept as well.
+
+    PARAMETERS:
+    - font: A pygame Font (e.g. from get_font)
+    - color: Text colour
+    - chars: The characters to pre-render
+    - antialias: Smooth edges
+    """
+
+    def __init__(self, font, color, chars=DIGITS, antialias=True):
+        self.font = font
+        self.color = color
+        self.antialias = antialias
+        self.height = font.get_height()
+
+        # Render every character, then copy them side by side into one strip
+        glyphs = [font.render(ch, antialias, color) for ch in chars]
+        width = sum(glyph.get_width() for glyph in glyphs)
+        self.surface = pygame.Surface((max(width, 1), self.height), pygame.SRCALPHA)
+        self._areas = {}  # char -> (surface, area rect inside it)
+        x = 0
+        for ch, glyph in zip(chars, glyphs):
+            self.surface.blit(glyph, (x, 0))
+            self._areas[ch] = (self.surface, pygame.Rect(x, 0, glyph.get_width(), self.height))
+            x += glyph.get_width()
+
+    def _glyph(self, ch):
+        entry = self._areas.get(ch)
+        if entry is None:
+            glyph = self.font.render(ch, self.antialias, self.color)
+            entry = self._areas[ch] = (glyph, glyph.get_rect())
+        return entry
+
+    def size(self, text):
+        """(width, height) that draw(text) would cover."""
+        return sum(self._glyph(ch)[1].width for ch in text), self.height
+
+    def draw(self, surface, text, pos):
+        """
+        Draw text with its top-left corner at pos.
+
+        RETURNS:
+        - The Rect that was drawn over
+        """
+        x, y = pos
+        blits = []
+        for ch in text:
+            source, area = self._glyph(ch)
+            blits.append((source, (x, y), area))
+            x += area.width
+        surface.blits(blits, doreturn=False)
+        return pygame.Rect(pos[0], y, x - pos[0], self.height)